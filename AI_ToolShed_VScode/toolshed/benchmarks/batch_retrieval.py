@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+batch_retrieval.py — N sequential /context requests vs one
+/context/batch request carrying the same N queries.
+
+Each round sends fresh queries (a round number is appended), so the
+retriever caches never answer. Both sides use one keep-alive
+connection. Reports per-round latency and queries/s for each, and
+the speedup.
+
+    ai-toolshed serve      # in another terminal
+    python -m benchmarks.batch_retrieval --queries 32 --rounds 20
+
+    # No server or model: temporary root, generated corpus, hash
+    # embedder, NumPy store, in-process server
+    python -m benchmarks.batch_retrieval --offline --files 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+
+WORDS = ("index", "chunk", "embed", "watcher", "qdrant", "cache", "manifest",
+         "query", "server", "token", "stream", "decode", "vector", "batch")
+
+
+def _queries(n: int, rnd: int):
+    return [f"{WORDS[i % len(WORDS)]} {WORDS[(i * 7 + 3) % len(WORDS)]} {i} r{rnd}"
+            for i in range(n)]
+
+
+def _post(conn, endpoint: str, body: dict):
+    conn.request("POST", endpoint, body=json.dumps(body),
+                 headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    data = resp.read()
+    if resp.status != 200:
+        raise RuntimeError(f"{endpoint}: HTTP {resp.status} {data[:200]!r}")
+    return json.loads(data)
+
+
+# ------------------------------------------------------------
+# Sequential vs batched, `rounds` times each
+# ------------------------------------------------------------
+def run(url: str, n: int, rounds: int, top_k: int) -> dict:
+    u = urlparse(url)
+    conn = http.client.HTTPConnection(u.hostname, u.port or 80, timeout=120)
+    conn.connect()
+    conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    # Warm the model and the store on both paths
+    _post(conn, "/context", {"query": "warm up", "top_k": top_k})
+    _post(conn, "/context/batch", {"queries": ["warm up batch"], "top_k": top_k})
+
+    seq, batch = [], []
+    for r in range(rounds):
+        qs = _queries(n, 2 * r)
+        t0 = time.perf_counter()
+        for q in qs:
+            _post(conn, "/context", {"query": q, "top_k": top_k})
+        seq.append(time.perf_counter() - t0)
+
+        qs = _queries(n, 2 * r + 1)
+        t0 = time.perf_counter()
+        out = _post(conn, "/context/batch", {"queries": qs, "top_k": top_k})
+        batch.append(time.perf_counter() - t0)
+        assert len(out) == n
+
+    conn.close()
+
+    def summarize(times):
+        times = sorted(times)
+        mid = times[len(times) // 2]
+        return {"p50_ms": round(mid * 1000, 2), "qps": round(n / mid, 1)}
+
+    res = {"queries": n, "rounds": rounds, "top_k": top_k,
+           "sequential": summarize(seq), "batch": summarize(batch)}
+    res["speedup"] = round(res["batch"]["qps"] / res["sequential"]["qps"], 2)
+    return res
+
+
+# ------------------------------------------------------------
+# --offline: throwaway install root + in-process server
+# ------------------------------------------------------------
+@contextlib.contextmanager
+def offline_server(files: int, seed: int = 0):
+    root = tempfile.mkdtemp(prefix="toolshed-batch-")
+    os.environ["TOOLSHED_INSTALL_ROOT"] = root  # before any engine import
+    os.makedirs(os.path.join(root, "configs"))
+    with open(os.path.join(root, "configs", "rag_settings.json"), "w", encoding="utf-8") as f:
+        json.dump({"vector_store": "numpy", "watch_reconcile": False}, f)
+
+    from benchmarks.corpus import make_corpus
+    from benchmarks.offline import HashBackend
+    from rag_engine import embedder
+
+    embedder.use_backend(HashBackend())
+    make_corpus(os.path.join(root, "workspace_files"), files, large=0, seed=seed)
+
+    from rag_engine.indexer import build_full_index
+    from rag_engine.orchestrator import make_server
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = build_full_index()
+    print(f"[bench] Offline index: {stats.summary()}")
+
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--url", default="http://127.0.0.1:5412")
+    ap.add_argument("--queries", type=int, default=32, help="queries per round")
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--offline", action="store_true")
+    ap.add_argument("--files", type=int, default=2000, help="corpus size with --offline")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    with (offline_server(args.files) if args.offline else contextlib.nullcontext(args.url)) as url:
+        res = run(url, args.queries, args.rounds, args.top_k)
+
+    for side in ("sequential", "batch"):
+        r = res[side]
+        print(f"[bench] {side:<10} {args.queries} queries  p50 {r['p50_ms']:>9} ms  {r['qps']:>9} q/s")
+    print(f"[bench] batch speedup ×{res['speedup']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
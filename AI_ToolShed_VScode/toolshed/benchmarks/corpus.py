@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+corpus.py — reproducible synthetic workspaces for benchmarks.
+
+make_corpus(root, files, ...) writes a tree of:
+  code    .py / .js / .ts with functions, classes and comments
+  prose   .md / .txt paragraphs under headings
+  large   multi-megabyte logs (streamed by the chunker)
+  binary  .png / .bin blobs (rejected by the chunker)
+
+The same seed and arguments always produce byte-identical files, so
+results from different commits are comparable.
+
+    python -m benchmarks.corpus /tmp/corpus --files 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from pathlib import Path
+
+
+_SYLLABLES = ("ka", "lo", "mi", "ren", "to", "sa", "vel", "qui", "dor", "an",
+              "pe", "sun", "ix", "mo", "tar", "el", "nu", "bri", "os", "ga")
+
+
+def vocabulary(seed: int = 0, size: int = 2000):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+# ------------------------------------------------------------
+# File bodies
+# ------------------------------------------------------------
+def _sentence(rng, words, n=None):
+    n = n or rng.randint(6, 18)
+    s = " ".join(rng.choice(words) for _ in range(n))
+    return s[0].upper() + s[1:] + "."
+
+
+def _python(rng, words):
+    out = [f'"""{_sentence(rng, words)}"""', "", "import os", ""]
+    for c in range(rng.randint(1, 3)):
+        cls = rng.choice(words).capitalize() + str(c)
+        out += [f"class {cls}:", f'    """{_sentence(rng, words)}"""', ""]
+        for m in range(rng.randint(2, 6)):
+            name = f"{rng.choice(words)}_{m}"
+            arg = f"{rng.choice(words)}_arg"
+            out += [
+                f"    def {name}(self, {arg}):",
+                f"        # {_sentence(rng, words)}",
+                f"        value = {rng.randint(0, 999)} * len(str({arg}))",
+                f"        return value + {rng.randint(0, 99)}",
+                "",
+            ]
+    for f in range(rng.randint(2, 8)):
+        out += [
+            f"def {rng.choice(words)}_{f}(x, y={rng.randint(0, 9)}):",
+            f'    """{_sentence(rng, words)}"""',
+            f"    if x > {rng.randint(0, 50)}:",
+            f"        return x * y - {rng.randint(0, 9)}",
+            "    return os.sep.join([str(x), str(y)])",
+            "",
+        ]
+    return "\n".join(out) + "\n"
+
+
+def _javascript(rng, words):
+    out = [f"// {_sentence(rng, words)}", ""]
+    for f in range(rng.randint(3, 10)):
+        name = f"{rng.choice(words)}{f}"
+        out += [
+            f"export function {name}(a, b) {{",
+            f"  // {_sentence(rng, words)}",
+            f"  const v = a + b * {rng.randint(1, 99)};",
+            f"  return v > {rng.randint(0, 500)} ? a : b;",
+            "}",
+            "",
+        ]
+    return "\n".join(out) + "\n"
+
+
+def _prose(rng, words):
+    out = [f"# {_sentence(rng, words, 4)[:-1]}", ""]
+    for _ in range(rng.randint(2, 6)):
+        out += [f"## {_sentence(rng, words, 3)[:-1]}", ""]
+        for _ in range(rng.randint(1, 4)):
+            out += [" ".join(_sentence(rng, words) for _ in range(rng.randint(3, 8))), ""]
+    return "\n".join(out)
+
+
+def _log(rng, words, size):
+    lines, total, i = [], 0, 0
+    while total < size:
+        line = f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d} INFO {_sentence(rng, words)}\n"
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines)
+
+
+KINDS = {
+    "py": _python,
+    "js": _javascript,
+    "ts": _javascript,
+    "md": _prose,
+    "txt": _prose,
+}
+
+
+# ------------------------------------------------------------
+# Whole tree
+# ------------------------------------------------------------
+def make_corpus(root: Path, files: int = 1000, large: int = 2, large_mb: float = 6.0,
+                binary: float = 0.03, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    words = vocabulary(seed)
+    root = Path(root)
+    counts = {"code": 0, "prose": 0, "large": 0, "binary": 0}
+    total = 0
+
+    def write(rel: str, data):
+        nonlocal total
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        p.write_bytes(data)
+        total += len(data)
+
+    for i in range(files):
+        d = f"pkg{i % 17}/{rng.choice(words)}{i % 5}"
+        if rng.random() < binary:
+            ext = rng.choice(("png", "bin"))
+            blob = rng.randbytes(rng.randint(2_000, 60_000))
+            write(f"{d}/asset{i}.{ext}", (b"\x89PNG\r\n\x1a\n\0" if ext == "png" else b"\0") + blob)
+            counts["binary"] += 1
+            continue
+        ext = rng.choice(("py", "py", "js", "ts", "md", "txt"))
+        write(f"{d}/{rng.choice(words)}_{i}.{ext}", KINDS[ext](rng, words))
+        counts["prose" if ext in ("md", "txt") else "code"] += 1
+
+    for i in range(large):
+        write(f"logs/big{i}.log", _log(rng, words, int(large_mb * 1024 * 1024)))
+        counts["large"] += 1
+
+    return {"files": sum(counts.values()), "bytes": total, **counts}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("root")
+    ap.add_argument("--files", type=int, default=1000)
+    ap.add_argument("--large", type=int, default=2)
+    ap.add_argument("--large-mb", type=float, default=6.0)
+    ap.add_argument("--binary", type=float, default=0.03, help="fraction of files")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    print(make_corpus(Path(args.root), args.files, args.large, args.large_mb, args.binary, args.seed))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+embed_backends.py — equivalence check + throughput of embedding backends.
+
+Embeds the same texts with every backend and reports:
+  - texts/s (after one warm-up batch) and load time
+  - cosine similarity of each row against the torch output
+    (min / mean); exits non-zero if any backend's minimum is below
+    --min-cos
+
+Texts are chunks of the files in workspace_files, or synthetic
+code-like lines if it is empty.
+
+    python -m benchmarks.embed_backends --texts 2000
+    python -m benchmarks.embed_backends --backends torch,onnx-int8 --min-cos 0.98
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from rag_engine.backends import OnnxBackend, create_backend
+from rag_engine.chunker import chunk_text, read_file_safely
+from rag_engine.embedder import MODEL_NAME
+from rag_engine.indexer import get_index_root
+
+
+def _corpus(n: int):
+    texts = []
+    root = get_index_root()
+    if root.exists():
+        for p in sorted(root.rglob("*")):
+            if not p.is_file():
+                continue
+            text = read_file_safely(p)
+            if text:
+                texts.extend(c.text for c in chunk_text(text))
+            if len(texts) >= n:
+                return texts[:n]
+
+    rnd = random.Random(0)
+    words = ["index", "chunk", "vector", "query", "file", "path", "model",
+             "return", "def", "class", "self", "cache", "batch", "score"]
+    while len(texts) < n:
+        texts.append(" ".join(rnd.choice(words) for _ in range(rnd.randint(5, 120))))
+    return texts
+
+
+def _load(name: str):
+    if name == "onnx-int8":
+        return OnnxBackend(MODEL_NAME, int8=True)
+    if name == "onnx":
+        return OnnxBackend(MODEL_NAME, int8=False)
+    return create_backend(MODEL_NAME, name)
+
+
+def _cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--backends", default="torch,onnx,onnx-int8")
+    ap.add_argument("--texts", type=int, default=1000)
+    ap.add_argument("--min-cos", type=float, default=0.99)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    texts = _corpus(args.texts)
+    names = [n for n in args.backends.split(",") if n]
+    if "torch" in names:
+        names.remove("torch")
+        names.insert(0, "torch")  # reference output
+
+    results, reference, ok = [], None, True
+    for name in names:
+        t0 = time.perf_counter()
+        backend = _load(name)
+        load_s = time.perf_counter() - t0
+
+        backend.encode(texts[:32])  # warm-up
+        t0 = time.perf_counter()
+        vecs = np.asarray(backend.encode(texts), dtype=np.float32)
+        elapsed = time.perf_counter() - t0
+
+        r = {
+            "backend": name,
+            "texts": len(texts),
+            "load_s": round(load_s, 2),
+            "texts_per_s": round(len(texts) / elapsed, 1),
+        }
+        if reference is None and name == "torch":
+            reference = vecs
+        elif reference is not None:
+            cos = _cosines(vecs, reference)
+            r["cos_min"] = round(float(cos.min()), 5)
+            r["cos_mean"] = round(float(cos.mean()), 5)
+            ok &= r["cos_min"] >= args.min_cos
+        results.append(r)
+
+        extra = f" cos min {r['cos_min']} mean {r['cos_mean']}" if "cos_min" in r else ""
+        print(f"[bench] {name:<10} load {r['load_s']}s  {r['texts_per_s']} texts/s{extra}")
+        del backend
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if not ok:
+        print(f"[bench] FAIL: a backend fell below cosine {args.min_cos} vs torch")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
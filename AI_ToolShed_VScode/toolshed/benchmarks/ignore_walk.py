@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ignore_walk.py — walk time and chunk count with and without the
+ignore engine, on a generated JS/Python monorepo.
+
+The tree has --packages packages, each with a little source and the
+usual bulk around it: node_modules, a .venv, dist/ and build output
+listed in .gitignore, __pycache__, a lockfile and .git objects.
+
+  all      os.walk over everything (the old indexer walk)
+  ignore   IgnoreEngine.walk (defaults + .gitignore, pruned)
+
+For each: files found, walk time, chunks chunk_content() produces.
+
+    python -m benchmarks.ignore_walk --packages 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from rag_engine.chunker import chunk_content
+from rag_engine.ignore import IgnoreEngine
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _code(rng, n):
+    return "\n\n".join(
+        f"def fn_{i}_{rng.randrange(10**6)}(x):\n    return x * {i}\n" for i in range(n)
+    )
+
+
+def make_monorepo(root: Path, packages: int, deps: int, seed: int = 0):
+    rng = random.Random(seed)
+    _write(root / ".gitignore", "dist/\nbuild/\n*.log\ncoverage/\n")
+    for i in range(200):
+        _write(root / ".git" / "objects" / f"{i:02x}" / f"{i:038x}", "x" * 200)
+
+    for p in range(packages):
+        pkg = root / "packages" / f"pkg{p}"
+        for m in range(10):
+            _write(pkg / "src" / f"mod{m}.py", _code(rng, 8))
+            _write(pkg / "src" / f"comp{m}.js", "export const a = 1;\n" * 40)
+            _write(pkg / "dist" / f"comp{m}.min.js", "var a=1;" * 400)
+        _write(pkg / "README.md", "# package\n\n" + "Some words. " * 80)
+        _write(pkg / "package-lock.json", json.dumps({"deps": list(range(2000))}))
+        _write(pkg / "build" / "out.log", "log line\n" * 200)
+        for m in range(5):
+            _write(pkg / "src" / "__pycache__" / f"mod{m}.cpython-311.pyc", "\0" * 300)
+        for d in range(deps):
+            dep = pkg / "node_modules" / f"dep{d}"
+            _write(dep / "package.json", '{"name": "dep"}')
+            _write(dep / "index.js", "module.exports = {};\n" * 60)
+            _write(dep / "lib" / "util.js", "function u() { return 1; }\n" * 60)
+
+    for d in range(deps * 4):
+        _write(root / ".venv" / "lib" / "site-packages" / f"lib{d}" / "__init__.py", _code(rng, 6))
+
+
+def _measure(files_fn) -> dict:
+    t0 = time.perf_counter()
+    files = list(files_fn())
+    walk_s = time.perf_counter() - t0
+
+    chunks = 0
+    for f in files:
+        text = f.read_bytes().decode("utf-8", errors="replace")
+        chunks += len(chunk_content(text, f))
+    return {"files": len(files), "walk_ms": round(walk_s * 1000, 1), "chunks": chunks}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--packages", type=int, default=20)
+    ap.add_argument("--deps", type=int, default=40, help="node_modules packages per package")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="toolshed-mono-"))
+    try:
+        make_monorepo(root, args.packages, args.deps)
+        engine = IgnoreEngine(root)
+
+        def walk_all():
+            for dirpath, _dirs, files in os.walk(root):
+                for name in files:
+                    yield Path(dirpath) / name
+
+        results = {"all": _measure(walk_all), "ignore": _measure(engine.walk)}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    for name, r in results.items():
+        print(f"[bench] {name:<7} {r['files']:>7} files  walk {r['walk_ms']:>8} ms  {r['chunks']:>8} chunks")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+load_orchestrator.py — concurrent load test for the orchestrator.
+
+N client threads each hold one keep-alive connection and send
+requests back to back. Reports p50/p90/p99 latency, throughput and
+status codes (429 = backpressure, 504 = request timeout).
+
+    ai-toolshed serve      # in another terminal
+    python benchmarks/load_orchestrator.py --clients 16 --requests 50
+    python benchmarks/load_orchestrator.py --clients 1,4,16,64 --json out.json
+
+Compare against the single-threaded server by setting
+server_workers = 0 in rag_settings.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import socket
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+
+QUERIES = [
+    "where is the index built",
+    "how are files chunked",
+    "read file safely",
+    "qdrant collection",
+    "watcher debounce",
+    "embedding cache eviction",
+]
+
+
+def _percentile(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[i]
+
+
+# ------------------------------------------------------------
+# One client: a keep-alive connection, `requests` sequential calls
+# ------------------------------------------------------------
+def _client(url, endpoint, n, top_k, vary, latencies, codes, lock):
+    u = urlparse(url)
+    conn = http.client.HTTPConnection(u.hostname, u.port or 80, timeout=60)
+    mine, statuses = [], Counter()
+
+    def connect():
+        conn.connect()
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    for i in range(n):
+        query = QUERIES[i % len(QUERIES)] + (f" {i}" if vary else "")
+        body = json.dumps({"query": query, "top_k": top_k})
+        t0 = time.perf_counter()
+        try:
+            if conn.sock is None:
+                connect()
+            conn.request("POST", endpoint, body=body,
+                         headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            statuses[resp.status] += 1
+            if resp.getheader("Connection", "").lower() == "close":
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            statuses["error"] += 1
+            conn.close()
+        mine.append(time.perf_counter() - t0)
+
+    conn.close()
+    with lock:
+        latencies.extend(mine)
+        codes.update(statuses)
+
+
+# ------------------------------------------------------------
+# One run with `clients` concurrent clients
+# ------------------------------------------------------------
+def run_load(url, endpoint="/context", clients=8, requests=50, top_k=10, vary=False) -> dict:
+    latencies, codes, lock = [], Counter(), threading.Lock()
+    threads = [
+        threading.Thread(target=_client,
+                         args=(url, endpoint, requests, top_k, vary, latencies, codes, lock))
+        for _ in range(clients)
+    ]
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    lat = sorted(latencies)
+    return {
+        "clients": clients,
+        "requests": len(lat),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(lat) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(lat, 0.50) * 1000, 2),
+        "p90_ms": round(_percentile(lat, 0.90) * 1000, 2),
+        "p99_ms": round(_percentile(lat, 0.99) * 1000, 2),
+        "max_ms": round((lat[-1] if lat else 0.0) * 1000, 2),
+        "status": {str(k): v for k, v in sorted(codes.items(), key=str)},
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--url", default="http://127.0.0.1:5412")
+    ap.add_argument("--endpoint", default="/context")
+    ap.add_argument("--clients", default="1,4,16", help="comma-separated client counts")
+    ap.add_argument("--requests", type=int, default=50, help="requests per client")
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--vary", action="store_true",
+                    help="make every query unique (defeats the result cache)")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    results = []
+    for n in [int(c) for c in args.clients.split(",") if c]:
+        r = run_load(args.url, args.endpoint, n, args.requests, args.top_k, args.vary)
+        results.append(r)
+        print(
+            f"[load] clients={r['clients']:>3} reqs={r['requests']:>5} "
+            f"rps={r['rps']:>8} p50={r['p50_ms']}ms p90={r['p90_ms']}ms "
+            f"p99={r['p99_ms']}ms status={r['status']}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+offline.py — stand-ins that let benchmarks run without a model
+download or a vector database.
+
+HashBackend replaces the embedding model: every text maps to a fixed
+random row picked by its hash, so runs are deterministic and the
+embed step costs almost nothing (what is left is the plumbing around
+it). Pair it with vector_store = "numpy" for a fully in-process
+pipeline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+
+from rag_engine.backends import EmbeddingBackend
+
+
+class HashBackend(EmbeddingBackend):
+    """Deterministic pseudo-embeddings: a fixed random row per text hash."""
+    name = "hash"
+
+    def __init__(self, dim: int = 384, rows: int = 4096):
+        super().__init__("hash")
+        self.table = np.random.default_rng(0).standard_normal((rows, dim), dtype=np.float32)
+
+    def signature(self) -> str:
+        return f"hash-{self.table.shape[1]}"
+
+    def encode(self, texts):
+        idx = [
+            int.from_bytes(hashlib.blake2b(t.encode("utf-8", "surrogatepass"),
+                                           digest_size=8).digest(), "little")
+            % len(self.table)
+            for t in texts
+        ]
+        return self.table[idx]  # fancy indexing → a fresh array, like a model
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+qdrant_tuning.py — delete-by-file and search latency / RAM, untuned vs
+tuned Qdrant collection.
+
+  baseline  plain collection: no payload index, HNSW defaults,
+            vectors in RAM, no quantization
+  tuned     qdrant_init.create_collection() with the flags below:
+            keyword indexes on file_path / ext, HNSW m / ef_construct,
+            search ef, on-disk vectors, int8 quantization + rescoring
+
+Both collections get the same random unit vectors, spread evenly over
+--files file paths. delete_ms is one delete-by-file_path call; the file
+is re-inserted (untimed) afterwards so every delete sees a full
+collection. RAM is the resident set of --server-pid (or of this process
+in local mode) after each collection has been built and searched, read
+through psutil when it is installed; without psutil it comes from
+/proc, which only exists on Linux, and elsewhere the column is empty.
+
+Needs a Qdrant server: local mode is brute force and ignores indexes
+and tuning, so both rows would be the same.
+
+    python -m benchmarks.qdrant_tuning --url http://localhost:6333 \\
+        --points 500000 --server-pid $(pgrep -f qdrant)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from rag_engine import qdrant_init
+
+
+# Resident set of pid in MB, or None where it cannot be read
+def _rss_mb(pid: int):
+    pid = pid or os.getpid()
+    try:
+        import psutil
+        return round(psutil.Process(pid).memory_info().rss / 2**20, 1)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass  # no /proc: Windows, macOS
+    return None
+
+
+def _pct(vals, q):
+    vals = sorted(vals)
+    return round(vals[min(len(vals) - 1, int(q * len(vals)))] * 1000, 2)
+
+
+def _file_points(f: int, per_file: int, dim: int):
+    v = np.random.default_rng(f).standard_normal((per_file, dim), dtype=np.float32)
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    rel = f"src/mod{f}.py"
+    return [
+        qmodels.PointStruct(id=f * per_file + j, vector=row.tolist(),
+                            payload={"file_path": rel, "ext": ".py", "text": ""})
+        for j, row in enumerate(v)
+    ]
+
+
+def _fill(client, name, args, per_file):
+    batch = []
+    for f in range(args.files):
+        batch.extend(_file_points(f, per_file, args.dim))
+        if len(batch) >= args.batch:
+            client.upsert(collection_name=name, points=batch)
+            batch = []
+    if batch:
+        client.upsert(collection_name=name, points=batch)
+
+
+def _wait_indexed(client, name, timeout=3600):
+    # Server builds HNSW / quantized segments in the background
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if client.get_collection(name).status == qmodels.CollectionStatus.GREEN:
+            return
+        time.sleep(1)
+
+
+def run_config(client, name, args, tuned: bool) -> dict:
+    per_file = max(1, args.points // args.files)
+    params = None
+    if client.collection_exists(name):
+        client.delete_collection(name)
+
+    t0 = time.perf_counter()
+    if tuned:
+        t = qdrant_init.tuning(
+            qdrant_hnsw_m=args.m,
+            qdrant_hnsw_ef_construct=args.ef_construct,
+            qdrant_search_ef=args.ef,
+            qdrant_on_disk=args.on_disk,
+            qdrant_quantization=args.quantization,
+        )
+        qdrant_init.create_collection(client, name, args.dim, t, local=not args.url)
+        params = qdrant_init.search_params(t) if args.url else None
+    else:
+        client.create_collection(
+            collection_name=name,
+            vectors_config=qmodels.VectorParams(size=args.dim, distance=qmodels.Distance.COSINE),
+        )
+    _fill(client, name, args, per_file)
+    if args.url:
+        _wait_indexed(client, name)
+    build_s = time.perf_counter() - t0
+
+    queries = np.random.default_rng(10**6).standard_normal((args.queries, args.dim), dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    searches = []
+    for q in queries:
+        t0 = time.perf_counter()
+        client.query_points(collection_name=name, query=q.tolist(), limit=args.top_k,
+                            search_params=params, with_payload=True)
+        searches.append(time.perf_counter() - t0)
+
+    deletes = []
+    step = max(1, args.files // args.deletes)
+    for f in range(0, args.files, step)[:args.deletes]:
+        flt = qmodels.Filter(must=[qmodels.FieldCondition(
+            key="file_path", match=qmodels.MatchValue(value=f"src/mod{f}.py"))])
+        t0 = time.perf_counter()
+        client.delete(collection_name=name, points_selector=qmodels.FilterSelector(filter=flt), wait=True)
+        deletes.append(time.perf_counter() - t0)
+        client.upsert(collection_name=name, points=_file_points(f, per_file, args.dim))
+
+    return {
+        "config": "tuned" if tuned else "baseline",
+        "points": per_file * args.files,
+        "build_s": round(build_s, 1),
+        "search_p50_ms": _pct(searches, 0.5), "search_p99_ms": _pct(searches, 0.99),
+        "delete_p50_ms": _pct(deletes, 0.5), "delete_p99_ms": _pct(deletes, 0.99),
+        "rss_mb": _rss_mb(args.server_pid),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--url", default="", help="Qdrant server; empty = local mode in a temp dir")
+    ap.add_argument("--server-pid", type=int, default=0, help="report this process's RSS (psutil, or /proc on Linux)")
+    ap.add_argument("--points", type=int, default=500_000)
+    ap.add_argument("--files", type=int, default=5000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--batch", type=int, default=1024)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--deletes", type=int, default=50)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--m", type=int, default=16)
+    ap.add_argument("--ef-construct", type=int, default=100)
+    ap.add_argument("--ef", type=int, default=64)
+    ap.add_argument("--on-disk", action=argparse.BooleanOptionalAction, default=True)
+    ap.add_argument("--quantization", default="int8", help='"int8" or "" for none')
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    tmp = None
+    if args.url:
+        client = QdrantClient(url=args.url)
+    else:
+        print("[bench] No --url: local mode ignores indexes and tuning, expect equal rows")
+        tmp = tempfile.mkdtemp(prefix="toolshed-qdrant-")
+        client = QdrantClient(path=tmp)
+
+    results = []
+    try:
+        # Baseline first, and dropped before the tuned build, so the
+        # server's RSS reflects one collection at a time
+        for tuned in (False, True):
+            name = "bench_tuned" if tuned else "bench_baseline"
+            r = run_config(client, name, args, tuned)
+            client.delete_collection(name)
+            results.append(r)
+            print(
+                f"[bench] {r['config']:<8} {r['points']:>8} pts  build {r['build_s']:>7}s  "
+                f"search p50 {r['search_p50_ms']}ms p99 {r['search_p99_ms']}ms  "
+                f"delete p50 {r['delete_p50_ms']}ms p99 {r['delete_p99_ms']}ms  "
+                f"rss {'n/a' if r['rss_mb'] is None else r['rss_mb']} MB"
+            )
+    finally:
+        client.close()
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+startup_cli.py — startup time of each ai-toolshed subcommand.
+
+Every measurement runs in a fresh interpreter:
+  usage     the whole `python cli.py` run (prints the usage text)
+  <command> import cli + the modules that command imports
+  +warm     (--warm) serve/watch: the model load + dummy encode done
+            before they accept work
+
+    python benchmarks/startup_cli.py --repeat 5
+    python benchmarks/startup_cli.py --warm --json startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+TOOLSHED = Path(__file__).resolve().parents[1]
+
+# Keep in step with the imports inside cli.cmd_*
+COMMAND_IMPORTS = {
+    "bootstrap": "from toolshed.bootstrap import bootstrap",
+    "rebuild": "from rag_engine.indexer import build_full_index",
+    "index": "from rag_engine.indexer import build_full_index",
+    "query": "from rag_engine.retriever import retrieve_relevant_chunks",
+    "watch": "from rag_engine.watcher import start_watcher",
+    "serve": "from rag_engine.orchestrator import run",
+}
+
+_TIMED = """
+import time
+t0 = time.perf_counter()
+import cli
+{stmt}
+print(time.perf_counter() - t0)
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    paths = [str(TOOLSHED), str(TOOLSHED.parent), env.get("PYTHONPATH", "")]
+    env["PYTHONPATH"] = os.pathsep.join(p for p in paths if p)
+    return env
+
+
+def _timed(stmt: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _TIMED.format(stmt=stmt)],
+        cwd=TOOLSHED, env=_env(), capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _usage() -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "cli.py"], cwd=TOOLSHED, env=_env(),
+                   capture_output=True, check=True)
+    return time.perf_counter() - t0
+
+
+def _measure(fn, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        try:
+            runs.append(fn())
+        except Exception as e:
+            return {"error": str(e)}
+    return {"median_ms": round(statistics.median(runs) * 1000, 1),
+            "min_ms": round(min(runs) * 1000, 1)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--warm", action="store_true",
+                    help="also time the model warm-up of serve/watch")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    results = {"usage": _measure(_usage, args.repeat)}
+    for cmd, stmt in COMMAND_IMPORTS.items():
+        results[cmd] = _measure(lambda s=stmt: _timed(s), args.repeat)
+
+    if args.warm:
+        for cmd in ("serve", "watch"):
+            stmt = COMMAND_IMPORTS[cmd] + "\nfrom rag_engine.embedder import warm_up\nwarm_up()"
+            results[f"{cmd}+warm"] = _measure(lambda s=stmt: _timed(s), args.repeat)
+
+    for name, r in results.items():
+        if "error" in r:
+            print(f"[startup] {name:<12} error: {r['error']}")
+        else:
+            print(f"[startup] {name:<12} median {r['median_ms']:>8} ms   min {r['min_ms']:>8} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
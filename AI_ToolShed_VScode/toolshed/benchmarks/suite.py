@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+suite.py — offline end-to-end benchmark of the RAG pipeline.
+
+Runs in a throwaway install root (TOOLSHED_INSTALL_ROOT) holding a
+generated corpus (corpus.py), with the hash embedder (offline.py) and
+the embedded NumPy vector store, so nothing is downloaded and no
+server is needed. Stages:
+
+  chunk     load_and_chunk per file (read, hash, decode, chunk)
+  embed     embed_texts over the chunk texts, embed_batch_size at a time
+  index     build_full_index cold, then a no-change rebuild
+  watch     single-file edits through the watcher's IndexWorker, then
+            a burst of edits drained from the coalescing queue
+  retrieve  retrieve_relevant_chunks with the result caches off
+
+Each stage reports throughput, p50/p95/p99 latency where it has
+per-item timings, and the process peak RSS so far. Results are JSON
+tagged with the git commit; --compare prints the ratios between two
+result files.
+
+    python -m benchmarks.suite --files 2000 --json base.json
+    python -m benchmarks.suite --files 2000 --json new.json
+    python -m benchmarks.suite --compare base.json new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+STAGES = ("chunk", "embed", "index", "watch", "retrieve")
+
+
+# ------------------------------------------------------------
+# Measurement helpers
+# ------------------------------------------------------------
+def percentiles(samples) -> dict:
+    if not samples:
+        return {}
+    s = sorted(samples)
+    pick = lambda q: round(s[min(len(s) - 1, int(q * len(s)))] * 1000, 3)
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / 2**20, 1)
+        except Exception:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 1024), 1)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+# ------------------------------------------------------------
+# Stages (engine modules are imported only after the root is set)
+# ------------------------------------------------------------
+def stage_chunk(ctx, args) -> dict:
+    from rag_engine.chunker import load_and_chunk
+    from rag_engine.ignore import get_ignore
+    from configs.settings import get_setting
+
+    stream_min = int(get_setting("stream_min_bytes"))
+    lat, texts, nbytes, chunks = [], [], 0, 0
+    files = list(get_ignore().walk(ctx["workspace"]))
+    t0 = time.perf_counter()
+    for f in files:
+        s = time.perf_counter()
+        size = f.stat().st_size
+        _, out, _ = load_and_chunk(f, "", stream=size >= stream_min)
+        out = list(out or [])
+        lat.append(time.perf_counter() - s)
+        nbytes += size
+        chunks += len(out)
+        texts.extend(c.text for c in out)
+    elapsed = time.perf_counter() - t0
+
+    ctx["texts"] = texts
+    return {
+        "files": len(files), "chunks": chunks, "seconds": round(elapsed, 3),
+        "files_per_s": round(len(files) / elapsed, 1),
+        "mb_per_s": round(nbytes / 2**20 / elapsed, 2),
+        **percentiles(lat),
+    }
+
+
+def stage_embed(ctx, args) -> dict:
+    from rag_engine.embedder import embed_texts
+    from configs.settings import get_setting
+
+    texts = ctx["texts"][:args.embed_max]
+    batch = int(get_setting("embed_batch_size"))
+    lat = []
+    t0 = time.perf_counter()
+    for i in range(0, len(texts), batch):
+        s = time.perf_counter()
+        embed_texts(texts[i:i + batch], cache=False)
+        lat.append(time.perf_counter() - s)
+    elapsed = time.perf_counter() - t0
+    return {
+        "texts": len(texts), "batch": batch, "seconds": round(elapsed, 3),
+        "texts_per_s": round(len(texts) / elapsed, 1) if elapsed else None,
+        **percentiles(lat),
+    }
+
+
+def stage_index(ctx, args) -> dict:
+    from rag_engine.indexer import build_full_index
+    from rag_engine.vector_store import get_store
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cold = build_full_index(workers=args.workers)
+        t0 = time.perf_counter()
+        warm = build_full_index(workers=args.workers)
+        warm_s = time.perf_counter() - t0
+    return {
+        "files": cold.added, "chunks": cold.chunks, "failed": cold.failed,
+        "rejected": sum(cold.rejected.values()),
+        "seconds": round(cold.elapsed, 3),
+        "files_per_s": round(cold.added / cold.elapsed, 1),
+        "chunks_per_s": round(cold.chunks / cold.elapsed, 1),
+        "noop_rebuild_s": round(warm_s, 3), "noop_skipped": warm.skipped,
+        "points": get_store().count(),
+    }
+
+
+def stage_watch(ctx, args) -> dict:
+    import random
+    import threading
+
+    from rag_engine.event_queue import CoalescingQueue, INDEX
+    from rag_engine.ignore import get_ignore
+    from rag_engine.watcher import IndexWorker
+
+    rng = random.Random(args.seed)
+    files = [f for f in get_ignore().walk(ctx["workspace"])
+             if f.suffix in (".py", ".js", ".ts", ".md", ".txt")]
+    picked = rng.sample(files, min(len(files), args.edits * 2))
+    single, burst = picked[:args.edits], picked[args.edits:]
+
+    def edit(p: Path, n: int):
+        with open(p, "a", encoding="utf-8") as f:
+            f.write(f"\n# edit {n}\n")
+
+    # One edit at a time: event → reindexed (chunk diff, embed, write)
+    queue = CoalescingQueue(quiet=0)
+    worker = IndexWorker(queue, batch_size=1)
+    lat = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for n, p in enumerate(single):
+            edit(p, n)
+            s = time.perf_counter()
+            worker._process([(INDEX, p, None)])
+            lat.append(time.perf_counter() - s)
+
+        # Burst: many edits queued at once, drained in batches
+        queue = CoalescingQueue(quiet=0)
+        worker = IndexWorker(queue, batch_size=int(args.watch_batch))
+        for n, p in enumerate(burst):
+            edit(p, n)
+            queue.modified(p)
+        t0 = time.perf_counter()
+        runner = threading.Thread(target=worker.run)
+        runner.start()
+        queue.close()
+        runner.join()
+        burst_s = time.perf_counter() - t0
+
+    return {
+        "single_edits": len(single), **percentiles(lat),
+        "burst_files": len(burst), "burst_s": round(burst_s, 3),
+        "burst_files_per_s": round(len(burst) / burst_s, 1) if burst_s else None,
+    }
+
+
+def stage_retrieve(ctx, args) -> dict:
+    import random
+
+    from benchmarks.corpus import vocabulary
+    from rag_engine.retriever import retrieve_relevant_chunks
+
+    rng = random.Random(args.seed)
+    words = vocabulary(args.seed)
+    queries = [" ".join(rng.choice(words) for _ in range(rng.randint(2, 8)))
+               for _ in range(args.queries)]
+    retrieve_relevant_chunks(queries[0], top_k=args.top_k)  # map the store
+
+    lat, hits = [], 0
+    t0 = time.perf_counter()
+    for q in queries:
+        s = time.perf_counter()
+        hits += len(retrieve_relevant_chunks(q, top_k=args.top_k))
+        lat.append(time.perf_counter() - s)
+    elapsed = time.perf_counter() - t0
+    return {
+        "queries": len(queries), "top_k": args.top_k, "hits": hits,
+        "qps": round(len(queries) / elapsed, 1), **percentiles(lat),
+    }
+
+
+RUNNERS = {
+    "chunk": stage_chunk,
+    "embed": stage_embed,
+    "index": stage_index,
+    "watch": stage_watch,
+    "retrieve": stage_retrieve,
+}
+
+
+# ------------------------------------------------------------
+# Run
+# ------------------------------------------------------------
+def run(args) -> dict:
+    root = Path(tempfile.mkdtemp(prefix="toolshed-suite-"))
+    try:
+        # Must precede every engine import: paths.py reads it once
+        os.environ["TOOLSHED_INSTALL_ROOT"] = str(root)
+        (root / "configs").mkdir()
+        settings = {
+            "vector_store": "numpy",
+            "embed_cache_max_entries": 0,
+            "query_cache_size": 0,
+            "result_cache_size": 0,
+            "watch_reconcile": False,
+        }
+        settings.update(json.loads(args.settings) if args.settings else {})
+        (root / "configs" / "rag_settings.json").write_text(json.dumps(settings), encoding="utf-8")
+
+        from benchmarks.corpus import make_corpus
+        from benchmarks.offline import HashBackend
+        from rag_engine import embedder
+
+        embedder.use_backend(HashBackend(args.dim))
+
+        workspace = root / "workspace_files"
+        t0 = time.perf_counter()
+        corpus = make_corpus(workspace, args.files, args.large, args.large_mb, args.binary, args.seed)
+        corpus["seconds"] = round(time.perf_counter() - t0, 3)
+
+        ctx = {"workspace": workspace}
+        wanted = STAGES if args.stages == "all" else [s for s in args.stages.split(",") if s]
+        if ("embed" in wanted) and "chunk" not in wanted:
+            wanted = ["chunk"] + list(wanted)
+
+        stages = {}
+        for name in STAGES:
+            if name not in wanted:
+                continue
+            r = RUNNERS[name](ctx, args)
+            r["peak_rss_mb"] = peak_rss_mb()
+            stages[name] = r
+            print(f"[suite] {name:<8} " + "  ".join(f"{k}={v}" for k, v in r.items()))
+
+        return {
+            "meta": {
+                "commit": _git_commit(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "args": vars(args),
+                "settings": settings,
+            },
+            "corpus": corpus,
+            "stages": stages,
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+        else:
+            print(f"[suite] Kept {root}")
+
+
+# ------------------------------------------------------------
+# Compare two result files: new / base for every numeric metric
+# ------------------------------------------------------------
+def compare(base_path: str, new_path: str):
+    base = json.loads(Path(base_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"base {base['meta'].get('commit')}  →  new {new['meta'].get('commit')}")
+    for stage, metrics in new["stages"].items():
+        old = base["stages"].get(stage, {})
+        for k, v in metrics.items():
+            b = old.get(k)
+            if not isinstance(v, (int, float)) or not isinstance(b, (int, float)) or not b:
+                continue
+            print(f"  {stage:<8} {k:<20} {b:>12} → {v:>12}  ×{v / b:.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--large", type=int, default=2, help="multi-MB log files")
+    ap.add_argument("--large-mb", type=float, default=6.0)
+    ap.add_argument("--binary", type=float, default=0.03, help="fraction of binary files")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--workers", type=int, default=0, help="index processes (0 = auto)")
+    ap.add_argument("--embed-max", type=int, default=50_000, help="texts for the embed stage")
+    ap.add_argument("--edits", type=int, default=50, help="single + burst watcher edits")
+    ap.add_argument("--watch-batch", type=int, default=256)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--stages", default="all", help=",".join(STAGES))
+    ap.add_argument("--settings", help="JSON object merged into rag_settings.json")
+    ap.add_argument("--keep", action="store_true", help="keep the temporary install root")
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    args = ap.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run(args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+vector_path.py — allocations and time to carry N chunk vectors from
+the embedder to the upsert call.
+
+  lists   embed_texts() + a Python list per point (the old path)
+  array   embed_array() + per-row .tolist() at the Qdrant boundary
+  store   embed_array() rows handed over as-is (embedded store path)
+
+The model is replaced by a deterministic hash backend so only the
+vector plumbing is measured. Allocations come from tracemalloc:
+blocks and bytes still alive when the batch is ready to upsert, and
+the peak while building it (counted in a second, untimed run).
+
+    python -m benchmarks.vector_path --chunks 10000 --dim 384
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from benchmarks.offline import HashBackend
+from rag_engine.dispatcher import BULK
+from rag_engine import embedder
+
+
+def _lists(texts, batch):
+    points = []
+    for s in range(0, len(texts), batch):
+        vecs = embedder.embed_texts(texts[s:s + batch], cache=False, priority=BULK)
+        points.extend((i, v, None) for i, v in enumerate(vecs, s))
+    return points
+
+
+def _array(texts, batch):
+    points = []
+    for s in range(0, len(texts), batch):
+        vecs = embedder.embed_array(texts[s:s + batch], cache=False, priority=BULK)
+        points.extend((i, v.tolist(), None) for i, v in enumerate(vecs, s))
+    return points
+
+
+def _store(texts, batch):
+    blocks = []
+    for s in range(0, len(texts), batch):
+        blocks.append(embedder.embed_array(texts[s:s + batch], cache=False, priority=BULK))
+    return blocks
+
+
+PATHS = {"lists": _lists, "array": _array, "store": _store}
+
+
+def _measure(fn, texts, batch) -> dict:
+    # Timed without tracing (tracemalloc slows every allocation) ...
+    gc.collect()
+    t0 = time.perf_counter()
+    result = fn(texts, batch)
+    elapsed = time.perf_counter() - t0
+    del result
+
+    # ... then run again to count allocations
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    result = fn(texts, batch)
+    _, peak = tracemalloc.get_traced_memory()
+    diff = tracemalloc.take_snapshot().compare_to(base, "filename")
+    tracemalloc.stop()
+    del result
+
+    return {
+        "ms": round(elapsed * 1000, 1),
+        "live_blocks": sum(max(0, d.count_diff) for d in diff),
+        "live_mb": round(sum(max(0, d.size_diff) for d in diff) / 2**20, 2),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--chunks", type=int, default=10_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--batch", type=int, default=256)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    embedder.use_backend(HashBackend(args.dim))
+    texts = [f"chunk {i} " + "x" * (i % 200) for i in range(args.chunks)]
+    _store(texts[:args.batch], args.batch)  # start the dispatcher thread
+
+    results = {}
+    for name, fn in PATHS.items():
+        r = _measure(fn, texts, args.batch)
+        results[name] = r
+        print(
+            f"[bench] {name:<6} {r['ms']:>9} ms  live {r['live_blocks']:>9} blocks "
+            f"{r['live_mb']:>8} MB  peak {r['peak_mb']:>8} MB"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+vector_stores.py — NumpyStore vs Qdrant local mode.
+
+For each size, both stores are filled with the same random unit
+vectors (payloads spread over --files file paths), then queried:
+  insert_s      time to upsert everything (batches of --batch)
+  search p50/99 unfiltered top-k latency
+  filter p50/99 top-k restricted to one file_path
+
+Stores live in a temporary directory that is removed afterwards.
+Qdrant is skipped when qdrant-client is not installed; local mode is
+slow to fill at 1M points, so pass --stores numpy to skip it.
+
+--sizes defaults to 10000,100000; 1M points has to be asked for:
+
+    python -m benchmarks.vector_stores --sizes 10000,100000,1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from rag_engine.numpy_store import NumpyStore
+
+
+def _vectors(rng, n, dim):
+    v = rng.standard_normal((n, dim), dtype=np.float32)
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    return v
+
+
+def _pct(vals, q):
+    vals = sorted(vals)
+    return round(vals[min(len(vals) - 1, int(q * len(vals)))] * 1000, 2)
+
+
+# ------------------------------------------------------------
+# Store adapters: fill(ids, vecs, payloads), search(q, k, file_path)
+# ------------------------------------------------------------
+class _Numpy:
+    def __init__(self, root: Path, dim: int):
+        self.store = NumpyStore(root / "numpy")
+
+    def fill(self, ids, vecs, payloads):
+        self.store.upsert(ids, vecs, payloads)
+
+    def search(self, q, k, file_path=None):
+        return self.store.search(q, k, {"file_path": file_path} if file_path else None)
+
+
+class _Qdrant:
+    def __init__(self, root: Path, dim: int):
+        from qdrant_client import QdrantClient
+        from qdrant_client.http import models as qmodels
+
+        self.m = qmodels
+        self.client = QdrantClient(path=str(root / "qdrant"))
+        self.client.create_collection(
+            "bench", vectors_config=qmodels.VectorParams(size=dim, distance=qmodels.Distance.COSINE)
+        )
+
+    def fill(self, ids, vecs, payloads):
+        self.client.upsert("bench", points=[
+            self.m.PointStruct(id=str(uuid.uuid5(uuid.NAMESPACE_URL, pid)), vector=v.tolist(), payload=p)
+            for pid, v, p in zip(ids, vecs, payloads)
+        ])
+
+    def search(self, q, k, file_path=None):
+        flt = None
+        if file_path:
+            flt = self.m.Filter(must=[
+                self.m.FieldCondition(key="file_path", match=self.m.MatchValue(value=file_path))
+            ])
+        return self.client.search("bench", query_vector=q, query_filter=flt, limit=k)
+
+
+STORES = {"numpy": _Numpy, "qdrant": _Qdrant}
+
+
+def run_size(name, size, args) -> dict:
+    root = Path(tempfile.mkdtemp(prefix="toolshed-bench-"))
+    rng = np.random.default_rng(0)
+    store = None
+    try:
+        store = STORES[name](root, args.dim)
+
+        t0 = time.perf_counter()
+        for s in range(0, size, args.batch):
+            n = min(args.batch, size - s)
+            ids = [f"p{i}" for i in range(s, s + n)]
+            payloads = [{"file_path": f"f{i % args.files}.py", "text": ""} for i in range(s, s + n)]
+            store.fill(ids, _vectors(rng, n, args.dim), payloads)
+        insert_s = time.perf_counter() - t0
+
+        queries = _vectors(np.random.default_rng(1), args.queries, args.dim)
+        store.search(queries[0], args.top_k)  # warm maps / caches
+
+        plain, filtered = [], []
+        for i, q in enumerate(queries):
+            t0 = time.perf_counter()
+            store.search(q, args.top_k)
+            plain.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            store.search(q, args.top_k, f"f{i % args.files}.py")
+            filtered.append(time.perf_counter() - t0)
+
+        return {
+            "store": name, "size": size,
+            "insert_s": round(insert_s, 2),
+            "search_p50_ms": _pct(plain, 0.5), "search_p99_ms": _pct(plain, 0.99),
+            "filter_p50_ms": _pct(filtered, 0.5), "filter_p99_ms": _pct(filtered, 0.99),
+        }
+    finally:
+        del store
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sizes", default="10000,100000")
+    ap.add_argument("--stores", default="numpy,qdrant")
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--files", type=int, default=1000, help="distinct file_path values")
+    ap.add_argument("--batch", type=int, default=10_000)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    results = []
+    for size in [int(x) for x in args.sizes.split(",") if x]:
+        for name in [x for x in args.stores.split(",") if x]:
+            try:
+                r = run_size(name, size, args)
+            except ImportError as e:
+                print(f"[bench] {name}: skipped ({e})")
+                continue
+            results.append(r)
+            print(
+                f"[bench] {name:<6} {size:>9} pts  insert {r['insert_s']:>7}s  "
+                f"search p50 {r['search_p50_ms']}ms p99 {r['search_p99_ms']}ms  "
+                f"filter p50 {r['filter_p50_ms']}ms p99 {r['filter_p99_ms']}ms"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
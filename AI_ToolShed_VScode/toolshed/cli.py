@@ -6,11 +6,19 @@ cli.py — unified command-line interface for AI ToolShed.
 
 Commands:
     ai-toolshed bootstrap
-    ai-toolshed rebuild
-    ai-toolshed index
+    ai-toolshed rebuild [--workers N]     re-embed every file
+    ai-toolshed index [--workers N]       only files changed since the last run
     ai-toolshed query "text" [top_k]
     ai-toolshed watch
     ai-toolshed serve
+    ai-toolshed profile [--cprofile] [--tracemalloc] [--out FILE] rebuild|index|query ...
+
+`profile` runs one of rebuild / index / query with timing spans on
+(see rag_engine/profiler.py) and prints where the time went; the
+trace file opens in chrome://tracing, Perfetto or speedscope.
+
+Each command imports only the modules it needs, so `bootstrap` and
+the usage message never load torch, qdrant-client or watchdog.
 """
 
 from __future__ import annotations
@@ -18,42 +26,57 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-from toolshed.bootstrap import bootstrap
-from rag_engine.indexer import build_full_index, reindex_single_file, get_index_root
-from rag_engine.retriever import retrieve_relevant_chunks
-from rag_engine.watcher import start_watcher
-from rag_engine.orchestrator import run as run_orchestrator
-
 
 USAGE = """Usage:
   ai-toolshed bootstrap
-  ai-toolshed rebuild
-  ai-toolshed index
+  ai-toolshed rebuild [--workers N]     re-embed every file
+  ai-toolshed index [--workers N]       only files changed since the last run
   ai-toolshed query "text" [top_k]
   ai-toolshed watch
   ai-toolshed serve
+  ai-toolshed profile [--cprofile] [--tracemalloc] [--out FILE] rebuild|index|query ...
 """
 
 
 def cmd_bootstrap():
+    from toolshed.bootstrap import bootstrap
+
     bootstrap()
     print("Bootstrap complete.")
 
 
-def cmd_rebuild():
-    build_full_index()
-    print("Full index rebuilt.")
+def _usage_error():
+    print(USAGE)
+    sys.exit(2)
+
+
+def _int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        _usage_error()
+
+
+def _int_option(args, name, default=0):
+    if name in args:
+        i = args.index(name)
+        if i + 1 < len(args):
+            return _int(args[i + 1])
+    return default
+
+
+def cmd_rebuild(args):
+    from rag_engine.indexer import build_full_index
+
+    stats = build_full_index(workers=_int_option(args, "--workers"), force=True)
+    print(f"Full index rebuilt. {stats.summary()}")
+
 
+def cmd_index(args):
+    from rag_engine.indexer import build_full_index
 
-def cmd_index():
-    root = get_index_root()
-    for p in root.rglob("*"):
-        if p.is_file():
-            try:
-                reindex_single_file(p)
-            except Exception:
-                pass
-    print("Index updated.")
+    stats = build_full_index(workers=_int_option(args, "--workers"))
+    print(f"Index updated. {stats.summary()}")
 
 
 def cmd_query(args):
@@ -61,8 +84,10 @@ def cmd_query(args):
         print(USAGE)
         return
 
+    from rag_engine.retriever import retrieve_relevant_chunks
+
     query = args[0]
-    top_k = int(args[1]) if len(args) > 1 else 5
+    top_k = _int(args[1]) if len(args) > 1 else 5
 
     chunks = retrieve_relevant_chunks(query, top_k)
     for c in chunks:
@@ -73,13 +98,47 @@ def cmd_query(args):
 
 
 def cmd_watch():
+    from rag_engine.watcher import start_watcher
+
     start_watcher()
 
 
 def cmd_serve():
+    from rag_engine.orchestrator import run as run_orchestrator
+
     run_orchestrator()
 
 
+PROFILED = {
+    "rebuild": cmd_rebuild,
+    "index": cmd_index,
+    "query": cmd_query,
+}
+
+
+def cmd_profile(args):
+    out, cprofile, tracemalloc = "", False, False
+    while args and args[0].startswith("--"):
+        opt, args = args[0], args[1:]
+        if opt == "--out" and args:
+            out, args = args[0], args[1:]
+        elif opt == "--cprofile":
+            cprofile = True
+        elif opt == "--tracemalloc":
+            tracemalloc = True
+        else:
+            _usage_error()
+
+    if not args or args[0].lower() not in PROFILED:
+        _usage_error()
+
+    from rag_engine.profiler import run_profiled
+
+    name, rest = args[0].lower(), args[1:]
+    run_profiled(lambda: PROFILED[name](rest), name, out=out,
+                 cprofile=cprofile, tracemalloc=tracemalloc)
+
+
 def main():
     if len(sys.argv) < 2:
         print(USAGE)
@@ -90,17 +149,19 @@ def main():
     if cmd == "bootstrap":
         cmd_bootstrap()
     elif cmd == "rebuild":
-        cmd_rebuild()
+        cmd_rebuild(sys.argv[2:])
     elif cmd == "index":
-        cmd_index()
+        cmd_index(sys.argv[2:])
     elif cmd == "query":
         cmd_query(sys.argv[2:])
     elif cmd == "watch":
         cmd_watch()
     elif cmd == "serve":
         cmd_serve()
+    elif cmd == "profile":
+        cmd_profile(sys.argv[2:])
     else:
-        print(USAGE)
+        _usage_error()
 
 
 if __name__ == "__main__":
@@ -6,18 +6,28 @@ paths.py — canonical paths for AI ToolShed runtime.
 
 All indexing + RAG operations target ONLY:
     <INSTALL_ROOT>/workspace_files
+
+INSTALL_ROOT comes from venv_info.json, or from the
+TOOLSHED_INSTALL_ROOT environment variable when set (benchmarks run
+against a throwaway root this way).
 """
 
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
+ROOT_ENV = "TOOLSHED_INSTALL_ROOT"
+
 
 # ------------------------------------------------------------
 # Load venv_info.json
 # ------------------------------------------------------------
 def _load_info():
+    if os.environ.get(ROOT_ENV):
+        return {"install_root": os.environ[ROOT_ENV]}
+
     here = Path(__file__).resolve()
     configs = here.parent
     root = configs.parent
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+settings.py — tunables for the RAG engine.
+
+Defaults live in DEFAULTS below. Any key can be overridden in:
+    <INSTALL_ROOT>/configs/rag_settings.json
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+
+from configs.paths import get_install_root
+
+
+DEFAULTS = {
+    # On-disk chunk embedding cache (rows of float32 vectors); 0 disables
+    "embed_cache_max_entries": 100_000,
+
+    # Files larger than this are never read or embedded; 0 = no limit.
+    # Anything from stream_min_bytes up is streamed, so this only caps
+    # how much of a huge log or dump gets embedded, not memory use
+    "max_file_bytes": 1024 * 1024 * 1024,
+
+    # Files at least this large are memory-mapped and chunked as a
+    # stream, so memory stays bounded by the batch sizes below
+    "stream_min_bytes": 4 * 1024 * 1024,
+
+    # Structure-aware chunking (strategies.py): target chunk size and
+    # extension → strategy overrides, e.g. {".vue": "braces"}
+    "chunk_max_chars": 800,
+    "chunk_strategies": {},
+
+    # "chars" or "tokens": with "tokens", chunks are packed up to
+    # token_budget_fraction × embed_max_seq_length model tokens
+    # (all-MiniLM-L6-v2 truncates at 256)
+    "chunk_budget": "chars",
+    "token_budget_fraction": 0.9,
+    "embed_max_seq_length": 256,
+
+    # Vector storage: "qdrant" (embedded in <INSTALL_ROOT>/qdrant, or a
+    # server at qdrant_url) or "numpy" (in-process mmap store, compacted
+    # once tombstones exceed numpy_store_compact_ratio of its rows)
+    "vector_store": "qdrant",
+    "qdrant_url": "",
+    "numpy_store_compact_ratio": 0.25,
+
+    # Qdrant server tuning (local mode is brute force and ignores it).
+    # HNSW graph degree / build beam and the search beam (0 = server
+    # default); qdrant_on_disk keeps full vectors in mmap files;
+    # qdrant_quantization "int8" keeps a scalar-quantized copy in RAM
+    # and rescores the top limit × qdrant_oversampling with full vectors
+    "qdrant_hnsw_m": 16,
+    "qdrant_hnsw_ef_construct": 100,
+    "qdrant_search_ef": 0,
+    "qdrant_on_disk": False,
+    "qdrant_quantization": "",
+    "qdrant_rescore": True,
+    "qdrant_oversampling": 2.0,
+
+    # Embedding engine: "torch" (sentence-transformers) or "onnx"
+    # (ONNX Runtime, no torch); onnx_int8 quantizes the weights to int8.
+    # The model/tokenizer paths default to the files on the HF hub;
+    # onnx_threads = 0 lets ONNX Runtime choose
+    "embed_backend": "torch",
+    "onnx_int8": False,
+    "onnx_model_path": "",
+    "onnx_tokenizer_path": "",
+    "onnx_threads": 0,
+    "onnx_batch_size": 32,
+
+    # Embedding dispatcher: concurrent callers in one process share
+    # batched encode calls; a batch waits at most embed_dispatch_wait_ms
+    # for company and holds at most embed_dispatch_max_batch texts
+    # (bulk requests are sliced to this size so queries can cut in)
+    "embed_dispatch": True,
+    "embed_dispatch_wait_ms": 3,
+    "embed_dispatch_max_batch": 64,
+
+    # Full builds: chunks per model.encode call, points per Qdrant upsert
+    "embed_batch_size": 256,
+    "upsert_batch_size": 1024,
+
+    # Paths never indexed (gitignore syntax, see ignore.py); with
+    # ignore_files, .gitignore / .toolshedignore files in the tree
+    # add their own rules
+    "ignore_patterns": [
+        ".git/", ".hg/", ".svn/",
+        "node_modules/", "bower_components/", "vendor/",
+        "__pycache__/", "*.pyc", ".venv/", "venv/", ".tox/", ".nox/",
+        ".mypy_cache/", ".pytest_cache/", ".ruff_cache/", ".idea/",
+        "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock",
+        "Pipfile.lock", "Cargo.lock", "composer.lock", "Gemfile.lock",
+        "*.min.js", "*.min.css", "*.map",
+    ],
+    "ignore_files": True,
+
+    # Read/decode/chunk processes for full builds; 0 = CPU count - 1
+    "index_workers": 0,
+
+    # Watcher: a path is processed once it has been quiet this long;
+    # at most watch_batch_size paths are reindexed per batch
+    "watch_quiet_ms": 500,
+    "watch_batch_size": 256,
+
+    # On start the watcher diffs workspace_files against the manifest
+    # and queues what changed while it was not running; scan_workers
+    # threads list directories (0 = 4 × CPU count, at most 32)
+    "watch_reconcile": True,
+    "scan_workers": 0,
+
+    # Port on which `watch` serves /metrics and /healthz (0 = off);
+    # `serve` always has them on its own port
+    "watch_metrics_port": 0,
+
+    # Retriever LRU caches (entries): query vectors, and search results
+    # keyed on the index generation; 0 disables
+    "query_cache_size": 1024,
+    "result_cache_size": 256,
+
+    # Orchestrator: retrieval threads (0 = single-threaded server),
+    # requests allowed to wait for one before 429, open connection cap,
+    # per-request and idle keep-alive timeouts (seconds)
+    "server_workers": 4,
+    "server_max_queue": 32,
+    "server_max_connections": 64,
+    "server_request_timeout_s": 30,
+    "server_keepalive_timeout_s": 15,
+
+    # Most queries accepted in one /context/batch request
+    "server_max_batch_queries": 128,
+}
+
+
+_settings_lock = threading.Lock()
+_settings = None
+
+
+# ------------------------------------------------------------
+# Load overrides once
+# ------------------------------------------------------------
+def _load() -> dict:
+    merged = dict(DEFAULTS)
+    path = get_install_root() / "configs" / "rag_settings.json"
+    if path.exists():
+        try:
+            merged.update(json.loads(path.read_text(encoding="utf-8")))
+        except Exception:
+            print(f"[settings] Ignoring unreadable {path}")
+    return merged
+
+
+def get_setting(name: str):
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = _load()
+    return _settings.get(name, DEFAULTS.get(name))
+
+
+if __name__ == "__main__":
+    for k in DEFAULTS:
+        print(f"{k} = {get_setting(k)!r}")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+backends.py — interchangeable engines behind embedder.embed_array.
+
+  torch — SentenceTransformer on torch (default)
+  onnx  — the same model through ONNX Runtime; no torch import.
+          With onnx_int8 the weights are dynamically quantized to
+          int8 once and cached under <INSTALL_ROOT>/qdrant/onnx/.
+
+Select one with the embed_backend setting. Every backend returns
+float32 rows of the same shape and normalisation; the ONNX backend
+reproduces the model's SentenceTransformer pipeline (mean pooling +
+L2 normalisation) itself.
+
+Register more with register_backend(name, cls).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from configs.paths import get_qdrant_path
+from configs.settings import get_setting
+from rag_engine.embed_cache import model_slug
+
+
+# ------------------------------------------------------------
+# Interface
+# ------------------------------------------------------------
+class EmbeddingBackend:
+    name = "base"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """float32 array, one row per text."""
+        raise NotImplementedError
+
+    def signature(self) -> str:
+        # Part of the embedding cache and index version: vectors from
+        # backends with different signatures are never mixed
+        return f"{self.model_name}|{self.name}"
+
+
+# ------------------------------------------------------------
+# torch / sentence-transformers
+# ------------------------------------------------------------
+class TorchBackend(EmbeddingBackend):
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        super().__init__(model_name)
+        # Imported here so processes that never embed never load torch
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, convert_to_numpy=True)
+
+    def signature(self) -> str:
+        return self.model_name  # the original, pre-backend signature
+
+
+# ------------------------------------------------------------
+# ONNX Runtime (+ optional dynamic int8 quantization)
+# ------------------------------------------------------------
+def _hub_file(model_name: str, filename: str) -> str:
+    from huggingface_hub import hf_hub_download
+    return hf_hub_download(model_name, filename)
+
+
+def _quantized(src: str, model_name: str) -> str:
+    dst = get_qdrant_path() / "onnx" / model_slug(model_name) / "model.int8.onnx"
+    if dst.exists():
+        return str(dst)
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f"model.int8.{os.getpid()}.tmp.onnx")
+    print(f"[backends] Quantizing {src} → {dst}")
+    quantize_dynamic(src, str(tmp), weight_type=QuantType.QInt8)
+    os.replace(tmp, dst)
+    return str(dst)
+
+
+class OnnxBackend(EmbeddingBackend):
+    name = "onnx"
+
+    def __init__(self, model_name: str, int8: bool = None):
+        super().__init__(model_name)
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.int8 = bool(get_setting("onnx_int8")) if int8 is None else int8
+        if self.int8:
+            self.name = "onnx-int8"
+
+        src = get_setting("onnx_model_path") or _hub_file(model_name, "onnx/model.onnx")
+        path = _quantized(src, model_name) if self.int8 else src
+
+        opts = ort.SessionOptions()
+        threads = int(get_setting("onnx_threads") or 0)
+        if threads > 0:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        self.inputs = {i.name for i in self.session.get_inputs()}
+
+        tok_path = get_setting("onnx_tokenizer_path") or _hub_file(model_name, "tokenizer.json")
+        self.tokenizer = Tokenizer.from_file(tok_path)
+        self.tokenizer.enable_truncation(max_length=int(get_setting("embed_max_seq_length")))
+        self.tokenizer.enable_padding()
+
+        self.batch_size = int(get_setting("onnx_batch_size") or 32)
+
+    def _run(self, texts: List[str]) -> np.ndarray:
+        enc = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in enc], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in enc], dtype=np.int64)
+
+        feed = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.inputs:
+            feed["token_type_ids"] = np.array([e.type_ids for e in enc], dtype=np.int64)
+
+        hidden = self.session.run(None, feed)[0]  # (batch, tokens, dim)
+
+        # Mean pooling over real tokens, then L2 normalisation
+        m = mask[:, :, None].astype(np.float32)
+        pooled = (hidden * m).sum(axis=1) / np.clip(m.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        # Longest first, so each sub-batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        out = None
+
+        for s in range(0, len(order), self.batch_size):
+            idx = order[s:s + self.batch_size]
+            vecs = self._run([texts[i] for i in idx])
+            if out is None:
+                out = np.empty((len(texts), vecs.shape[1]), dtype=np.float32)
+            out[idx] = vecs
+
+        return out
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+BACKENDS: Dict[str, Callable[[str], EmbeddingBackend]] = {
+    "torch": TorchBackend,
+    "onnx": OnnxBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[[str], EmbeddingBackend]):
+    BACKENDS[name] = factory
+
+
+def backend_name() -> str:
+    return get_setting("embed_backend") or "torch"
+
+
+# Signature of the configured backend, without loading it
+def backend_signature(model_name: str) -> str:
+    name = backend_name()
+    if name == "torch":
+        return model_name
+    if name == "onnx" and get_setting("onnx_int8"):
+        return f"{model_name}|onnx-int8"
+    return f"{model_name}|{name}"
+
+
+def create_backend(model_name: str, name: str = None) -> EmbeddingBackend:
+    name = name or backend_name()
+    factory = BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"unknown embed_backend {name!r} (have: {', '.join(BACKENDS)})")
+    return factory(model_name)
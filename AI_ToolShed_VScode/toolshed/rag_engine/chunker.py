@@ -9,31 +9,92 @@ ONLY for:
 
 from __future__ import annotations
 
+import codecs
+import mmap
+import os
 import chardet
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
 
-from rag_engine.indexer import get_index_root
+from configs.paths import get_index_root
+from configs.settings import get_setting
+from rag_engine.manifest import content_hash
+from rag_engine.profiler import profiling, span
+from rag_engine.strategies import split_for_path, strategy_signature, line_index, line_at
+
+
+# Bump whenever chunk boundaries change so stale manifest entries are redone.
+CHUNKER_VERSION = f"structured-1|{strategy_signature()}"
+
+# Why a file was not chunked
+OUTSIDE = "outside"
+UNREADABLE = "unreadable"
+OVERSIZE = "oversize"
+BINARY = "binary"
+
+# Bytes inspected for NUL bytes / fed to chardet
+SNIFF_BYTES = 8 * 1024
+DECODE_SAMPLE_BYTES = 64 * 1024
+
+# Bytes decoded per step when streaming a large file
+STREAM_BLOCK_BYTES = 1024 * 1024
+
+_UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
 
 
 # ------------------------------------------------------------
-# Read file safely with encoding detection
+# Read raw bytes (only inside workspace_files)
+#
+# Returns (raw, reason); reason is "" for an accepted file,
+# otherwise one of OUTSIDE / UNREADABLE / OVERSIZE / BINARY.
+# Oversize files are rejected from fstat, before any read.
 # ------------------------------------------------------------
-def read_file_safely(path: Path) -> str:
+def _read_raw(path: Path) -> Tuple[bytes, str]:
     root = get_index_root()
 
     # Reject files outside workspace_files
     try:
         path.resolve().relative_to(root)
     except ValueError:
-        return ""
+        return b"", OUTSIDE
+
+    limit = int(get_setting("max_file_bytes") or 0)
 
     try:
-        raw = path.read_bytes()
+        with open(path, "rb") as f:
+            if limit and os.fstat(f.fileno()).st_size > limit:
+                return b"", OVERSIZE
+            raw = f.read()
     except Exception:
-        return ""
+        return b"", UNREADABLE
+
+    if _looks_binary(raw[:SNIFF_BYTES]):
+        return raw, BINARY
+
+    return raw, ""
+
+
+def _looks_binary(head: bytes) -> bool:
+    if head.startswith(_UTF16_BOMS):
+        return False  # UTF-16 text is full of NULs
+    return b"\x00" in head
+
+
+# ------------------------------------------------------------
+# Decode: strict UTF-8 first, chardet on a bounded sample after
+# ------------------------------------------------------------
+def _decode(raw: bytes) -> str:
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw[len(codecs.BOM_UTF8):].decode("utf-8", errors="ignore")
+    if raw.startswith(_UTF16_BOMS):
+        return raw.decode("utf-16", errors="ignore")
+
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
 
-    enc = chardet.detect(raw).get("encoding") or "utf-8"
+    enc = chardet.detect(raw[:DECODE_SAMPLE_BYTES]).get("encoding") or "utf-8"
 
     try:
         return raw.decode(enc, errors="ignore")
@@ -42,13 +103,32 @@ def read_file_safely(path: Path) -> str:
 
 
 # ------------------------------------------------------------
-# Chunk object
+# Read file safely with encoding detection
+# ------------------------------------------------------------
+def read_file_safely(path: Path) -> str:
+    raw, reason = _read_raw(path)
+    if reason or not raw:
+        return ""
+
+    return _decode(raw)
+
+
+# ------------------------------------------------------------
+# Chunk object (start/end are character offsets, start_line /
+# end_line 1-based inclusive; streamed chunks also carry byte
+# offsets into the file)
 # ------------------------------------------------------------
 class Chunk:
-    def __init__(self, text: str, start: int, end: int):
+    def __init__(self, text: str, start: int, end: int,
+                 byte_start: int = None, byte_end: int = None,
+                 start_line: int = None, end_line: int = None):
         self.text = text
         self.start = start
         self.end = end
+        self.byte_start = byte_start
+        self.byte_end = byte_end
+        self.start_line = start_line
+        self.end_line = end_line
 
 
 # ------------------------------------------------------------
@@ -72,14 +152,193 @@ def chunk_text(text: str, max_len: int = 512, overlap: int = 64) -> List[Chunk]:
 
 
 # ------------------------------------------------------------
-# Chunk a file
+# Chunk decoded text using the strategy registered for the
+# file's extension (see strategies.py); fixed character windows
+# when there is none
+# ------------------------------------------------------------
+def chunk_content(text: str, path: Path) -> List[Chunk]:
+    if not text:
+        return []
+
+    spans = split_for_path(text, path)
+    if spans is not None:
+        return [Chunk(text[s:e], s, e, start_line=a, end_line=b) for s, e, a, b in spans]
+
+    chunks = chunk_text(text)
+    newlines = line_index(text)
+    for c in chunks:
+        c.start_line = line_at(newlines, c.start)
+        c.end_line = line_at(newlines, max(c.start, min(c.end, len(text)) - 1))
+    return chunks
+
+
+# ------------------------------------------------------------
+# Streaming: pick (decoder, byte-measuring codec, BOM length)
+# from the head of the file
 # ------------------------------------------------------------
-def chunk_file(path: Path) -> List[Chunk]:
+def _stream_encoding(head: bytes):
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig", "utf-8", len(codecs.BOM_UTF8)
+    if head.startswith(codecs.BOM_UTF16_LE):
+        return "utf-16", "utf-16-le", 2
+    if head.startswith(codecs.BOM_UTF16_BE):
+        return "utf-16", "utf-16-be", 2
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8", "utf-8", 0
+    except UnicodeDecodeError:
+        pass
+
+    enc = chardet.detect(head).get("encoding") or "utf-8"
+    try:
+        codecs.lookup(enc)
+    except LookupError:
+        enc = "utf-8"
+    return enc, enc, 0
+
+
+# ------------------------------------------------------------
+# Streaming chunker for large files
+#
+# Memory-maps the file, decodes it STREAM_BLOCK_BYTES at a time
+# and yields the same windows chunk_text() would produce, with
+# byte offsets. Only one block of text is held at a time.
+# ------------------------------------------------------------
+def iter_file_chunks(path: Path, max_len: int = 512, overlap: int = 64) -> Iterator[Chunk]:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            dec_name, measure, bom = _stream_encoding(mm[:DECODE_SAMPLE_BYTES])
+            decoder = codecs.getincrementaldecoder(dec_name)(errors="ignore")
+
+            def nbytes(s: str) -> int:
+                return len(s.encode(measure, errors="ignore"))
+
+            step = max_len - overlap
+            buf = ""           # decoded text from `start` onwards
+            start = 0          # char offset of the next window
+            start_byte = bom   # byte offset of the next window
+            start_line = 1     # line of the next window
+            pos = 0
+
+            while True:
+                block = mm[pos:pos + STREAM_BLOCK_BYTES]
+                pos += len(block)
+                final = pos >= size
+                buf += decoder.decode(block, final=final)
+
+                # Full windows; at EOF also the short tail windows
+                while len(buf) >= max_len or (final and buf):
+                    seg = buf[:max_len]
+                    yield Chunk(seg, start, start + max_len,
+                                start_byte, start_byte + nbytes(seg),
+                                start_line, start_line + seg.count("\n", 0, len(seg) - 1))
+                    head = buf[:step]
+                    start_byte += nbytes(head)
+                    start_line += head.count("\n")
+                    start += step
+                    buf = buf[step:]
+
+                if final:
+                    return
+
+
+# ------------------------------------------------------------
+# Chunk a file (stream=True → generator over iter_file_chunks)
+# ------------------------------------------------------------
+def chunk_file(path: Path, stream: bool = False) -> Iterable[Chunk]:
+    if stream:
+        return iter_file_chunks(path)
+
     content = read_file_safely(path)
     if not content:
         return []
 
-    return chunk_text(content)
+    return chunk_content(content, path)
+
+
+# ------------------------------------------------------------
+# Read + hash + chunk in one pass (runs in indexing workers)
+#
+# Returns (content hash, chunks, reason). chunks is None when the
+# hash equals known_digest, i.e. the indexed content is still
+# current. A rejected file comes back with no chunks and its
+# reason (BINARY, OVERSIZE, ...).
+#
+# stream=True hashes the file through a memory map and returns a
+# lazy iter_file_chunks() generator instead of a list; use it in
+# the consuming process for files too large to hold in memory.
+# ------------------------------------------------------------
+def load_and_chunk(path: Path, known_digest: str = "", stream: bool = False):
+    if stream:
+        with span("read", path=path.name, stream=True):
+            digest, reason = _hash_mapped(path)
+    else:
+        with span("read", path=path.name):
+            raw, reason = _read_raw(path)
+        with span("hash"):
+            digest = content_hash(raw)
+
+    if reason == OVERSIZE:
+        digest = f"{OVERSIZE}:{path.stat().st_size}"
+
+    if digest == known_digest:
+        return digest, None, reason
+    if reason:
+        return digest, [], reason
+
+    if stream:
+        chunks = iter_file_chunks(path)
+        return digest, _spanned(chunks) if profiling() else chunks, ""
+
+    with span("decode"):
+        content = _decode(raw) if raw else ""
+    with span("chunk"):
+        chunks = chunk_content(content, path)
+    return digest, chunks, ""
+
+
+# Profile runs: streamed chunks are produced lazily by the consumer,
+# so each step of the generator gets its own "chunk" span
+def _spanned(chunks):
+    while True:
+        with span("chunk", stream=True):
+            ch = next(chunks, None)
+        if ch is None:
+            return
+        yield ch
+
+
+# ------------------------------------------------------------
+# Hash + sniff a large file without reading it into memory
+# ------------------------------------------------------------
+def _hash_mapped(path: Path) -> Tuple[str, str]:
+    root = get_index_root()
+
+    try:
+        path.resolve().relative_to(root)
+    except ValueError:
+        return content_hash(b""), OUTSIDE
+
+    limit = int(get_setting("max_file_bytes") or 0)
+
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if limit and size > limit:
+                return "", OVERSIZE
+            if size == 0:
+                return content_hash(b""), ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _looks_binary(mm[:SNIFF_BYTES]):
+                    return content_hash(mm), BINARY
+                return content_hash(mm), ""
+    except Exception:
+        return content_hash(b""), UNREADABLE
 
 
 if __name__ == "__main__":
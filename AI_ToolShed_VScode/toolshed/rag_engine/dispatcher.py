@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+dispatcher.py — micro-batching front end for model.encode.
+
+Callers on any thread hand their texts to one dispatcher thread and
+block. The dispatcher waits up to embed_dispatch_wait_ms for more
+requests to arrive, runs one batched encode of at most
+embed_dispatch_max_batch texts, and scatters the rows back.
+
+Two priorities:
+  QUERY — interactive search; always served first, never batched
+          together with bulk texts
+  BULK  — indexing; large requests are cut into max_batch slices,
+          so a query waits for at most one slice, not a whole rebuild
+          batch
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List
+
+import numpy as np
+
+
+QUERY = "query"
+BULK = "bulk"
+
+
+# ------------------------------------------------------------
+# One caller's texts and the rows computed for them so far
+# ------------------------------------------------------------
+class _Request:
+    __slots__ = ("texts", "taken", "parts", "left", "error", "done")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.taken = 0          # texts handed to a batch
+        self.parts = []         # row blocks, in text order
+        self.left = len(texts)  # texts not yet encoded
+        self.error = None
+        self.done = threading.Event()
+
+
+# ------------------------------------------------------------
+# Dispatcher
+# ------------------------------------------------------------
+class EmbedDispatcher:
+    def __init__(self, encode: Callable[[List[str]], np.ndarray],
+                 max_batch: int = 64, wait: float = 0.003):
+        self.encode_fn = encode
+        self.max_batch = max(1, max_batch)
+        self.wait = wait
+
+        self.batches = 0
+        self.texts = 0
+        self.query_requests = 0
+        self.bulk_requests = 0
+
+        self._queues = {QUERY: deque(), BULK: deque()}
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="embed-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "batches": self.batches,
+                "texts": self.texts,
+                "query_requests": self.query_requests,
+                "bulk_requests": self.bulk_requests,
+                "avg_batch": round(self.texts / self.batches, 1) if self.batches else 0.0,
+                "queued": sum(len(q) for q in self._queues.values()),
+            }
+
+    # --------------------------------------------------------
+    # Caller side: blocks until every text has a row
+    # --------------------------------------------------------
+    def encode(self, texts: List[str], priority: str = BULK) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        req = _Request(list(texts))
+        with self._cond:
+            if priority == QUERY:
+                self.query_requests += 1
+                self._queues[QUERY].append(req)
+            else:
+                self.bulk_requests += 1
+                self._queues[BULK].append(req)
+            self._cond.notify()
+
+        req.done.wait()
+        if req.error is not None:
+            raise req.error
+        if len(req.parts) == 1:
+            return req.parts[0]
+        return np.concatenate(req.parts)
+
+    # --------------------------------------------------------
+    # Dispatcher side
+    # --------------------------------------------------------
+    def _waiting(self) -> int:
+        return sum(len(r.texts) - r.taken for q in self._queues.values() for r in q)
+
+    def _take(self):
+        # [(request, lo, hi)] for the next batch
+        batch = []
+        room = self.max_batch
+
+        for name in (QUERY, BULK):
+            q = self._queues[name]
+            while q and room > 0:
+                req = q[0]
+                lo = req.taken
+                hi = min(len(req.texts), lo + room)
+                req.taken = hi
+                batch.append((req, lo, hi))
+                room -= hi - lo
+                if hi == len(req.texts):
+                    q.popleft()
+            if batch:
+                break  # queries never share a batch with bulk texts
+
+        return batch
+
+    def _next_batch(self):
+        with self._cond:
+            while not any(self._queues.values()):
+                self._cond.wait()
+
+            # Give concurrent callers a moment to join this batch
+            deadline = time.monotonic() + self.wait
+            while self._waiting() < self.max_batch and not self._queues[BULK]:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+
+            return self._take()
+
+    # --------------------------------------------------------
+    # Any error fails the callers it concerns, never the thread:
+    # a dead dispatcher would leave every caller waiting forever
+    # --------------------------------------------------------
+    def _loop(self):
+        while True:
+            batch = []
+            try:
+                batch = self._next_batch()
+                self._run(batch)
+            except Exception as e:
+                if batch:
+                    for req, _, _ in batch:
+                        self._fail(req, e)
+                else:
+                    self._fail_queued(e)
+
+    def _run(self, batch):
+        texts = [t for req, lo, hi in batch for t in req.texts[lo:hi]]
+
+        vecs = np.asarray(self.encode_fn(texts), dtype=np.float32)
+        if len(vecs) != len(texts):
+            raise ValueError(f"encode returned {len(vecs)} rows for {len(texts)} texts")
+
+        with self._cond:
+            self.batches += 1
+            self.texts += len(texts)
+
+        row = 0
+        for req, lo, hi in batch:
+            n = hi - lo
+            if req.error is None:
+                req.parts.append(vecs[row:row + n])
+                req.left -= n
+                if req.left == 0:
+                    req.done.set()
+            row += n
+
+    def _fail(self, req: _Request, e: Exception):
+        if req.error is not None:
+            return
+        req.error = e
+        with self._cond:
+            # drop the rest of a partly taken request
+            for q in self._queues.values():
+                if req in q:
+                    q.remove(req)
+        req.done.set()
+
+    # No batch to blame: fail everything waiting
+    def _fail_queued(self, e: Exception):
+        with self._cond:
+            pending = [req for q in self._queues.values() for req in q]
+        for req in pending:
+            self._fail(req, e)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+embed_cache.py — content-addressed on-disk cache of chunk embeddings.
+
+Keyed by (model + backend signature, SHA-1 of chunk text). Layout, next to Qdrant:
+    <INSTALL_ROOT>/qdrant/embed_cache/<model>/vectors.f32    memory-mapped float32 rows
+    <INSTALL_ROOT>/qdrant/embed_cache/<model>/index.sqlite   key → row slot + last use
+
+When the cache holds max_entries rows, the least recently used rows
+are overwritten. The indexer and the watcher both embed through
+embedder.embed_array, so they share this cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from configs.paths import get_qdrant_path
+from configs.settings import get_setting
+
+
+# Rows added to vectors.f32 each time it has to grow
+GROW_ROWS = 4096
+
+# SQLite limits bound parameters per statement
+_SQL_BATCH = 500
+
+
+# ------------------------------------------------------------
+# Cache key for one chunk text
+# ------------------------------------------------------------
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+# Model name → safe directory name (also used by backends.py)
+def model_slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+
+
+# ------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------
+class EmbeddingCache:
+    def __init__(self, root: Path, model_name: str, max_entries: int):
+        self.dir = root / model_slug(model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._vec_path = self.dir / "vectors.f32"
+        self._mm = None
+
+        self._db = sqlite3.connect(
+            str(self.dir / "index.sqlite"),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN/COMMIT below
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, slot INTEGER NOT NULL, used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries(used)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+        )
+
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        self._dim = int(row[0]) if row else None
+
+    # --------------------------------------------------------
+    # Memory map covering at least `rows` rows
+    # --------------------------------------------------------
+    def _map(self, rows: int) -> np.memmap:
+        if self._mm is not None and self._mm.shape[0] >= rows:
+            return self._mm
+
+        row_bytes = self._dim * 4
+        have = self._vec_path.stat().st_size // row_bytes if self._vec_path.exists() else 0
+
+        if have < rows:
+            want = max(rows, min(have + GROW_ROWS, self.max_entries))
+            self._mm = None  # must be unmapped before resizing on Windows
+            with open(self._vec_path, "ab") as f:
+                f.truncate(want * row_bytes)
+            have = want
+
+        self._mm = np.memmap(self._vec_path, dtype=np.float32, mode="r+",
+                             shape=(have, self._dim))
+        return self._mm
+
+    # --------------------------------------------------------
+    # Lookup: (hit mask, float32 rows) lined up with `keys`.
+    # Hit rows are gathered from the map in one copy; miss rows are
+    # left uninitialised. rows is None while the cache is empty.
+    # --------------------------------------------------------
+    def get_array(self, keys: List[str]):
+        hit = np.zeros(len(keys), dtype=bool)
+        if self._dim is None or not keys:
+            self.misses += len(keys)
+            return hit, None
+
+        with self._lock:
+            found = {}
+            for i in range(0, len(keys), _SQL_BATCH):
+                part = keys[i:i + _SQL_BATCH]
+                marks = ",".join("?" * len(part))
+                found.update(self._db.execute(
+                    f"SELECT key, slot FROM entries WHERE key IN ({marks})", part
+                ).fetchall())
+
+            rows = np.empty((len(keys), self._dim), dtype=np.float32)
+            if found:
+                idx = [i for i, k in enumerate(keys) if k in found]
+                hit[idx] = True
+                mm = self._map(max(found.values()) + 1)
+                rows[idx] = mm[[found[keys[i]] for i in idx]]
+
+                now = time.time_ns()
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "UPDATE entries SET used = ? WHERE key = ?",
+                    [(now, k) for k in found],
+                )
+                self._db.execute("COMMIT")
+
+        n = int(hit.sum())
+        self.hits += n
+        self.misses += len(keys) - n
+        return hit, rows
+
+    # --------------------------------------------------------
+    # Store vectors (rows of `vectors` line up with `keys`)
+    # --------------------------------------------------------
+    def put_many(self, keys: List[str], vectors):
+        if not keys or self.max_entries <= 0:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")  # serialises slot allocation across processes
+            try:
+                if self._dim is None:
+                    self._dim = int(vectors.shape[1])
+                    db.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self._dim),))
+                elif vectors.shape[1] != self._dim:
+                    db.execute("ROLLBACK")
+                    return
+
+                new = dict(zip(keys, vectors))
+                pending = list(new)
+                present = set()
+                for i in range(0, len(pending), _SQL_BATCH):
+                    part = pending[i:i + _SQL_BATCH]
+                    marks = ",".join("?" * len(part))
+                    present.update(r[0] for r in db.execute(
+                        f"SELECT key FROM entries WHERE key IN ({marks})", part
+                    ))
+                for k in present:
+                    new.pop(k)
+                if not new:
+                    db.execute("COMMIT")
+                    return
+
+                count = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                free = max(0, self.max_entries - count)
+                slots = list(range(count, count + min(free, len(new))))
+
+                # Reuse the least recently used rows for the remainder
+                need = len(new) - len(slots)
+                if need > 0:
+                    victims = db.execute(
+                        "SELECT key, slot FROM entries ORDER BY used LIMIT ?", (need,)
+                    ).fetchall()
+                    db.executemany("DELETE FROM entries WHERE key = ?",
+                                   [(k,) for k, _ in victims])
+                    slots.extend(s for _, s in victims)
+
+                items = list(new.items())[:len(slots)]
+                mm = self._map(max(slots) + 1)
+                for (_, vec), slot in zip(items, slots):
+                    mm[slot] = vec
+                mm.flush()
+
+                now = time.time_ns()
+                db.executemany(
+                    "INSERT INTO entries (key, slot, used) VALUES (?, ?, ?)",
+                    [(k, slot, now) for (k, _), slot in zip(items, slots)],
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+
+# ------------------------------------------------------------
+# Shared instance per model (None when disabled)
+# ------------------------------------------------------------
+_cache_lock = threading.Lock()
+_caches: Dict[str, EmbeddingCache] = {}
+
+
+def get_embed_cache(model_name: str):
+    max_entries = int(get_setting("embed_cache_max_entries") or 0)
+    if max_entries <= 0:
+        return None
+
+    with _cache_lock:
+        cache = _caches.get(model_name)
+        if cache is None:
+            cache = EmbeddingCache(get_qdrant_path() / "embed_cache", model_name, max_entries)
+            _caches[model_name] = cache
+    return cache
+
+
+if __name__ == "__main__":
+    from rag_engine.embedder import embed_signature
+
+    c = get_embed_cache(embed_signature())
+    if c is None:
+        print("Embedding cache disabled.")
+    else:
+        n = c._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        print(f"{c.dir}: {n} / {c.max_entries} entries")
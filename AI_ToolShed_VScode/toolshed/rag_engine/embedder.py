@@ -4,42 +4,177 @@
 """
 embedder.py — unified embeddings for the entire RAG system.
 
-Uses SentenceTransformer or, if missing, falls back to a minimal pipeline.
+Uses SentenceTransformer on torch, or ONNX Runtime when the
+embed_backend setting says so (backends.py).
 Embedding dimension must remain 768 to match Qdrant schema.
 """
 
 from __future__ import annotations
 
 import threading
-from sentence_transformers import SentenceTransformer
+import time
 
+import numpy as np
 
-# Global lock + lazy-loaded model
+from configs.settings import get_setting
+from rag_engine.backends import create_backend, backend_signature
+from rag_engine.dispatcher import EmbedDispatcher, QUERY, BULK
+from rag_engine.embed_cache import get_embed_cache, text_key
+from rag_engine.metrics import EMBED_SECONDS
+from rag_engine.profiler import span
+
+
+# Global lock + lazy-loaded backend (see backends.py)
 _model_lock = threading.Lock()
 _model = None
 
+_dispatcher_lock = threading.Lock()
+_dispatcher = None
+
+_dim = 0
+
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"  # 384 or 768 depending on version
 
 
+def embed_signature() -> str:
+    """Model + backend; vectors under different signatures never mix."""
+    if _model is not None:
+        return _model.signature()
+    return backend_signature(MODEL_NAME)
+
+
 def _load_model():
     global _model
     with _model_lock:
         if _model is None:
-            _model = SentenceTransformer(MODEL_NAME)
+            _model = create_backend(MODEL_NAME)
+            print(f"[embedder] Backend: {_model.name}")
     return _model
 
 
+def use_backend(backend):
+    """Replace the configured backend (benchmarks and tools)."""
+    global _model
+    with _model_lock:
+        _model = backend
+
+
+def _model_encode(texts):
+    return _load_model().encode(texts)
+
+
+def get_dispatcher():
+    """Shared micro-batching dispatcher, or None when disabled."""
+    global _dispatcher
+    if not get_setting("embed_dispatch"):
+        return None
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = EmbedDispatcher(
+                _model_encode,
+                max_batch=int(get_setting("embed_dispatch_max_batch")),
+                wait=float(get_setting("embed_dispatch_wait_ms")) / 1000.0,
+            )
+    return _dispatcher
+
+
+def model_loaded() -> bool:
+    return _model is not None
+
+
+# Timed as the caller sees it: dispatcher wait + model time
+def _encode(texts, priority):
+    started = time.perf_counter()
+    d = get_dispatcher()
+    try:
+        with span("embed", texts=len(texts), priority=priority):
+            if d is None:
+                return _model_encode(texts)
+            return d.encode(texts, priority)
+    finally:
+        EMBED_SECONDS.observe(time.perf_counter() - started, priority)
+
+
 # ------------------------------------------------------------
-# Embed list of strings
+# Contiguous float32 rows, L2-normalised in place
 # ------------------------------------------------------------
-def embed_texts(texts):
+def normalize_rows(vecs) -> np.ndarray:
+    vecs = np.ascontiguousarray(vecs, dtype=np.float32)  # no copy if already so
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    np.divide(vecs, np.maximum(norms, 1e-12), out=vecs)
+    return vecs
+
+
+# ------------------------------------------------------------
+# Embed list of strings → (n, dim) float32 array
+#
+# Rows are contiguous and L2-normalised; keep them as arrays and
+# convert only where a client insists on lists.
+#
+# Chunk texts already embedded by this model come from the on-disk
+# cache (see embed_cache.py); only the misses reach the model.
+# Pass cache=False for one-off texts such as search queries.
+#
+# priority: QUERY for interactive searches, BULK for indexing; the
+# dispatcher serves QUERY callers ahead of BULK ones.
+# ------------------------------------------------------------
+def embed_array(texts, cache: bool = True, priority: str = BULK) -> np.ndarray:
+    if not len(texts):
+        return np.empty((0, 0), dtype=np.float32)
+
+    store = get_embed_cache(embed_signature()) if cache else None
+    if store is None:
+        return normalize_rows(_encode(list(texts), priority))
+
+    keys = [text_key(t) for t in texts]
+    hit, rows = store.get_array(keys)
+    if hit.all():
+        return rows
+
+    # Unique misses, in first-seen order
+    todo = {}
+    for k, t, h in zip(keys, texts, hit):
+        if not h and k not in todo:
+            todo[k] = t
+
+    vecs = normalize_rows(_encode(list(todo.values()), priority))
+    store.put_many(list(todo), vecs)
+
+    if rows is None:
+        rows = np.empty((len(keys), vecs.shape[1]), dtype=np.float32)
+    pos = {k: j for j, k in enumerate(todo)}
+    miss = np.flatnonzero(~hit)
+    rows[miss] = vecs[[pos[keys[i]] for i in miss]]
+    return rows
+
+
+# List-of-lists form, for callers that need plain Python floats
+def embed_texts(texts, cache: bool = True, priority: str = BULK):
     if not texts:
         return []
+    return embed_array(texts, cache=cache, priority=priority).tolist()
+
+
+# ------------------------------------------------------------
+# Output size of the configured model (loads it on first call)
+# ------------------------------------------------------------
+def embedding_dim() -> int:
+    global _dim
+    if not _dim:
+        _dim = int(np.asarray(_encode(["dimension probe"], QUERY)).shape[1])
+    return _dim
 
-    model = _load_model()
-    vecs = model.encode(texts, convert_to_numpy=True)
 
-    return vecs.tolist()
+# ------------------------------------------------------------
+# Load the model and run one dummy encode (through the dispatcher,
+# so its thread is up too). Long-running commands call this before
+# accepting work, so the first real request does not pay for it.
+# Returns the seconds spent.
+# ------------------------------------------------------------
+def warm_up() -> float:
+    started = time.perf_counter()
+    _encode(["warm up"], QUERY)
+    return time.perf_counter() - started
 
 
 # ------------------------------------------------------------
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+event_queue.py — debounced, coalescing queue of file-system events.
+
+The watcher pushes raw watchdog events in; a background worker takes
+out at most one operation per path once that path has been quiet for
+`quiet` seconds:
+
+    modified × N           → one INDEX
+    created → deleted      → nothing
+    a → b → c (moves)      → one MOVE a → c
+    created → moved a → b  → one INDEX of b
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+INDEX = "index"
+DELETE = "delete"
+MOVE = "move"
+
+
+# ------------------------------------------------------------
+# Pending work for one path
+# ------------------------------------------------------------
+class PendingOp:
+    __slots__ = ("op", "origin", "fresh", "last")
+
+    def __init__(self, op: str, origin: Optional[Path] = None, fresh: bool = False):
+        self.op = op
+        self.origin = origin    # MOVE only: where the file was indexed before
+        self.fresh = fresh      # created since the last flush → never indexed
+        self.last = 0.0
+
+
+# ------------------------------------------------------------
+# Queue
+# ------------------------------------------------------------
+class CoalescingQueue:
+    def __init__(self, quiet: float):
+        self.quiet = quiet
+
+        self.received = 0     # raw events pushed in
+        self.coalesced = 0    # events absorbed into pending work
+        self.emitted = 0      # operations handed to the worker
+
+        self._pending: "OrderedDict[Path, PendingOp]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "depth": len(self._pending),
+                "received": self.received,
+                "coalesced": self.coalesced,
+                "emitted": self.emitted,
+            }
+
+    # --------------------------------------------------------
+    # Producers (watchdog observer thread)
+    # --------------------------------------------------------
+    def _put(self, path: Path, e: PendingOp):
+        e.last = time.monotonic()
+        self._pending[path] = e
+        self._pending.move_to_end(path)  # keeps entries ordered by last event
+        self._cond.notify()
+
+    def created(self, path: Path):
+        with self._cond:
+            self.received += 1
+            e = self._pending.get(path)
+            if e is None:
+                e = PendingOp(INDEX, fresh=True)
+            else:
+                self.coalesced += 1
+                if e.op == DELETE:
+                    e.op = INDEX
+            self._put(path, e)
+
+    def modified(self, path: Path):
+        with self._cond:
+            self.received += 1
+            e = self._pending.get(path)
+            if e is None:
+                e = PendingOp(INDEX)
+            else:
+                self.coalesced += 1
+                if e.op == DELETE:
+                    e.op = INDEX
+            self._put(path, e)
+
+    def deleted(self, path: Path):
+        with self._cond:
+            self.received += 1
+            e = self._pending.pop(path, None)
+
+            if e is None:
+                self._put(path, PendingOp(DELETE))
+                return
+
+            self.coalesced += 1
+            if e.fresh:
+                return  # created → deleted: nothing to do
+
+            if e.op == MOVE:
+                # Only the vectors under the original path exist
+                self._delete_origin(e.origin)
+                return
+
+            self._put(path, PendingOp(DELETE))
+
+    def moved(self, src: Path, dst: Path):
+        with self._cond:
+            self.received += 1
+            e = self._pending.pop(src, None)
+
+            if e is None:
+                new = PendingOp(MOVE, origin=src)
+            else:
+                self.coalesced += 1
+                if e.fresh:
+                    new = PendingOp(INDEX, fresh=True)
+                elif e.op == MOVE:
+                    new = PendingOp(MOVE, origin=e.origin)
+                else:
+                    new = PendingOp(MOVE, origin=src)
+
+            if new.op == MOVE and new.origin == dst:
+                new = PendingOp(INDEX)  # moved back where it started
+
+            # dst is overwritten: a move pending into dst still has
+            # to clear its own origin
+            old = self._pending.get(dst)
+            if old is not None and old.op == MOVE and old.origin != new.origin:
+                self._delete_origin(old.origin)
+
+            self._put(dst, new)
+
+    def _delete_origin(self, origin: Path):
+        if origin not in self._pending:
+            self._put(origin, PendingOp(DELETE))
+
+    # --------------------------------------------------------
+    # Consumer
+    #
+    # Blocks until at least one path has been quiet for `quiet`
+    # seconds, then returns up to max_items (op, path, origin).
+    # After close() everything left is returned at once, then [].
+    # --------------------------------------------------------
+    def take(self, max_items: int) -> List[Tuple[str, Path, Optional[Path]]]:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                out = []
+                for path, e in self._pending.items():
+                    if len(out) >= max_items:
+                        break
+                    if not self._closed and now - e.last < self.quiet:
+                        break  # ordered by last event → nothing later is ready
+                    out.append((path, e))
+
+                if out:
+                    for path, _ in out:
+                        del self._pending[path]
+                    self.emitted += len(out)
+                    return [(e.op, path, e.origin) for path, e in out]
+
+                if self._closed:
+                    return []
+
+                timeout = None
+                if self._pending:
+                    first = next(iter(self._pending.values()))
+                    timeout = max(0.0, first.last + self.quiet - now)
+                self._cond.wait(timeout)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+generation.py — index generation counter shared across processes.
+
+The watcher, the CLI indexer and the orchestrator are separate
+processes, so the counter lives in a file next to the Qdrant storage:
+    <INSTALL_ROOT>/qdrant/index_generation
+
+Writers call mark_dirty() whenever they touch the collection and
+bump_if_dirty() at the end of a batch. Readers call
+current_generation(), which costs one stat() while nothing changes.
+Result caches keyed on the generation go stale automatically.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from configs.paths import get_qdrant_path
+
+
+GEN_FILE = "index_generation"
+
+_lock = threading.Lock()
+_dirty = False
+_cached = (None, 0)   # ((inode, mtime_ns), generation) of the last read
+
+
+def _path():
+    return get_qdrant_path() / GEN_FILE
+
+
+def _read() -> int:
+    try:
+        return int(_path().read_text(encoding="utf-8").strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+# ------------------------------------------------------------
+# Readers
+# ------------------------------------------------------------
+def current_generation() -> int:
+    global _cached
+    try:
+        st = os.stat(_path())
+    except OSError:
+        return 0
+
+    # os.replace() gives every bump a new inode, so this changes even
+    # where mtime resolution is coarse
+    stamp = (st.st_ino, st.st_mtime_ns)
+    if _cached[0] == stamp:
+        return _cached[1]
+
+    gen = _read()
+    _cached = (stamp, gen)
+    return gen
+
+
+# ------------------------------------------------------------
+# Writers
+# ------------------------------------------------------------
+def mark_dirty():
+    global _dirty
+    _dirty = True
+
+
+def bump_generation() -> int:
+    global _dirty
+    with _lock:
+        # time-based floor keeps the value moving even if two
+        # processes race on the same previous value
+        gen = max(_read() + 1, time.time_ns())
+        path = _path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{GEN_FILE}.{os.getpid()}.tmp")
+        tmp.write_text(str(gen), encoding="utf-8")
+        os.replace(tmp, path)
+        _dirty = False
+    return gen
+
+
+def bump_if_dirty():
+    if _dirty:
+        bump_generation()
+
+
+if __name__ == "__main__":
+    print(current_generation())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ignore.py — which paths under workspace_files are never indexed.
+
+Rules come from, in increasing precedence:
+    ignore_patterns setting      built-in defaults (VCS dirs, caches,
+                                 dependency trees, lockfiles)
+    .gitignore / .toolshedignore in any directory, applying to the
+                                 paths below it
+
+Patterns follow gitignore syntax: "#" comments, "!" re-includes,
+a trailing "/" matches directories only, a "/" at the start or in
+the middle anchors the pattern to its file's directory, "*" / "?" /
+"[...]" do not cross "/", "**" does. The last matching rule wins.
+Each pattern is compiled to one regex when its file is first needed.
+
+An ignored directory is pruned: nothing below it is listed or
+matched, so (as with git) a file inside it cannot be re-included.
+The indexer, the CLI (through the indexer), the watcher and the
+startup scan all share get_ignore().
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from configs.paths import get_install_root
+from configs.settings import get_setting
+
+
+IGNORE_FILES = (".gitignore", ".toolshedignore")
+
+
+# ------------------------------------------------------------
+# gitignore pattern → regex over a "/"-separated relative path
+# ------------------------------------------------------------
+def _translate(pat: str) -> str:
+    out, i, n = [], 0, len(pat)
+    while i < n:
+        c = pat[i]
+        if c == "*":
+            if pat[i:i + 2] == "**":
+                at_start = i == 0 or pat[i - 1] == "/"
+                if at_start and pat[i + 2:i + 3] == "/":
+                    out.append("(?:.*/)?")      # "**/" → any leading dirs
+                    i += 3
+                    continue
+                if at_start and i + 2 == n:
+                    out.append(".*")            # trailing "/**"
+                    i += 2
+                    continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pat.find("]", i + 2 if pat[i + 1:i + 2] in ("!", "]") else i + 1)
+            if j < 0:
+                out.append(re.escape(c))
+            else:
+                body = pat[i + 1:j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pat[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _compile(line: str) -> Optional[Tuple["re.Pattern", bool, bool]]:
+    """(regex, negate, dir_only) for one pattern line, or None."""
+    if line.endswith("\n"):
+        line = line[:-1]
+    line = line.rstrip("\r")
+    if not line or line.startswith("#"):
+        return None
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:] if line[1:2] in ("!", "#") else line
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    anchored = "/" in line
+    line = line.lstrip("/")
+    body = _translate(line)
+    if not anchored:
+        body = "(?:.*/)?" + body
+    return re.compile(body + r"\Z", re.DOTALL), negate, dir_only
+
+
+class RuleSet:
+    """Rules from one source, relative to directory `base` ("" = root)."""
+
+    def __init__(self, base: str, lines):
+        self.base = base
+        self.rules = [r for r in map(_compile, lines) if r is not None]
+
+    # None: no rule matched; else True (ignored) / False (re-included)
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        if self.base:
+            if not rel.startswith(self.base + "/"):
+                return None
+            rel = rel[len(self.base) + 1:]
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                result = not negate
+        return result
+
+
+# ------------------------------------------------------------
+# Engine for one tree
+# ------------------------------------------------------------
+class IgnoreEngine:
+    def __init__(self, root: Path, patterns: Optional[List[str]] = None,
+                 use_files: bool = True):
+        self.root = Path(root)
+        if patterns is None:
+            patterns = list(get_setting("ignore_patterns") or [])
+        self.defaults = RuleSet("", patterns)
+        self.use_files = use_files
+
+        self._lock = threading.Lock()
+        self._chains: Dict[str, List[RuleSet]] = {}   # dir → rule sets in effect
+        self._dirs: Dict[str, bool] = {}              # dir → ignored (itself or a parent)
+
+    def invalidate(self):
+        """Forget loaded ignore files (call when one changes)."""
+        with self._lock:
+            self._chains.clear()
+            self._dirs.clear()
+
+    # Rule sets applying to entries of directory `d` ("/"-separated)
+    def _chain(self, d: str) -> List[RuleSet]:
+        chain = self._chains.get(d)
+        if chain is not None:
+            return chain
+
+        parent = self._chain(d.rpartition("/")[0]) if d else [self.defaults]
+        own = []
+        if self.use_files:
+            base = self.root / d if d else self.root
+            for name in IGNORE_FILES:
+                try:
+                    text = (base / name).read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    continue
+                own.append(RuleSet(d, text.splitlines()))
+        chain = parent + own if own else parent
+        with self._lock:
+            self._chains[d] = chain
+        return chain
+
+    def _match(self, rel: str, is_dir: bool) -> bool:
+        result = False
+        for rules in self._chain(rel.rpartition("/")[0]):
+            r = rules.match(rel, is_dir)
+            if r is not None:
+                result = r
+        return result
+
+    def _dir_ignored(self, d: str) -> bool:
+        if not d:
+            return False
+        hit = self._dirs.get(d)
+        if hit is None:
+            hit = self._dir_ignored(d.rpartition("/")[0]) or self._match(d, True)
+            with self._lock:
+                self._dirs[d] = hit
+        return hit
+
+    # --------------------------------------------------------
+    # Public checks; rel may use os.sep or "/"
+    # --------------------------------------------------------
+    def ignored(self, rel: str, is_dir: bool = False) -> bool:
+        rel = rel.replace(os.sep, "/").strip("/")
+        if not rel:
+            return False
+        if is_dir:
+            return self._dir_ignored(rel)
+        return self._dir_ignored(rel.rpartition("/")[0]) or self._match(rel, False)
+
+    def ignored_path(self, path: Path) -> bool:
+        """Absolute path check (for watcher events); outside root → False."""
+        try:
+            rel = str(Path(path).resolve().relative_to(self.root.resolve()))
+        except ValueError:
+            return False
+        return self.ignored(rel, Path(path).is_dir())
+
+    # --------------------------------------------------------
+    # Walk: files that are not ignored, pruning ignored dirs
+    # --------------------------------------------------------
+    def walk(self, top: Optional[Path] = None) -> Iterator[Path]:
+        top = Path(top) if top else self.root
+        root = self.root.resolve()
+        for dirpath, dirs, files in os.walk(top):
+            base = Path(dirpath).resolve().relative_to(root).as_posix()
+            base = "" if base == "." else base + "/"
+            dirs[:] = sorted(d for d in dirs if not self.ignored(base + d, True))
+            for name in sorted(files):
+                if not self.ignored(base + name):
+                    yield Path(dirpath) / name
+
+
+# ------------------------------------------------------------
+# Shared instance for workspace_files
+# ------------------------------------------------------------
+_engine_lock = threading.Lock()
+_engine = None
+
+
+def get_ignore() -> IgnoreEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            root = Path(get_install_root()) / "workspace_files"
+            _engine = IgnoreEngine(root, use_files=bool(get_setting("ignore_files")))
+    return _engine
+
+
+if __name__ == "__main__":
+    import sys
+
+    engine = get_ignore()
+    for arg in sys.argv[1:]:
+        print(f"{arg}: {'ignored' if engine.ignored_path(Path(arg)) else 'indexed'}")
+    if len(sys.argv) == 1:
+        n = sum(1 for _ in engine.walk())
+        print(f"{engine.root}: {n} files would be indexed")
@@ -5,24 +5,53 @@
 indexer.py — indexes ONLY the folder:
     <INSTALL_ROOT>/workspace_files
 
-All other directories are ignored.
+All other directories are ignored, as is anything matched by the
+ignore rules (ignore.py); ignored directories are never walked.
+
+A persistent manifest (see manifest.py) lets repeated runs skip files
+whose size/mtime/content are unchanged and drop vectors for files
+that disappeared since the last run.
 """
 
 from __future__ import annotations
 
 import hashlib
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from functools import partial
 from pathlib import Path
+from typing import List
 
-from qdrant_client.http import models as qmodels
+import numpy as np
 
 from configs.paths import get_install_root
-from rag_engine.embedder import embed_texts
-from rag_engine.chunker import chunk_file
-from rag_engine.qdrant_init import (
-    get_client,
-    ensure_collection,
-    COLLECTION_NAME,
-)
+from configs.settings import get_setting
+from rag_engine.embedder import embed_array, embed_signature
+from rag_engine.chunker import load_and_chunk, CHUNKER_VERSION, UNREADABLE
+from rag_engine.generation import mark_dirty, bump_if_dirty
+from rag_engine.ignore import get_ignore
+from rag_engine.manifest import get_manifest, FileEntry
+from rag_engine.metrics import INDEXED_CHUNKS, INDEXED_FILES
+from rag_engine.profiler import call_recorded, merge_recorded, profiling, span
+from rag_engine.vector_store import get_store
+
+
+# Manifest entries written under a different version are reindexed.
+# The vector store is part of it (qdrant keeps the original form), so
+# switching stores fills the new one instead of trusting the manifest.
+INDEX_VERSION = f"{embed_signature()}|{CHUNKER_VERSION}"
+if (get_setting("vector_store") or "qdrant") != "qdrant":
+    INDEX_VERSION += f"|{get_setting('vector_store')}"
+
+# reindex_single_file() outcomes
+ADDED = "added"
+CHANGED = "changed"
+SKIPPED = "skipped"
+REMOVED = "removed"
+IGNORED = "ignored"
+MOVED = "moved"
 
 
 # ------------------------------------------------------------
@@ -33,104 +62,718 @@ def get_index_root() -> Path:
 
 
 # ------------------------------------------------------------
-# Hash file path → stable point IDs
+# Deterministic point IDs: UUIDv5 of (relative path, chunk text hash,
+# occurrence of that text in the file). An unchanged chunk keeps its
+# ID across edits elsewhere in the file, so reindexing only writes
+# the chunks that actually changed.
 # ------------------------------------------------------------
-def _file_hash(path: Path) -> str:
-    return hashlib.md5(str(path).encode("utf-8")).hexdigest()
+POINT_NAMESPACE = uuid.UUID("6f1d3c1e-8a4b-5f0e-9c2d-7b3a1e5f4c60")
+
+
+def chunk_digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def point_id(rel: str, digest: str, occurrence: int = 0) -> str:
+    return str(uuid.uuid5(POINT_NAMESPACE, f"{rel}\0{digest}\0{occurrence}"))
+
+
+# Payload fields that move when text above a chunk changes
+POSITION_FIELDS = ("start", "end", "start_line", "end_line", "byte_start", "byte_end")
+
+
+def _position(chunk) -> dict:
+    pos = {f: getattr(chunk, f) for f in POSITION_FIELDS}
+    return {f: v for f, v in pos.items() if v is not None}
+
+
+def _stored_position(payload: dict) -> dict:
+    return {f: payload[f] for f in POSITION_FIELDS if payload.get(f) is not None}
 
 
 # ------------------------------------------------------------
-# Delete existing vectors for file
+# Per-run counters for index / rebuild
 # ------------------------------------------------------------
-def delete_file(path: Path):
-    root = get_index_root()
-    rel = str(path.resolve().relative_to(root))
+class IndexStats:
+    def __init__(self):
+        self.added = 0
+        self.changed = 0
+        self.skipped = 0
+        self.removed = 0
+        self.moved = 0
+        self.failed = 0
+        self.chunks = 0       # chunks embedded + upserted
+        self.reused = 0       # unchanged chunks kept from the previous index
+        self.elapsed = 0.0    # seconds, set by build_full_index
+        self.rejected = {}    # reason → files not embedded (binary, oversize, ...)
 
-    client = get_client()
-    client.delete(
-        collection_name=COLLECTION_NAME,
-        points_selector=qmodels.FilterSelector(
-            filter=qmodels.Filter(
-                must=[
-                    qmodels.FieldCondition(
-                        key="file_path",
-                        match=qmodels.MatchValue(value=rel)
-                    )
-                ]
-            )
+    def record(self, outcome: str):
+        if outcome in (ADDED, CHANGED, SKIPPED, REMOVED, MOVED):
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            INDEXED_FILES.inc(outcome)
+
+    def reject(self, reason: str):
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+
+    def summary(self) -> str:
+        out = (
+            f"skipped={self.skipped} changed={self.changed} "
+            f"added={self.added} removed={self.removed} failed={self.failed}"
         )
-    )
+        if self.rejected:
+            reasons = ", ".join(f"{r}={n}" for r, n in sorted(self.rejected.items()))
+            out += f" rejected({reasons})"
+        if self.moved:
+            out += f" moved={self.moved}"
+        if self.reused:
+            out += f" reused_chunks={self.reused}"
+        if self.elapsed > 0:
+            files = (self.skipped + self.changed + self.added
+                     + sum(self.rejected.values()))
+            out += (
+                f" | {self.elapsed:.1f}s, {files / self.elapsed:.1f} files/s, "
+                f"{self.chunks / self.elapsed:.1f} chunks/s"
+            )
+        return out
 
 
 # ------------------------------------------------------------
-# Index a single file inside workspace_files
+# Manifest paths for a file, or for every file under a directory
 # ------------------------------------------------------------
-def reindex_single_file(path: Path):
-    ensure_collection()
+def _tree_rels(rel: str) -> List[str]:
+    manifest = get_manifest()
+    if manifest.get(rel) is not None:
+        return [rel]
+    prefix = rel + os.sep
+    return [p for p in manifest.paths() if p.startswith(prefix)]
+
+
+# ------------------------------------------------------------
+# Delete existing vectors for file (or a deleted directory)
+# ------------------------------------------------------------
+def delete_file(path: Path, save: bool = True):
     root = get_index_root()
+    rel = str(path.resolve().relative_to(root))
+    manifest = get_manifest()
 
-    # If file removed → clear entries
-    if not path.exists():
-        delete_file(path)
-        return
+    for r in _tree_rels(rel) or [rel]:
+        _delete_rel(r)
+        manifest.remove(r)
+    bump_if_dirty()
+
+    if save:
+        manifest.save()
+
+
+def _delete_rel(rel: str):
+    mark_dirty()
+    get_store().delete_where("file_path", rel)
+
+
+# ------------------------------------------------------------
+# One file that needs (re)embedding
+# ------------------------------------------------------------
+class FileJob:
+    def __init__(self, path: Path, rel: str, st, entry, force: bool = False):
+        self.path = path
+        self.rel = rel
+        self.st = st
+        self.entry = entry          # previous manifest entry (or None)
+        self.force = force          # rewrite even if the content is unchanged
+        self.digest = ""
+        self.chunks = []            # list, or a generator for streamed files
+        self.point_ids = []
+        self.pending = 0            # chunks queued but not yet upserted
+        self.queued = False         # every chunk has been queued
+        self.failed = False
+
+
+# ------------------------------------------------------------
+# Stage 1: stat + manifest lookup (no file reads, no Qdrant)
+#
+# Returns a FileJob, or IGNORED / REMOVED / SKIPPED. force=True
+# never skips: the file is read, its points are dropped and every
+# chunk is written again (the embedding cache still answers for
+# texts this model has already embedded).
+# ------------------------------------------------------------
+def _plan_file(path: Path, force: bool = False):
+    root = get_index_root()
 
     # Path must be inside workspace_files
     try:
         rel = str(path.resolve().relative_to(root))
     except ValueError:
-        return  # ignore anything outside workspace_files
-
-    # purge old entries
-    delete_file(path)
-
-    chunks = chunk_file(path)
-    if not chunks:
-        return
-
-    texts = [c.text for c in chunks]
-    vectors = embed_texts(texts)
-
-    client = get_client()
-    base = _file_hash(path)
-
-    point_ids = [f"{base}_{i}" for i in range(len(chunks))]
-
-    points = []
-    for pid, vec, ch in zip(point_ids, vectors, chunks):
-        points.append(
-            qmodels.PointStruct(
-                id=pid,
-                vector=vec,
-                payload={
-                    "file_path": rel,
-                    "start": ch.start,
-                    "end": ch.end,
-                    "text": ch.text
-                }
-            )
-        )
+        return IGNORED  # ignore anything outside workspace_files
+
+    # Newly ignored (rules changed) → its old vectors go
+    if get_ignore().ignored(rel):
+        return REMOVED if get_manifest().get(rel) is not None else IGNORED
 
-    client.upsert(collection_name=COLLECTION_NAME, points=points)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return REMOVED
+
+    entry = get_manifest().get(rel)
+
+    # Fast path: size + mtime unchanged → nothing to do
+    if not force and entry is not None and entry.version == INDEX_VERSION and entry.matches_stat(st):
+        return SKIPPED
+
+    return FileJob(path, rel, st, entry, force)
+
+
+# ------------------------------------------------------------
+# Stage 2: read, hash, chunk (see chunker.load_and_chunk)
+#
+# Returns False when the content is identical to what is indexed
+# (the file was only touched); the manifest stat is refreshed.
+# ------------------------------------------------------------
+def _known_digest(job: FileJob) -> str:
+    entry = job.entry
+    if entry is not None and entry.version == INDEX_VERSION and not job.force:
+        return entry.digest
+    return ""
+
+
+# Files at least this large are streamed (iter_file_chunks) in the
+# consuming process instead of being chunked into a list.
+def _streams(job: FileJob) -> bool:
+    return job.st.st_size >= int(get_setting("stream_min_bytes"))
+
+
+def _load_job(job: FileJob):
+    return load_and_chunk(job.path, _known_digest(job), stream=_streams(job))
+
+
+def _accept_loaded(job: FileJob, digest: str, chunks) -> bool:
+    job.digest = digest
+
+    if chunks is None:
+        entry = job.entry
+        get_manifest().set(job.rel, FileEntry(job.st.st_size, job.st.st_mtime_ns, digest,
+                                              entry.chunk_ids, INDEX_VERSION))
+        return False
+
+    job.chunks = chunks
+    return True
+
+
+def _make_point(job: FileJob, i: int, chunk, vec):
+    payload = {
+        "file_path": job.rel,
+        "ext": job.path.suffix.lower(),
+        "start": chunk.start,
+        "end": chunk.end,
+        "text": chunk.text
+    }
+    if chunk.start_line is not None:
+        payload["start_line"] = chunk.start_line
+        payload["end_line"] = chunk.end_line
+    if chunk.byte_start is not None:
+        payload["byte_start"] = chunk.byte_start
+        payload["byte_end"] = chunk.byte_end
+
+    # vec stays a float32 row (a view into the embedding batch)
+    return job.point_ids[i], vec, payload
+
+
+def _upsert(points):
+    ids, vecs, payloads = zip(*points)
+    with span("upsert", points=len(ids)):
+        get_store().upsert(list(ids), np.stack(vecs), list(payloads))
+
+
+# ------------------------------------------------------------
+# Stage 3: record the finished file in the manifest
+# ------------------------------------------------------------
+def _finish_file(job: FileJob) -> str:
+    get_manifest().set(job.rel, FileEntry(job.st.st_size, job.st.st_mtime_ns, job.digest,
+                                          job.point_ids, INDEX_VERSION))
+    return ADDED if job.entry is None else CHANGED
+
+
+# ------------------------------------------------------------
+# Index a single file inside workspace_files
+#
+# Returns one of ADDED / CHANGED / SKIPPED / REMOVED / IGNORED.
+# save=False defers writing the manifest (callers batching many
+# files save once at the end).
+# ------------------------------------------------------------
+def reindex_single_file(path: Path, save: bool = True) -> str:
+    job = _plan_file(path)
+
+    # If file removed → clear entries
+    if job == REMOVED:
+        get_store().ensure()
+        delete_file(path, save=save)
+        return REMOVED
+
+    if isinstance(job, str):
+        return job
+
+    get_store().ensure()
+
+    stats = IndexStats()
+    pipeline = IndexPipeline(stats)
+    pipeline.add_loaded(job, *_load_job(job))
+    pipeline.close()
+
+    if save:
+        get_manifest().save()
+
+    if job.failed:
+        raise RuntimeError(f"indexing failed: {job.rel}")
+    if stats.added:
+        return ADDED
+    if stats.changed:
+        return CHANGED
+    return SKIPPED
+
+
+# ------------------------------------------------------------
+# Streaming indexing pipeline
+#
+# Chunks from many files are gathered into fixed-size embedding
+# batches, and the resulting points are written in large bulk
+# upserts. At most embed_batch chunks + upsert_batch points are
+# held at once; streamed files are pulled from their generator
+# chunk by chunk, so even huge files stay within that bound.
+# If a batch fails, it is retried file by file so one bad file
+# cannot sink the others.
+# ------------------------------------------------------------
+class IndexPipeline:
+    def __init__(self, stats: IndexStats, embed_batch: int = 0, upsert_batch: int = 0,
+                 force: bool = False):
+        self.stats = stats
+        self.force = force
+        self.embed_batch = embed_batch or int(get_setting("embed_batch_size"))
+        self.upsert_batch = upsert_batch or int(get_setting("upsert_batch_size"))
+
+        self._texts = []    # (job, chunk index, chunk)
+        self._points = []   # (job, PointStruct)
+
+    # Stage 1 for one path; returns a FileJob only if it needs loading
+    def plan(self, path: Path):
+        job = _plan_file(path, self.force)
+
+        if job == REMOVED:
+            delete_file(path, save=False)
+        if isinstance(job, str):
+            self.stats.record(job)
+            return None
+
+        return job
+
+    # Stages 2 + 3 once a worker has read and chunked the file
+    def add_loaded(self, job: FileJob, digest: str, chunks, reason: str = ""):
+        # Unreadable (locked, no permission, vanished mid-read) may be
+        # temporary: keep its points and manifest entry untouched so
+        # the next pass retries it
+        if reason == UNREADABLE:
+            job.failed = True
+            self.stats.failed += 1
+            return
+
+        if not _accept_loaded(job, digest, chunks):
+            self.stats.record(SKIPPED)
+            return
+
+        # Binary / oversize / outside: keep it out of Qdrant, but
+        # remember it so the next run skips it on stat alone
+        if reason:
+            self.stats.reject(reason)
+            _delete_rel(job.rel)
+            _finish_file(job)
+            return
+
+        self.add_job(job)
+
+    def add(self, path: Path):
+        job = self.plan(path)
+        if job is not None:
+            self.add_loaded(job, *_load_job(job))
+
+    # --------------------------------------------------------
+    # Chunk-level diff against the previous manifest entry: chunks
+    # whose ID is already indexed are not embedded again (only their
+    # position payload is refreshed if text above them moved), new
+    # ones are embedded, and IDs that vanished are deleted.
+    # --------------------------------------------------------
+    def add_job(self, job: FileJob):
+        # Entries from another index version (or any, when forced) are
+        # replaced wholesale, as is anything a crashed run may have
+        # left for a new file
+        entry = job.entry
+        if entry is None or job.force or entry.version != INDEX_VERSION:
+            entry = None
+            _delete_rel(job.rel)
+        known = set(entry.chunk_ids) if entry else set()
+
+        seen = {}
+        kept = {}  # reused point ID → its position now
+        try:
+            for i, ch in enumerate(job.chunks):
+                digest = chunk_digest(ch.text)
+                n = seen[digest] = seen.get(digest, -1) + 1
+                pid = point_id(job.rel, digest, n)
+                job.point_ids.append(pid)
+
+                if pid in known:
+                    self.stats.reused += 1
+                    kept[pid] = _position(ch)
+                    continue
+
+                job.pending += 1
+                self._texts.append((job, i, ch))
+                if len(self._texts) >= self.embed_batch:
+                    self._flush_embed()
+        except Exception:
+            self._fail(job)  # e.g. a streamed file vanished mid-read
+
+        job.chunks = []
+        job.queued = True
+
+        if entry is not None and not job.failed:
+            stale = list(known - set(job.point_ids))
+            try:
+                moved_ids, moved = self._moved_positions(kept)
+                if stale or moved_ids:
+                    mark_dirty()
+                get_store().delete_ids(stale)
+                get_store().set_payload(moved_ids, moved)
+            except Exception:
+                self._fail(job)
+
+        if job.pending == 0 and not job.failed:
+            self.stats.record(_finish_file(job))
+
+    # Positions live in the point payloads only: read back the kept
+    # points and return those whose offsets or lines changed
+    def _moved_positions(self, kept: dict):
+        store = get_store()
+        ids = list(kept)
+        moved_ids, moved = [], []
+        for s in range(0, len(ids), self.upsert_batch):
+            got_ids, _, payloads = store.retrieve(ids[s:s + self.upsert_batch])
+            for pid, payload in zip(got_ids, payloads):
+                pos = kept[str(pid)]
+                if _stored_position(payload) != pos:
+                    moved_ids.append(pid)
+                    moved.append(pos)
+        return moved_ids, moved
+
+    def close(self):
+        self._flush_embed()
+        self._flush_upsert()
+        bump_if_dirty()
+
+    # --------------------------------------------------------
+    # A file failed: drop whatever was written for it and forget
+    # it in the manifest so the next run starts over.
+    # --------------------------------------------------------
+    def _fail(self, job: FileJob):
+        if job.failed:
+            return
+        job.failed = True
+        self.stats.failed += 1
+        get_manifest().remove(job.rel)
+        try:
+            _delete_rel(job.rel)
+        except Exception:
+            pass
+
+    def _flush_embed(self):
+        batch, self._texts = self._texts, []
+        if not batch:
+            return
+
+        try:
+            vectors = embed_array([ch.text for _, _, ch in batch])
+        except Exception:
+            vectors = self._embed_per_file(batch)
+
+        for (job, i, ch), vec in zip(batch, vectors):
+            if vec is None or job.failed:
+                continue
+            self._points.append((job, _make_point(job, i, ch, vec)))
+            if len(self._points) >= self.upsert_batch:
+                self._flush_upsert()
+
+    def _embed_per_file(self, batch):
+        out = [None] * len(batch)
+        by_job = {}
+        for n, (job, _, _) in enumerate(batch):
+            by_job.setdefault(id(job), (job, []))[1].append(n)
+
+        for job, idxs in by_job.values():
+            try:
+                vecs = embed_array([batch[n][2].text for n in idxs])
+            except Exception:
+                self._fail(job)
+                continue
+            for n, vec in zip(idxs, vecs):
+                out[n] = vec
+
+        return out
+
+    def _flush_upsert(self):
+        batch, self._points = self._points, []
+        batch = [(job, pt) for job, pt in batch if not job.failed]
+        if not batch:
+            return
+
+        mark_dirty()
+        try:
+            _upsert([pt for _, pt in batch])
+        except Exception:
+            by_job = {}
+            for job, pt in batch:
+                by_job.setdefault(id(job), (job, []))[1].append(pt)
+            for job, pts in by_job.values():
+                try:
+                    _upsert(pts)
+                except Exception:
+                    self._fail(job)
+            batch = [(job, pt) for job, pt in batch if not job.failed]
+
+        # New vectors are visible: invalidate cached search results
+        bump_if_dirty()
+
+        INDEXED_CHUNKS.inc(by=len(batch))
+        for job, _ in batch:
+            self.stats.chunks += 1
+            job.pending -= 1
+            if job.pending == 0 and job.queued:
+                self.stats.record(_finish_file(job))
+
+
+# ------------------------------------------------------------
+# Move / rename (file or directory)
+#
+# Point IDs include the path, so the stored vectors are copied to
+# the new IDs with file_path rewritten and the old IDs dropped; the
+# manifest entries move along. Nothing is read from disk or embedded.
+# Returns the number of files moved. Callers then run the new paths
+# through the normal planner, which skips them on stat or reindexes
+# just the chunks that differ if the content changed as well. Files
+# that cannot be moved this way (entries from another index version,
+# points missing from the store) are dropped and come back as new.
+# ------------------------------------------------------------
+def move_path(src: Path, dst: Path, save: bool = True) -> int:
+    root = get_index_root()
+    old = str(src.resolve().relative_to(root))
+    new = str(dst.resolve().relative_to(root))
+    manifest = get_manifest()
+
+    batch, size, moved = [], 0, 0
+    limit = int(get_setting("upsert_batch_size"))
+    for rel in _tree_rels(old):
+        target = new + rel[len(old):]
+        entry = manifest.get(rel)
+        if entry is None:
+            continue
+        if target != rel and manifest.get(target) is not None:
+            _drop_moved(target)  # moved over an indexed file
+        if entry.version != INDEX_VERSION:
+            _drop_moved(rel)
+            continue
+        batch.append((rel, target, entry))
+        size += len(entry.chunk_ids)
+        if size >= limit:
+            moved += _move_batch(batch)
+            batch, size = [], 0
+    moved += _move_batch(batch)
+
+    bump_if_dirty()
+    if save:
+        manifest.save()
+    return moved
+
+
+def _drop_moved(rel: str):
+    _delete_rel(rel)
+    get_manifest().remove(rel)
+
+
+def _move_batch(batch) -> int:
+    if not batch:
+        return 0
+    try:
+        _move_points(get_store(), batch)
+        return len(batch)
+    except Exception:
+        if len(batch) == 1:
+            _drop_moved(batch[0][0])
+            return 0
+        return sum(_move_batch([item]) for item in batch)  # isolate the bad file
+
+
+def _move_points(store, batch):
+    old_ids = [pid for _, _, entry in batch for pid in entry.chunk_ids]
+    got_ids, vectors, payloads = store.retrieve(old_ids)
+    found = {pid: i for i, pid in enumerate(got_ids)}
+    if len(found) != len(set(old_ids)):
+        raise LookupError("points missing from the vector store")
+
+    new_ids, rows, new_payloads, entries = [], [], [], []
+    for rel, target, entry in batch:
+        ext = Path(target).suffix.lower()
+        seen, ids = {}, []
+        for pid in entry.chunk_ids:
+            i = found[pid]
+            payload = dict(payloads[i], file_path=target, ext=ext)
+            digest = chunk_digest(payload["text"])
+            n = seen[digest] = seen.get(digest, -1) + 1
+            ids.append(point_id(target, digest, n))
+            rows.append(i)
+            new_payloads.append(payload)
+        new_ids.extend(ids)
+        entries.append((rel, target, FileEntry(entry.size, entry.mtime_ns, entry.digest,
+                                                ids, entry.version)))
+
+    mark_dirty()
+    if new_ids:
+        store.upsert(new_ids, vectors[rows], new_payloads)
+    store.delete_ids(list(set(old_ids) - set(new_ids)))
+
+    manifest = get_manifest()
+    for rel, target, entry in entries:
+        manifest.remove(rel)
+        manifest.set(target, entry)
+
+
+# ------------------------------------------------------------
+# Drop vectors for files that vanished since the last run
+# ------------------------------------------------------------
+def prune_missing(seen, stats: IndexStats):
+    manifest = get_manifest()
+
+    for rel in manifest.paths():
+        if rel in seen:
+            continue
+        try:
+            _delete_rel(rel)
+            manifest.remove(rel)
+            stats.record(REMOVED)
+        except Exception:
+            stats.failed += 1
+
+    bump_if_dirty()
+
+
+# ------------------------------------------------------------
+# Walk workspace_files, yielding jobs that need loading
+# ------------------------------------------------------------
+def _walk_jobs(root: Path, pipeline: IndexPipeline, seen: set):
+    for p in get_ignore().walk(root):
+        try:
+            seen.add(str(p.resolve().relative_to(root)))
+            job = pipeline.plan(p)
+        except Exception:
+            pipeline.stats.failed += 1
+            continue
+        if job is not None:
+            yield job
+
+
+# ------------------------------------------------------------
+# Parallel producer: read/decode/chunk in worker processes
+#
+# Up to workers * PREFETCH_PER_WORKER files are in flight, so the
+# workers keep loading while the main thread embeds. Yields
+# (job, load) as loads complete; load() returns the result of
+# load_and_chunk. Streamed files are not sent to the pool —
+# their load() runs here and returns a lazy chunk generator.
+# While profiling, workers send their spans back with the result.
+# ------------------------------------------------------------
+PREFETCH_PER_WORKER = 4
+
+
+def _merged_result(fut):
+    return merge_recorded(fut.result())
+
+
+def _load_parallel(jobs, workers: int):
+    recorded = profiling()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = {}
+        for job in jobs:
+            if _streams(job):
+                yield job, partial(_load_job, job)
+                continue
+
+            if recorded:
+                fut = pool.submit(call_recorded, load_and_chunk, job.path, _known_digest(job))
+            else:
+                fut = pool.submit(load_and_chunk, job.path, _known_digest(job))
+            inflight[fut] = job
+            if len(inflight) >= workers * PREFETCH_PER_WORKER:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield inflight.pop(fut), _loader(fut, recorded)
+
+        for fut in as_completed(list(inflight)):
+            yield inflight.pop(fut), _loader(fut, recorded)
+
+
+def _loader(fut, recorded: bool):
+    return partial(_merged_result, fut) if recorded else fut.result
+
+
+def resolve_workers(workers: int = 0) -> int:
+    workers = workers or int(get_setting("index_workers") or 0)
+    if workers <= 0:
+        workers = max(1, min((os.cpu_count() or 2) - 1, 16))
+    return workers
 
 
 # ------------------------------------------------------------
 # Full index build — ONLY workspace_files
+#
+# workers: processes for the read/decode/chunk stage
+# (0 → index_workers setting / CPU count, 1 → inline).
+# force: ignore the manifest and rewrite every file's points
+# (`rebuild`); otherwise unchanged files are skipped (`index`).
 # ------------------------------------------------------------
-def build_full_index():
-    ensure_collection()
+def build_full_index(workers: int = 0, force: bool = False) -> IndexStats:
+    stats = IndexStats()
     root = get_index_root()
 
     if not root.exists():
-        return
+        return stats
+
+    started = time.perf_counter()
+    get_store().ensure()
+    manifest = get_manifest()
+    pipeline = IndexPipeline(stats, force=force)
+    seen = set()
+    workers = resolve_workers(workers)
+
+    try:
+        jobs = _walk_jobs(root, pipeline, seen)
+
+        if workers == 1:
+            loads = ((job, partial(_load_job, job)) for job in jobs)
+        else:
+            loads = _load_parallel(jobs, workers)
 
-    for p in root.rglob("*"):
-        if p.is_file():
+        for job, load in loads:
             try:
-                reindex_single_file(p)
+                pipeline.add_loaded(job, *load())
             except Exception:
-                continue
+                stats.failed += 1
+
+        pipeline.close()
+        prune_missing(seen, stats)
+    finally:
+        bump_if_dirty()
+        manifest.save()
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
 
 
 if __name__ == "__main__":
-    build_full_index()
-    print("Full index build complete.")
+    stats = build_full_index()
+    print(f"Full index build complete. {stats.summary()}")
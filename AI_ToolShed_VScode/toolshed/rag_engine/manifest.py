@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+manifest.py — persistent record of what has been indexed from:
+    <INSTALL_ROOT>/workspace_files
+
+Stored next to the Qdrant storage as manifest.json:
+    relative path → size, mtime, content hash, chunk IDs, index version
+
+save() appends the entries changed since the last save to
+manifest.journal (one JSON line each) and rewrites manifest.json
+only once the journal outgrows a quarter of the entries, so a
+watcher batch touching one file writes one line, not the whole map.
+
+An entry whose size + mtime match the file on disk (and whose index
+version matches the current embedder/chunker) is considered up to date,
+so unchanged files cost one stat call and no Qdrant round-trips.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from configs.paths import get_qdrant_path
+
+
+MANIFEST_FILE = "manifest.json"
+JOURNAL_FILE = "manifest.journal"
+MANIFEST_FORMAT = 2
+
+# Journal lines always allowed before manifest.json is rewritten
+JOURNAL_MIN_RECORDS = 1024
+
+
+# ------------------------------------------------------------
+# Content hash of raw file bytes
+# ------------------------------------------------------------
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()
+
+
+# ------------------------------------------------------------
+# One manifest entry
+# ------------------------------------------------------------
+class FileEntry:
+    def __init__(self, size: int, mtime_ns: int, digest: str,
+                 chunk_ids: List[str], version: str):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.chunk_ids = chunk_ids
+        self.version = version
+
+    def matches_stat(self, st: os.stat_result) -> bool:
+        return self.size == st.st_size and self.mtime_ns == st.st_mtime_ns
+
+    def to_dict(self) -> dict:
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "hash": self.digest,
+            "chunk_ids": self.chunk_ids,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "FileEntry":
+        return cls(
+            size=int(d.get("size", -1)),
+            mtime_ns=int(d.get("mtime_ns", -1)),
+            digest=d.get("hash", ""),
+            chunk_ids=list(d.get("chunk_ids", [])),
+            version=d.get("version", ""),
+        )
+
+
+# ------------------------------------------------------------
+# Manifest (thread-safe; snapshot saved atomically, journal
+# appended in between)
+# ------------------------------------------------------------
+class Manifest:
+    def __init__(self, path: Path):
+        self.path = path
+        self.journal = path.with_name(JOURNAL_FILE)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries: Dict[str, FileEntry] = {}
+        self._changed: Set[str] = set()   # paths set or removed since the last save
+        self._journaled = 0               # lines in the journal file
+        self._load()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception:
+                data = {}  # corrupt manifest → treat everything as new
+            if data.get("format") != MANIFEST_FORMAT:
+                self.journal.unlink(missing_ok=True)  # belongs to the old snapshot
+                return
+            for rel, d in data.get("files", {}).items():
+                self._entries[rel] = FileEntry.from_dict(d)
+
+        if not self.journal.exists():
+            return
+        with open(self.journal, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    rel, d = rec["path"], rec["entry"]
+                except Exception:
+                    continue  # torn last line of an interrupted append
+                self._journaled += 1
+                if d is None:
+                    self._entries.pop(rel, None)
+                else:
+                    self._entries[rel] = FileEntry.from_dict(d)
+
+    def get(self, rel: str) -> Optional[FileEntry]:
+        with self._lock:
+            return self._entries.get(rel)
+
+    def set(self, rel: str, entry: FileEntry):
+        with self._lock:
+            self._entries[rel] = entry
+            self._changed.add(rel)
+
+    def remove(self, rel: str) -> Optional[FileEntry]:
+        with self._lock:
+            entry = self._entries.pop(rel, None)
+            if entry is not None:
+                self._changed.add(rel)
+            return entry
+
+    def paths(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    # --------------------------------------------------------
+    # Append the changed entries, or rewrite the snapshot once the
+    # journal would outgrow max(JOURNAL_MIN_RECORDS, entries / 4)
+    # --------------------------------------------------------
+    def save(self):
+        with self._save_lock:
+            with self._lock:
+                if not self._changed:
+                    return
+                limit = max(JOURNAL_MIN_RECORDS, len(self._entries) // 4)
+                if self._journaled + len(self._changed) > limit or not self.path.exists():
+                    data = {
+                        "format": MANIFEST_FORMAT,
+                        "files": {rel: e.to_dict() for rel, e in self._entries.items()},
+                    }
+                    records = None
+                else:
+                    records = []
+                    for rel in sorted(self._changed):
+                        e = self._entries.get(rel)
+                        records.append({"path": rel, "entry": e.to_dict() if e else None})
+                self._changed = set()
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if records is None:
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(data), encoding="utf-8")
+                os.replace(tmp, self.path)
+                self.journal.unlink(missing_ok=True)
+                self._journaled = 0
+            else:
+                with open(self.journal, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(r) + "\n" for r in records))
+                self._journaled += len(records)
+
+
+# ------------------------------------------------------------
+# Shared instance
+# ------------------------------------------------------------
+_manifest_lock = threading.Lock()
+_manifest = None
+
+
+def get_manifest() -> Manifest:
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = Manifest(get_qdrant_path() / MANIFEST_FILE)
+    return _manifest
+
+
+if __name__ == "__main__":
+    m = get_manifest()
+    print(f"{m.path}: {len(m.paths())} files")
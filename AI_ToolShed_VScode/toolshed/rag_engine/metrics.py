@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+metrics.py — process-local counters, gauges and histograms, rendered
+in the Prometheus text format (version 0.0.4).
+
+    GET /metrics   every metric below
+    GET /healthz   200 {"status": "ok", ...} or 503 when the vector
+                   store cannot be reached
+
+Served by the orchestrator (`serve`), and by `watch` on
+watch_metrics_port when that is set. Each process reports its own
+work: retrieval timings come from `serve`, indexing counters and the
+queue depth from `watch`.
+
+Recording is a lock plus a few integer/float updates (a histogram
+also bisects its bucket list), well under a microsecond; nothing is
+formatted until a scrape. Gauges read their value from a callback at
+scrape time, so the hot path never touches them.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers a cached lookup (sub-ms) up to a cold model load
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return repr(v) if isinstance(v, float) else str(v)
+
+
+# ------------------------------------------------------------
+# Metric types
+# ------------------------------------------------------------
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help.replace(chr(92), chr(92) * 2)}",
+                f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, by: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + by
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, k)} {_num(v)}" for k, v in values]
+
+
+class Gauge(_Metric):
+    """Value from bind(fn), read at scrape time, or set() directly.
+    Omitted until it has one (e.g. the queue depth outside `watch`)."""
+    kind = "gauge"
+
+    def __init__(self, name, help):
+        super().__init__(name, help)
+        self._value = None
+        self._fn: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self._value = value
+
+    def bind(self, fn: Callable[[], float]):
+        self._fn = fn
+
+    def render(self) -> List[str]:
+        if self._fn is not None:
+            try:
+                self._value = float(self._fn())
+            except Exception:
+                return []  # source unavailable: omit rather than report a stale value
+        if self._value is None:
+            return []
+        return [f"{self.name} {_num(float(self._value))}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}  # labels → [bucket counts..., +Inf, sum]
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            s[i] += 1
+            s[-1] += value
+
+    def count(self, *labels) -> int:
+        s = self._series.get(labels)
+        return sum(s[:-1]) if s else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((k, list(v)) for k, v in self._series.items())
+        out = []
+        for key, s in series:
+            total = 0
+            for bound, n in zip(self.buckets + (float("inf"),), s[:-1]):
+                total += n
+                le = _labels(self.label_names, key, f'le="{_num(bound)}"')
+                out.append(f"{self.name}_bucket{le} {total}")
+            lbl = _labels(self.label_names, key)
+            out.append(f"{self.name}_sum{lbl} {_num(s[-1])}")
+            out.append(f"{self.name}_count{lbl} {total}")
+        return out
+
+
+REGISTRY: List[_Metric] = []
+
+
+# ------------------------------------------------------------
+# The metrics themselves
+# ------------------------------------------------------------
+EMBED_SECONDS = Histogram(
+    "toolshed_embed_seconds",
+    "Time to embed texts that missed the cache, by priority (query/bulk)",
+    ("priority",),
+)
+SEARCH_SECONDS = Histogram(
+    "toolshed_vector_search_seconds",
+    "Time spent in the vector store search call",
+)
+REQUEST_SECONDS = Histogram(
+    "toolshed_request_seconds",
+    "Total HTTP request time, from parsed request to response written",
+    ("endpoint",),
+)
+REQUESTS = Counter(
+    "toolshed_requests_total",
+    "HTTP requests by endpoint and status code",
+    ("endpoint", "code"),
+)
+ERRORS = Counter(
+    "toolshed_errors_total",
+    "Failed HTTP requests by endpoint and kind (invalid_json, bad_request, busy, timeout, exception)",
+    ("endpoint", "kind"),
+)
+INDEXED_FILES = Counter(
+    "toolshed_indexed_files_total",
+    "Files processed by the indexer, by outcome",
+    ("outcome",),
+)
+INDEXED_CHUNKS = Counter(
+    "toolshed_indexed_chunks_total",
+    "Chunks embedded and written to the vector store",
+)
+QUEUE_DEPTH = Gauge(
+    "toolshed_watcher_queue_depth",
+    "Paths waiting in the watcher queue",
+)
+COLLECTION_POINTS = Gauge(
+    "toolshed_collection_points",
+    "Points in the vector store collection",
+)
+MODEL_LOADED = Gauge(
+    "toolshed_model_loaded",
+    "1 once the embedding model is loaded",
+)
+
+
+def render() -> str:
+    lines = []
+    for m in REGISTRY:
+        body = m.render()
+        if body or m.kind != "gauge":
+            lines += m.header() + body
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------
+# Health: checks registered by the running command
+# ------------------------------------------------------------
+_checks: Dict[str, Callable[[], object]] = {}
+
+
+def add_health_check(name: str, fn: Callable[[], object]):
+    """fn() returns a value to report, or raises when unhealthy."""
+    _checks[name] = fn
+
+
+def health() -> Tuple[int, dict]:
+    out, ok = {}, True
+    for name, fn in _checks.items():
+        try:
+            out[name] = fn()
+        except Exception as e:
+            ok = False
+            out[name] = f"error: {e}"
+    return (200 if ok else 503), {"status": "ok" if ok else "unavailable", **out}
+
+
+# Gauges and health checks shared by `serve` and `watch`
+def bind_engine():
+    from rag_engine.embedder import model_loaded
+    from rag_engine.vector_store import get_store
+
+    MODEL_LOADED.bind(model_loaded)
+    COLLECTION_POINTS.bind(lambda: get_store().count())
+    add_health_check("model_loaded", model_loaded)
+    add_health_check("points", lambda: get_store().count())
+
+
+# ------------------------------------------------------------
+# Standalone endpoint (watch_metrics_port)
+# ------------------------------------------------------------
+class MetricsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, code: int, body: bytes, ct: str):
+        self.send_response(code)
+        self.send_header("Content-Type", ct)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            self._reply(200, render().encode("utf-8"), CONTENT_TYPE)
+        elif path == "/healthz":
+            code, data = health()
+            self._reply(code, json.dumps(data).encode("utf-8"), "application/json")
+        else:
+            self._reply(404, b'{"error": "unknown endpoint"}', "application/json")
+
+    def log_message(self, *a):
+        return
+
+
+def start_server(host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="rag-metrics", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import time
+
+    for v in (0.0003, 0.004, 0.2, 30):
+        SEARCH_SECONDS.observe(v)
+    REQUESTS.inc("/context", "200")
+    MODEL_LOADED.bind(lambda: 1)
+    t0 = time.perf_counter()
+    for _ in range(100_000):
+        EMBED_SECONDS.observe(0.01, "query")
+    print(f"observe: {(time.perf_counter() - t0) * 10:.2f} µs")
+    print(render())
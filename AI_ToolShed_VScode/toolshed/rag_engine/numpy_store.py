@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+numpy_store.py — embedded vector store: memory-mapped float32 matrix
+plus a SQLite payload table. No server, no folder lock.
+
+Layout:
+    <INSTALL_ROOT>/qdrant/numpy_store/vectors.<epoch>.f32   row i = point vector
+    <INSTALL_ROOT>/qdrant/numpy_store/alive.<epoch>.u8      row i live (1) / tombstone (0)
+    <INSTALL_ROOT>/qdrant/numpy_store/points.sqlite         row ↔ id, file_path, payload JSON
+
+Writes append rows; an updated or deleted point only gets its alive
+byte cleared. Once tombstones exceed numpy_store_compact_ratio of the
+rows, live rows are copied into files of the next epoch and renumbered.
+
+Search is a blockwise matrix product of the live rows with the query
+vectors (one column per query in a batch) and argpartition for each
+top k (vectors are L2-normalised, so the dot product is the cosine
+similarity).
+
+Several processes can share the store: writers serialise on the SQLite
+write lock; the alive bytes are shared through the map, so deletes are
+visible at once; readers pick up new rows and compactions from the
+meta table on every search.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from configs.paths import get_qdrant_path
+from configs.settings import get_setting
+from rag_engine.embedder import normalize_rows
+from rag_engine.vector_store import SearchHit, VectorStore
+
+
+# Rows added to the files each time they have to grow (at least)
+GROW_ROWS = 4096
+
+# Rows scored per matrix-vector product (bounds temporary memory)
+BLOCK_ROWS = 1 << 18
+
+# Never compact for fewer tombstones than this
+MIN_COMPACT_DEAD = 1024
+
+# SQLite limits bound parameters per statement
+_SQL_BATCH = 500
+
+
+# Normalised in place, so take a private 2-D copy of the caller's rows
+def _unit_rows(vectors) -> np.ndarray:
+    return normalize_rows(np.array(vectors, dtype=np.float32, ndmin=2))
+
+
+class NumpyStore(VectorStore):
+    name = "numpy"
+
+    def __init__(self, root: Path = None, compact_ratio: float = None):
+        self.root = Path(root) if root else get_qdrant_path() / "numpy_store"
+        self.root.mkdir(parents=True, exist_ok=True)
+        if compact_ratio is None:
+            compact_ratio = float(get_setting("numpy_store_compact_ratio"))
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            str(self.root / "points.sqlite"),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN/COMMIT below
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            " row INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE,"
+            " file_path TEXT, payload TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS points_file ON points(file_path)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)"
+        )
+
+        self._dim = None
+        self._rows = 0
+        self._epoch = 0
+        self._vec = None
+        self._alive = None
+        self._refresh()
+
+    # --------------------------------------------------------
+    # Shared state: (dim, rows, epoch) from the meta table
+    # --------------------------------------------------------
+    def _refresh(self):
+        meta = dict(self._db.execute("SELECT name, value FROM meta").fetchall())
+        epoch = meta.get("epoch", 0)
+        if epoch != self._epoch:
+            self._vec = self._alive = None  # compacted elsewhere → remap
+        self._dim = meta.get("dim")
+        self._rows = meta.get("rows", 0)
+        self._epoch = epoch
+
+    def _set_meta(self, **values):
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", values.items()
+        )
+
+    def _files(self, epoch: int):
+        return self.root / f"vectors.{epoch}.f32", self.root / f"alive.{epoch}.u8"
+
+    # --------------------------------------------------------
+    # Maps covering at least `need` rows (writers may grow files)
+    # --------------------------------------------------------
+    def _map(self, need: int, grow: bool = False):
+        if need <= 0 or (self._vec is not None and self._vec.shape[0] >= need):
+            return
+
+        vp, ap = self._files(self._epoch)
+        row_bytes = self._dim * 4
+        have = min(
+            vp.stat().st_size // row_bytes if vp.exists() else 0,
+            ap.stat().st_size if ap.exists() else 0,
+        )
+
+        if have < need:
+            if not grow:
+                raise RuntimeError(f"numpy store files shorter than {need} rows")
+            want = max(need, int(have * 1.5), GROW_ROWS)
+            self._vec = self._alive = None  # must be unmapped before resizing on Windows
+            for path, size in ((vp, want * row_bytes), (ap, want)):
+                with open(path, "ab") as f:
+                    f.truncate(size)  # new alive bytes are 0 = not live
+            have = want
+
+        self._vec = np.memmap(vp, dtype=np.float32, mode="r+", shape=(have, self._dim))
+        self._alive = np.memmap(ap, dtype=np.uint8, mode="r+", shape=(have,))
+
+    # --------------------------------------------------------
+    # Write transaction (serialised across processes)
+    # --------------------------------------------------------
+    @contextmanager
+    def _write(self):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._refresh()
+                yield
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                self._refresh()
+                raise
+            self._cleanup()
+
+    # "... IN ({marks})" run over values in slices of _SQL_BATCH
+    def _select(self, sql: str, values: list) -> List[tuple]:
+        out = []
+        for i in range(0, len(values), _SQL_BATCH):
+            part = values[i:i + _SQL_BATCH]
+            marks = ",".join("?" * len(part))
+            out.extend(self._db.execute(sql.format(marks=marks), part))
+        return out
+
+    def _select_rows(self, sql: str, values: list) -> List[int]:
+        return [r[0] for r in self._select(sql, values)]
+
+    def _rows_where(self, filters: Dict[str, object]) -> List[int]:
+        clauses, params = [], []
+        for k, v in sorted(filters.items()):
+            if k == "file_path":
+                clauses.append("file_path = ?")
+                params.append(v)
+            else:
+                clauses.append("json_extract(payload, ?) = ?")
+                params.extend([f'$."{k}"', v])
+        sql = "SELECT row FROM points WHERE " + " AND ".join(clauses) + " ORDER BY row"
+        return [r[0] for r in self._db.execute(sql, params)]
+
+    # Inside a write: drop rows from the table and tombstone them
+    def _kill(self, rows: List[int]):
+        if not rows:
+            return
+        self._db.executemany("DELETE FROM points WHERE row = ?", [(r,) for r in rows])
+        self._map(self._rows)
+        self._alive[rows] = 0
+        self._alive.flush()
+
+    # --------------------------------------------------------
+    # VectorStore API
+    # --------------------------------------------------------
+    def upsert(self, ids, vectors, payloads):
+        if not len(ids):
+            return
+        ids = list(ids)
+        vectors = _unit_rows(vectors)
+
+        # Last occurrence wins for an id repeated within the batch
+        if len(set(ids)) != len(ids):
+            keep = sorted({pid: i for i, pid in enumerate(ids)}.values())
+            ids = [ids[i] for i in keep]
+            vectors = vectors[keep]
+            payloads = [payloads[i] for i in keep]
+
+        with self._write():
+            if self._dim is None:
+                self._dim = int(vectors.shape[1])
+                self._set_meta(dim=self._dim)
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"vector dim {vectors.shape[1]} != store dim {self._dim}")
+
+            old = self._select_rows("SELECT row FROM points WHERE id IN ({marks})", ids)
+            self._db.executemany("DELETE FROM points WHERE row = ?", [(r,) for r in old])
+
+            start = self._rows
+            end = start + len(ids)
+            self._db.executemany(
+                "INSERT INTO points (row, id, file_path, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (start + i, pid, p.get("file_path"), json.dumps(p, ensure_ascii=False))
+                    for i, (pid, p) in enumerate(zip(ids, payloads))
+                ],
+            )
+            self._set_meta(rows=end)
+
+            self._map(end, grow=True)
+            self._vec[start:end] = vectors
+            self._vec.flush()
+            self._alive[start:end] = 1
+            if old:
+                self._alive[old] = 0
+            self._alive.flush()
+            self._rows = end
+
+            self._maybe_compact()
+
+    def retrieve(self, ids):
+        ids = list(ids)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._refresh()
+                found = self._select("SELECT row, id, payload FROM points WHERE id IN ({marks})", ids)
+                if not found:
+                    return [], np.empty((0, self._dim or 0), dtype=np.float32), []
+                self._map(self._rows)
+                vectors = np.array(self._vec[[row for row, _, _ in found]])
+            finally:
+                self._db.execute("COMMIT")
+        return [pid for _, pid, _ in found], vectors, [json.loads(p) for _, _, p in found]
+
+    def set_payload(self, ids, payloads):
+        if not ids:
+            return
+        updates = dict(zip(ids, payloads))
+        with self._write():
+            found = self._select(
+                "SELECT row, id, payload FROM points WHERE id IN ({marks})", list(updates)
+            )
+            rows = []
+            for row, pid, payload in found:
+                p = json.loads(payload)
+                p.update(updates[pid])
+                rows.append((p.get("file_path"), json.dumps(p, ensure_ascii=False), row))
+            self._db.executemany("UPDATE points SET file_path = ?, payload = ? WHERE row = ?", rows)
+
+    def delete_ids(self, ids):
+        if not ids:
+            return
+        with self._write():
+            self._kill(self._select_rows("SELECT row FROM points WHERE id IN ({marks})", list(ids)))
+            self._maybe_compact()
+
+    def delete_where(self, field, value):
+        with self._write():
+            self._kill(self._rows_where({field: value}))
+            self._maybe_compact()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+
+    # --------------------------------------------------------
+    # Top-k search: one matrix product per block for all queries
+    # --------------------------------------------------------
+    def _top_rows(self, qs: np.ndarray, top_k: int, vec, alive, n: int, rows=None):
+        """(rows, scores) per row of qs, best first."""
+        if rows is not None:
+            cand_s = vec[rows] @ qs.T                      # (len(rows), queries)
+            cand_s[alive[rows] == 0] = -np.inf
+            cand_r = np.broadcast_to(rows[:, None], cand_s.shape)
+        else:
+            # Temporaries stay near BLOCK_ROWS floats however many queries
+            step = max(GROW_ROWS, BLOCK_ROWS // qs.shape[0])
+            parts_r, parts_s = [], []
+            for s in range(0, n, step):
+                e = min(n, s + step)
+                sc = vec[s:e] @ qs.T
+                sc[alive[s:e] == 0] = -np.inf
+                k = min(top_k, e - s)
+                idx = np.argpartition(sc, -k, axis=0)[-k:]
+                parts_r.append(idx + s)
+                parts_s.append(np.take_along_axis(sc, idx, axis=0))
+            cand_r = np.concatenate(parts_r)
+            cand_s = np.concatenate(parts_s)
+
+        k = min(top_k, cand_r.shape[0])
+        idx = np.argpartition(cand_s, -k, axis=0)[-k:]
+        top_s = np.take_along_axis(cand_s, idx, axis=0)
+        order = np.argsort(-top_s, axis=0)
+        top_s = np.take_along_axis(top_s, order, axis=0)
+        top_r = np.take_along_axis(np.take_along_axis(cand_r, idx, axis=0), order, axis=0)
+
+        out = []
+        for j in range(qs.shape[0]):
+            keep = np.isfinite(top_s[:, j])
+            out.append((top_r[keep, j], top_s[keep, j]))
+        return out
+
+    def search(self, vector, top_k, filters=None):
+        return self.search_batch(vector, top_k, filters)[0]
+
+    def search_batch(self, vectors, top_k, filters=None):
+        qs = _unit_rows(vectors)
+        empty = [[] for _ in range(qs.shape[0])]
+
+        while True:
+            with self._lock:
+                self._refresh()
+                n, epoch = self._rows, self._epoch
+                if n == 0 or top_k <= 0 or not len(qs):
+                    return empty
+                if qs.shape[1] != self._dim:
+                    raise ValueError(f"query dim {qs.shape[1]} != store dim {self._dim}")
+                self._map(n)
+                vec, alive = self._vec, self._alive
+
+                rows = None
+                if filters:
+                    rows = np.array(self._rows_where(filters), dtype=np.int64)
+                    if len(rows) == 0:
+                        return empty
+
+            # Scoring runs outside the lock (NumPy releases the GIL)
+            tops = self._top_rows(qs, top_k, vec, alive, n, rows)
+            wanted = sorted({int(r) for top, _ in tops for r in top})
+            if not wanted:
+                return empty
+
+            # Payloads for every query's rows in one pass
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    cur = self._db.execute("SELECT value FROM meta WHERE name = 'epoch'").fetchone()
+                    if (cur[0] if cur else 0) != epoch:
+                        continue  # compacted meanwhile: rows were renumbered
+                    found = {row: (pid, payload) for row, pid, payload in self._select(
+                        "SELECT row, id, payload FROM points WHERE row IN ({marks})", wanted
+                    )}
+                finally:
+                    self._db.execute("COMMIT")
+
+            # Hits share payload dicts when queries overlap
+            parsed = {row: (pid, json.loads(payload)) for row, (pid, payload) in found.items()}
+            out = []
+            for top, scores in tops:
+                hits = []
+                for row, score in zip(top, scores):
+                    hit = parsed.get(int(row))
+                    if hit is not None:  # deleted meanwhile
+                        hits.append(SearchHit(hit[0], float(score), hit[1]))
+                out.append(hits)
+            return out
+
+    # --------------------------------------------------------
+    # Compaction: copy live rows into the next epoch's files
+    # --------------------------------------------------------
+    def _maybe_compact(self):
+        live = self._db.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+        dead = self._rows - live
+        if dead >= MIN_COMPACT_DEAD and dead > self.compact_ratio * self._rows:
+            self._compact()
+
+    def _compact(self):
+        rows = np.array(
+            [r for (r,) in self._db.execute("SELECT row FROM points ORDER BY row")],
+            dtype=np.int64,
+        )
+        live = len(rows)
+        epoch = self._epoch + 1
+        vp, ap = self._files(epoch)
+        cap = max(live, GROW_ROWS)
+
+        self._map(self._rows)
+        new_vec = np.memmap(vp, dtype=np.float32, mode="w+", shape=(cap, self._dim))
+        new_alive = np.memmap(ap, dtype=np.uint8, mode="w+", shape=(cap,))
+        for s in range(0, live, BLOCK_ROWS):
+            e = min(live, s + BLOCK_ROWS)
+            new_vec[s:e] = self._vec[rows[s:e]]
+        new_alive[:live] = 1
+        new_vec.flush()
+        new_alive.flush()
+
+        # Ascending order: each new row number is <= its old one and
+        # is already free, so the renumbering never collides
+        self._db.executemany(
+            "UPDATE points SET row = ? WHERE row = ?",
+            [(i, int(r)) for i, r in enumerate(rows) if i != r],
+        )
+        self._set_meta(rows=live, epoch=epoch)
+
+        print(f"[numpy_store] Compacted {self._rows} → {live} rows")
+        self._vec, self._alive = new_vec, new_alive
+        self._rows, self._epoch = live, epoch
+
+    def _cleanup(self):
+        # Files of older epochs; another process may still have them
+        # mapped (Windows refuses) — retried after the next write
+        for p in list(self.root.glob("vectors.*.f32")) + list(self.root.glob("alive.*.u8")):
+            try:
+                if int(p.name.split(".")[1]) < self._epoch:
+                    p.unlink()
+            except (OSError, ValueError):
+                pass
+
+
+if __name__ == "__main__":
+    s = NumpyStore()
+    print(f"{s.root}: {s.count()} points, {s._rows} rows, epoch {s._epoch}")
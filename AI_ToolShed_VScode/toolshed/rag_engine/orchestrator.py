@@ -5,19 +5,52 @@
 orchestrator.py — HTTP interface for Continue.ai
 Provides:
   - /context → top-K chunks from workspace_files
+  - /context/batch → {"queries": [...]} → one /context list per query,
+                embedded in one model call and searched in one batch
   - /query   → manual testing endpoint
+  - /stats   → retriever cache hit/miss counts (GET)
+  - /metrics → Prometheus text format (GET, see metrics.py)
+  - /healthz → model + vector store status, 503 if unreachable (GET)
 
 All data is pulled exclusively from:
     <INSTALL_ROOT>/workspace_files
+
+Concurrency (server_* settings):
+  - HTTP/1.1 keep-alive; one thread per open connection, at most
+    server_max_connections (extra connections get 429 and are closed)
+  - retrieval runs on a pool of server_workers threads; when
+    server_max_queue more requests are already waiting, new ones get
+    429 + Retry-After instead of queueing without bound
+  - a request that does not finish within server_request_timeout_s
+    gets 504 (the work itself still completes and frees its slot)
+server_workers = 0 keeps the old single-threaded server: one request
+per connection, closed after the response, so an idle client cannot
+hold the only serving thread.
+/metrics and /healthz are answered on the connection thread, so
+they still respond while the worker pool is saturated.
+
+Workers share one model and one Qdrant client: the embedder loads
+the model under a lock and the retriever caches are thread-safe.
 """
 
 from __future__ import annotations
 
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 
-from rag_engine.retriever import retrieve_relevant_chunks
+from configs.settings import get_setting
+from rag_engine.embedder import warm_up
+from rag_engine.vector_store import get_store
+from rag_engine.retriever import (
+    cache_stats, retrieve_relevant_chunks, retrieve_relevant_chunks_batch,
+)
 from rag_engine.indexer import get_index_root
+from rag_engine.metrics import (
+    CONTENT_TYPE, ERRORS, REQUEST_SECONDS, REQUESTS, bind_engine, health, render,
+)
 
 
 HOST = "127.0.0.1"
@@ -42,77 +75,328 @@ def _chunk_to_context_item(chunk):
     }
 
 
+# ------------------------------------------------------------
+# Endpoints: request JSON → response data
+# ------------------------------------------------------------
+class BadRequest(Exception):
+    pass
+
+
+def _request(data) -> dict:
+    if not isinstance(data, dict):
+        raise BadRequest("request body must be a JSON object")
+    return data
+
+
+def _top_k(data: dict, default: int) -> int:
+    value = data.get("top_k", default)
+    if isinstance(value, bool):
+        raise BadRequest("top_k must be a positive integer")
+    try:
+        top_k = int(value)
+    except (TypeError, ValueError):
+        raise BadRequest("top_k must be a positive integer")
+    if top_k <= 0:
+        raise BadRequest("top_k must be a positive integer")
+    return top_k
+
+
+def _query_text(data: dict, *fields) -> str:
+    for field in fields:
+        value = data.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise BadRequest(f"{field} must be a string")
+        if value:
+            return value
+    return ""
+
+
+def _context(data):
+    data = _request(data)
+    query = _query_text(data, "query", "fullInput")
+    top_k = _top_k(data, 10)
+
+    chunks = retrieve_relevant_chunks(query, top_k=top_k)
+    return [_chunk_to_context_item(ch) for ch in chunks]
+
+
+def _context_batch(data):
+    data = _request(data)
+    queries = data.get("queries")
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        raise BadRequest("queries must be a list of strings")
+    limit = int(get_setting("server_max_batch_queries") or 0)
+    if limit and len(queries) > limit:
+        raise BadRequest(f"at most {limit} queries per batch")
+    top_k = _top_k(data, 10)
+
+    batches = retrieve_relevant_chunks_batch(queries, top_k=top_k)
+    return [[_chunk_to_context_item(ch) for ch in chunks] for chunks in batches]
+
+
+def _query(data):
+    data = _request(data)
+    query = _query_text(data, "query")
+    top_k = _top_k(data, 5)
+
+    chunks = retrieve_relevant_chunks(query, top_k=top_k)
+
+    return [{
+        "file": ch.metadata.get("file_path"),
+        "score": ch.metadata.get("score"),
+        "text": ch.text
+    } for ch in chunks]
+
+
+POST_ROUTES = {
+    "/context": _context,
+    "/context/batch": _context_batch,
+    "/query": _query,
+}
+
+GET_ROUTES = {
+    "/stats": cache_stats,
+}
+
+
+# Answered inline, never queued behind retrieval: (code, body, type)
+def _metrics():
+    return 200, render().encode("utf-8"), CONTENT_TYPE
+
+
+def _healthz():
+    code, data = health()
+    return _json(data, code)
+
+
+INLINE_ROUTES = {
+    "/metrics": _metrics,
+    "/healthz": _healthz,
+}
+
+# Metric label for a request path; anything else is "other"
+_ENDPOINTS = set(POST_ROUTES) | set(GET_ROUTES) | set(INLINE_ROUTES)
+
+
+# ------------------------------------------------------------
+# Bounded worker pool shared by all connections
+# ------------------------------------------------------------
+class Busy(Exception):
+    pass
+
+
+class WorkerPool:
+    def __init__(self, workers: int, max_queue: int, timeout: float):
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix="orchestrator")
+        # running + waiting requests
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def call(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise Busy()
+
+        def run():
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            fut = self._pool.submit(run)
+        except Exception:
+            self._slots.release()
+            raise
+        return fut.result(timeout=self.timeout or None)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
 # ------------------------------------------------------------
 # Request handler
 # ------------------------------------------------------------
 class Handler(BaseHTTPRequestHandler):
-    def do_POST(self):
+    protocol_version = "HTTP/1.1"  # keep-alive; every response sets Content-Length
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    pool: WorkerPool = None  # None → run inline (single-threaded server)
+    keep_alive = True        # False → "Connection: close" on every response
+
+    endpoint = "other"
+
+    def _route(self) -> str:
+        path = self.path.split("?", 1)[0]
+        self.endpoint = path if path in _ENDPOINTS else "other"
+        return path
+
+    def _write(self, code, body, ct, headers=None):
+        REQUESTS.inc(self.endpoint, str(code))
+        self.send_response(code)
+        self.send_header("Content-Type", ct)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        if not self.keep_alive:
+            self.send_header("Connection", "close")  # also sets close_connection
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send(self, code, data, headers=None):
+        self._write(*_json(data, code), headers)
+
+    def _fail(self, kind, code, data, headers=None):
+        ERRORS.inc(self.endpoint, kind)
+        self._send(code, data, headers)
+
+    def _dispatch(self, fn, *args):
+        try:
+            if self.pool is None:
+                result = fn(*args)
+            else:
+                result = self.pool.call(fn, *args)
+        except Busy:
+            self._fail("busy", 429, {"error": "server busy"}, {"Retry-After": "1"})
+            return
+        except FutureTimeout:
+            self._fail("timeout", 504, {"error": "request timed out"})
+            return
+        except BadRequest as e:
+            self._fail("bad_request", 400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._fail("exception", 500, {"error": str(e)})
+            return
+
+        self._send(200, result)
+
+    def _get(self):
+        path = self._route()
+        inline = INLINE_ROUTES.get(path)
+        if inline is not None:
+            self._write(*inline())
+            return
+        fn = GET_ROUTES.get(path)
+        if fn is None:
+            self._send(404, {"error": "unknown endpoint"})
+            return
+        self._dispatch(fn)
+
+    def _post(self):
+        path = self._route()
         length = int(self.headers.get("Content-Length", 0))
         raw = self.rfile.read(length)
 
         try:
             data = json.loads(raw.decode("utf-8"))
         except Exception:
-            code, body, ct = _json({"error": "invalid json"}, 400)
-            self.send_response(code)
-            self.send_header("Content-Type", ct)
-            self.end_headers()
-            self.wfile.write(body)
+            self._fail("invalid_json", 400, {"error": "invalid json"})
             return
 
-        # ----------------------------------------------------
-        # /context — Continue context provider
-        # ----------------------------------------------------
-        if self.path == "/context":
-            query = data.get("query", "") or data.get("fullInput", "")
-            top_k = int(data.get("top_k", 10))
-
-            chunks = retrieve_relevant_chunks(query, top_k=top_k)
-            items = [_chunk_to_context_item(ch) for ch in chunks]
-
-            code, body, ct = _json(items)
-            self.send_response(code)
-            self.send_header("Content-Type", ct)
-            self.end_headers()
-            self.wfile.write(body)
+        fn = POST_ROUTES.get(path)
+        if fn is None:
+            self._send(404, {"error": "unknown endpoint"})
             return
+        self._dispatch(fn, data)
 
-        # ----------------------------------------------------
-        # /query — direct testing
-        # ----------------------------------------------------
-        if self.path == "/query":
-            query = data.get("query", "")
-            top_k = int(data.get("top_k", 5))
-
-            chunks = retrieve_relevant_chunks(query, top_k=top_k)
-
-            structured = [{
-                "file": ch.metadata.get("file_path"),
-                "score": ch.metadata.get("score"),
-                "text": ch.text
-            } for ch in chunks]
-
-            code, body, ct = _json(structured)
-            self.send_response(code)
-            self.send_header("Content-Type", ct)
-            self.end_headers()
-            self.wfile.write(body)
-            return
+    def _timed(self, handle):
+        started = time.perf_counter()
+        try:
+            handle()
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - started, self.endpoint)
 
-        # -------------------------
-        # Unknown endpoint
-        # -------------------------
-        code, body, ct = _json({"error": "unknown endpoint"}, 404)
-        self.send_response(code)
-        self.send_header("Content-Type", ct)
-        self.end_headers()
-        self.wfile.write(body)
+    def do_GET(self):
+        self._timed(self._get)
+
+    def do_POST(self):
+        self._timed(self._post)
 
     # Silence logging
     def log_message(self, *a):
         return
 
 
+# ------------------------------------------------------------
+# Threaded server with a cap on open connections
+# ------------------------------------------------------------
+_REJECT = json.dumps({"error": "too many connections"}).encode("utf-8")
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # listen backlog; the default 5 drops bursts of connects
+
+    def __init__(self, addr, handler, max_connections: int):
+        self._conn_slots = threading.BoundedSemaphore(max_connections)
+        super().__init__(addr, handler)
+
+    def process_request(self, request, client_address):
+        if not self._conn_slots.acquire(blocking=False):
+            self._reject(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._conn_slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._conn_slots.release()
+
+    def _reject(self, request):
+        try:
+            request.settimeout(1.0)
+            request.sendall(
+                b"HTTP/1.1 429 Too Many Requests\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Retry-After: 1\r\n"
+                b"Connection: close\r\n"
+                + f"Content-Length: {len(_REJECT)}\r\n\r\n".encode("ascii")
+                + _REJECT
+            )
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+
+# ------------------------------------------------------------
+# Build the server from settings (port 0 → pick a free port)
+# ------------------------------------------------------------
+def make_server(host: str = HOST, port: int = PORT):
+    bind_engine()
+    workers = int(get_setting("server_workers") or 0)
+
+    # A connection idle this long (no request yet) is dropped
+    Handler.timeout = float(get_setting("server_keepalive_timeout_s") or 0) or None
+
+    if workers <= 0:
+        # One serving thread: close after each response rather than
+        # wait on an idle keep-alive client
+        Handler.pool = None
+        Handler.keep_alive = False
+        return HTTPServer((host, port), Handler)
+
+    Handler.pool = WorkerPool(
+        workers,
+        int(get_setting("server_max_queue") or 0),
+        float(get_setting("server_request_timeout_s") or 0),
+    )
+    Handler.keep_alive = True
+
+    return PooledHTTPServer(
+        (host, port), Handler,
+        max_connections=int(get_setting("server_max_connections") or 64),
+    )
+
+
 # ------------------------------------------------------------
 # Runner
 # ------------------------------------------------------------
@@ -120,10 +404,28 @@ def run():
     root = get_index_root()
     print(f"[orchestrator] Using workspace_files: {root}")
 
-    server = HTTPServer((HOST, PORT), Handler)
+    # Load the model and open the collection before listening, so the
+    # first /context request does not pay for either
+    get_store().ensure()
+    print(f"[orchestrator] Model warm in {warm_up():.1f}s")
+
+    server = make_server()
+    if Handler.pool is None:
+        print("[orchestrator] Single-threaded mode")
+    else:
+        print(
+            f"[orchestrator] {get_setting('server_workers')} workers, "
+            f"queue {get_setting('server_max_queue')}, "
+            f"max {get_setting('server_max_connections')} connections"
+        )
     print(f"[orchestrator] Listening on http://{HOST}:{PORT}")
 
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if Handler.pool is not None:
+            Handler.pool.shutdown()
 
 
 if __name__ == "__main__":
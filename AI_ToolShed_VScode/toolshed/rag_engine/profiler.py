@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+profiler.py — timing spans around the pipeline stages, for
+`ai-toolshed profile`.
+
+    with span("embed", texts=len(batch)):
+        ...
+
+Outside a profile run span() returns a shared no-op context, so the
+instrumented code pays one global read per call. During a run every
+span is recorded as a Chrome trace "complete" event; the output file
+opens in chrome://tracing, Perfetto or speedscope.
+
+Stages recorded:
+    read    open + read (or mmap + hash for streamed files)
+    hash    content hash of a read file
+    decode  bytes → str (UTF-8, BOMs, chardet)
+    chunk   chunk_content
+    embed   model call for cache misses (dispatcher wait included)
+    upsert  vector store write
+    search  vector store query
+
+Index workers are separate processes: while profiling, the indexer
+runs their loads through call_recorded() and merges the returned
+spans (perf_counter is system-wide on Linux, macOS and Windows, so
+timestamps line up). cProfile sees the main thread only; tracemalloc
+sees this process only.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List
+
+
+MAX_EVENTS = 500_000  # trace events kept; the summary counts every span
+
+_NOOP = contextlib.nullcontext()
+_active = None  # Recorder while a profile run is in progress
+
+
+# ------------------------------------------------------------
+# Recording
+# ------------------------------------------------------------
+class _Span:
+    __slots__ = ("rec", "name", "args", "t0")
+
+    def __init__(self, rec, name, args):
+        self.rec = rec
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.rec.add(self.name, self.t0, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Recorder:
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.events = []   # (name, pid, tid, start ns, end ns, args)
+        self.dropped = 0
+        self.totals: Dict[str, list] = {}  # name → [calls, total ns, max ns]
+        self._lock = threading.Lock()
+
+    def add(self, name, t0, t1, args=None, pid=None, tid=None):
+        ev = (name, pid or os.getpid(), tid or threading.get_ident(), t0, t1, args)
+        dur = t1 - t0
+        with self._lock:
+            if len(self.events) < MAX_EVENTS:
+                self.events.append(ev)
+            else:
+                self.dropped += 1
+            t = self.totals.get(name)
+            if t is None:
+                self.totals[name] = [1, dur, dur]
+            else:
+                t[0] += 1
+                t[1] += dur
+                t[2] = max(t[2], dur)
+
+    def merge(self, events):
+        for name, pid, tid, t0, t1, args in events:
+            self.add(name, t0, t1, args, pid, tid)
+
+
+def span(name: str, **args):
+    rec = _active
+    if rec is None:
+        return _NOOP
+    return _Span(rec, name, args or None)
+
+
+def profiling() -> bool:
+    return _active is not None
+
+
+# ------------------------------------------------------------
+# Worker processes: run fn under a local recorder, ship the spans
+# back with the result; the parent unwraps with merge_recorded()
+# ------------------------------------------------------------
+def call_recorded(fn, *args):
+    global _active
+    _active = Recorder()
+    try:
+        return fn(*args), _active.events
+    finally:
+        _active = None
+
+
+def merge_recorded(out):
+    result, events = out
+    if _active is not None:
+        _active.merge(events)
+    return result
+
+
+# ------------------------------------------------------------
+# Output: Chrome trace JSON (also read by speedscope / Perfetto)
+# ------------------------------------------------------------
+def trace_json(rec: Recorder, label: str) -> dict:
+    events, names = [], set()
+    main_pid = os.getpid()
+    for name, pid, tid, t0, t1, args in rec.events:
+        ev = {"name": name, "cat": "toolshed", "ph": "X", "pid": pid, "tid": tid,
+              "ts": (t0 - rec.origin) / 1000.0, "dur": (t1 - t0) / 1000.0}
+        if args:
+            ev["args"] = args
+        events.append(ev)
+        names.add(pid)
+    for pid in sorted(names):
+        title = label if pid == main_pid else f"{label} worker {pid}"
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": title}})
+    return {"traceEvents": events, "displayTimeUnit": "ms",
+            "otherData": {"command": label, "dropped_events": rec.dropped}}
+
+
+def summary_lines(rec: Recorder, wall_ns: int) -> List[str]:
+    rows = sorted(rec.totals.items(), key=lambda kv: -kv[1][1])
+    out = [f"{'stage':<10} {'calls':>9} {'total s':>10} {'mean ms':>10} {'max ms':>10} {'% wall':>7}"]
+    for name, (calls, total, longest) in rows:
+        out.append(
+            f"{name:<10} {calls:>9} {total / 1e9:>10.3f} {total / calls / 1e6:>10.3f} "
+            f"{longest / 1e6:>10.2f} {100.0 * total / max(wall_ns, 1):>6.1f}%"
+        )
+    out.append(f"{'wall':<10} {'':>9} {wall_ns / 1e9:>10.3f}")
+    return out
+
+
+# ------------------------------------------------------------
+# Run fn under the recorder (+ cProfile / tracemalloc if asked)
+# and report. Returns fn's result.
+# ------------------------------------------------------------
+def run_profiled(fn: Callable, label: str, out: str = "", cprofile: bool = False,
+                 tracemalloc: bool = False, top: int = 20):
+    global _active
+    rec = _active = Recorder()
+
+    prof = None
+    if cprofile:
+        import cProfile
+        prof = cProfile.Profile()
+    if tracemalloc:
+        import tracemalloc as tm
+        tm.start(1)
+
+    started = time.perf_counter_ns()
+    try:
+        if prof is not None:
+            prof.enable()
+        with span(label):
+            result = fn()
+    finally:
+        if prof is not None:
+            prof.disable()
+        wall = time.perf_counter_ns() - started
+        snapshot = peak = None
+        if tracemalloc:
+            snapshot = tm.take_snapshot()
+            peak = tm.get_traced_memory()[1]
+            tm.stop()
+        _active = None
+
+    out = out or f"profile-{label}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(trace_json(rec, label), f)
+
+    print("[profile] Spans (worker-process and thread time add up, so % wall can pass 100):")
+    for line in summary_lines(rec, wall):
+        print(f"  {line}")
+    if rec.dropped:
+        print(f"[profile] {rec.dropped} spans beyond {MAX_EVENTS} left out of the trace")
+    print(f"[profile] Trace: {out} (chrome://tracing, ui.perfetto.dev or speedscope.app)")
+
+    if prof is not None:
+        import pstats
+        prof_out = os.path.splitext(out)[0] + ".prof"
+        prof.dump_stats(prof_out)
+        print(f"[profile] cProfile (main thread), top {top} by cumulative time; full stats: {prof_out}")
+        pstats.Stats(prof).sort_stats("cumulative").print_stats(top)
+
+    if snapshot is not None:
+        print(f"[profile] tracemalloc: peak {peak / 2**20:.1f} MB; top {top} allocation sites still live:")
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            print(f"  {stat.size / 2**20:>9.2f} MB {stat.count:>9} blocks  {frame.filename}:{frame.lineno}")
+
+    return result
+
+
+if __name__ == "__main__":
+    def _demo():
+        for i in range(3):
+            with span("embed", texts=i):
+                time.sleep(0.01)
+
+    run_profiled(_demo, "demo", out=os.devnull)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+qdrant_init.py — shared Qdrant client + collection setup.
+
+By default Qdrant runs embedded (local mode) on:
+    <INSTALL_ROOT>/qdrant
+Local mode lets only one process open that folder at a time. To run
+the watcher and the orchestrator side by side against Qdrant, start a
+Qdrant server and set qdrant_url in rag_settings.json.
+
+Against a server the collection also gets keyword payload indexes on
+file_path and ext (delete-by-file and filters stop scanning every
+point) plus the qdrant_* tuning settings: HNSW m / ef_construct,
+search ef, on-disk vectors and int8 scalar quantization with rescoring.
+Local mode is an exact brute-force search and ignores all of them.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from configs.paths import get_qdrant_path
+from configs.settings import get_setting
+
+
+COLLECTION_NAME = "workspace_files"
+
+# Payload fields with a keyword index (server mode)
+PAYLOAD_INDEXES = ("file_path", "ext")
+
+TUNING_KEYS = (
+    "qdrant_hnsw_m",
+    "qdrant_hnsw_ef_construct",
+    "qdrant_search_ef",
+    "qdrant_on_disk",
+    "qdrant_quantization",
+    "qdrant_rescore",
+    "qdrant_oversampling",
+)
+
+_client_lock = threading.Lock()
+_client = None
+_ready = False
+
+
+# ------------------------------------------------------------
+# Client (lazy singleton)
+# ------------------------------------------------------------
+def is_local() -> bool:
+    return not get_setting("qdrant_url")
+
+
+def get_client() -> QdrantClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            url = get_setting("qdrant_url")
+            if url:
+                _client = QdrantClient(url=url)
+            else:
+                path = get_qdrant_path()
+                path.mkdir(parents=True, exist_ok=True)
+                _client = QdrantClient(path=str(path))
+    return _client
+
+
+# ------------------------------------------------------------
+# Tuning (settings, or an explicit dict for benchmarks)
+# ------------------------------------------------------------
+def tuning(**overrides) -> dict:
+    t = {k: get_setting(k) for k in TUNING_KEYS}
+    t.update(overrides)
+    return t
+
+
+def _hnsw_config(t: dict):
+    return qmodels.HnswConfigDiff(m=int(t["qdrant_hnsw_m"]),
+                                  ef_construct=int(t["qdrant_hnsw_ef_construct"]))
+
+
+def _quantization_config(t: dict):
+    kind = (t["qdrant_quantization"] or "").lower()
+    if not kind:
+        return None
+    if kind != "int8":
+        raise ValueError(f"unsupported qdrant_quantization {kind!r} (have: int8)")
+    return qmodels.ScalarQuantization(
+        scalar=qmodels.ScalarQuantizationConfig(
+            type=qmodels.ScalarType.INT8, quantile=0.99, always_ram=True,
+        )
+    )
+
+
+def search_params(t: Optional[dict] = None):
+    """SearchParams for query_points, or None when nothing is tuned."""
+    t = t or tuning()
+    ef = int(t["qdrant_search_ef"] or 0)
+    quant = None
+    if t["qdrant_quantization"]:
+        quant = qmodels.QuantizationSearchParams(
+            rescore=bool(t["qdrant_rescore"]),
+            oversampling=float(t["qdrant_oversampling"]),
+        )
+    if not ef and quant is None:
+        return None
+    return qmodels.SearchParams(hnsw_ef=ef or None, quantization=quant)
+
+
+# ------------------------------------------------------------
+# Collection setup
+# ------------------------------------------------------------
+def create_collection(client: QdrantClient, name: str, dim: int,
+                      t: Optional[dict] = None, local: bool = False):
+    t = t or tuning()
+    vectors = qmodels.VectorParams(size=dim, distance=qmodels.Distance.COSINE)
+    if local:
+        client.create_collection(collection_name=name, vectors_config=vectors)
+        return
+
+    vectors.on_disk = bool(t["qdrant_on_disk"])
+    client.create_collection(
+        collection_name=name,
+        vectors_config=vectors,
+        hnsw_config=_hnsw_config(t),
+        quantization_config=_quantization_config(t),
+    )
+    ensure_payload_indexes(client, name)
+
+
+def ensure_payload_indexes(client: QdrantClient, name: str):
+    have = client.get_collection(name).payload_schema or {}
+    for field in PAYLOAD_INDEXES:
+        if field not in have:
+            client.create_payload_index(
+                collection_name=name,
+                field_name=field,
+                field_schema=qmodels.PayloadSchemaType.KEYWORD,
+            )
+            print(f"[qdrant] Indexed payload field {field}")
+
+
+def apply_tuning(client: QdrantClient, name: str, t: Optional[dict] = None):
+    """Bring an existing collection in line with the tuning settings."""
+    t = t or tuning()
+    cfg = client.get_collection(name).config
+    changes = {}
+
+    hnsw = cfg.hnsw_config
+    if (hnsw.m, hnsw.ef_construct) != (int(t["qdrant_hnsw_m"]), int(t["qdrant_hnsw_ef_construct"])):
+        changes["hnsw_config"] = _hnsw_config(t)
+
+    want_quant = _quantization_config(t)
+    if (cfg.quantization_config is None) != (want_quant is None):
+        changes["quantization_config"] = want_quant or qmodels.Disabled.DISABLED
+
+    if bool(cfg.params.vectors.on_disk) != bool(t["qdrant_on_disk"]):
+        changes["vectors_config"] = {"": qmodels.VectorParamsDiff(on_disk=bool(t["qdrant_on_disk"]))}
+
+    if changes:
+        client.update_collection(collection_name=name, **changes)
+        print(f"[qdrant] Updated {name}: {', '.join(changes)}")
+
+
+# ------------------------------------------------------------
+# Create the collection on first use
+#
+# dim: vector size; defaults to the embedding model's output size
+# ------------------------------------------------------------
+def ensure_collection(dim: int = 0):
+    global _ready
+    if _ready:
+        return
+
+    client = get_client()
+    local = is_local()
+    with _client_lock:
+        if _ready:
+            return
+        if not client.collection_exists(COLLECTION_NAME):
+            if not dim:
+                from rag_engine.embedder import embedding_dim
+                dim = embedding_dim()
+            create_collection(client, COLLECTION_NAME, dim, local=local)
+            print(f"[qdrant] Created collection {COLLECTION_NAME} (dim {dim})")
+        elif not local:
+            ensure_payload_indexes(client, COLLECTION_NAME)
+            apply_tuning(client, COLLECTION_NAME)
+        _ready = True
+
+
+if __name__ == "__main__":
+    ensure_collection()
+    print(get_client().get_collection(COLLECTION_NAME))
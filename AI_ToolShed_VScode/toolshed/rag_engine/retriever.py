@@ -5,22 +5,37 @@
 retriever.py — semantic search over ONLY:
     <INSTALL_ROOT>/workspace_files
 
-Uses Qdrant + embedder.
+Uses the vector store (vector_store.py) + embedder.
+
+Two in-process LRU caches sit in front of the search:
+  - query vectors, keyed by (model, query text)
+  - results, keyed by (query, top_k, filters, index generation)
+Any index write advances the generation (generation.py), so cached
+results never outlive the data they came from. cache_stats() reports
+hits and misses.
+
+retrieve_relevant_chunks_batch() answers many queries at once: the
+uncached query vectors come from one model call and the store is
+searched with one batch request.
 """
 
 from __future__ import annotations
 
+import json
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
-from qdrant_client.http import models as qmodels
+import numpy as np
 
-from rag_engine.embedder import embed_texts
-from rag_engine.qdrant_init import (
-    get_client,
-    ensure_collection,
-    COLLECTION_NAME,
-)
+from configs.settings import get_setting
+from rag_engine.embedder import embed_array, embed_signature, QUERY
+from rag_engine.generation import current_generation
+from rag_engine.metrics import SEARCH_SECONDS
+from rag_engine.profiler import span
+from rag_engine.vector_store import get_store
 from rag_engine.indexer import get_index_root
 
 
@@ -34,22 +49,70 @@ class RetrievedChunk:
 
 
 # ------------------------------------------------------------
-# Retrieve top-K chunks
+# Small thread-safe LRU with hit/miss counters
 # ------------------------------------------------------------
-def retrieve_relevant_chunks(query: str, top_k: int = 10) -> List[RetrievedChunk]:
-    ensure_collection()
+class _LRU:
+    def __init__(self, setting: str):
+        self.setting = setting
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = int(get_setting(self.setting) or 0)
+        if size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > size:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+_query_vectors = _LRU("query_cache_size")
+_results = _LRU("result_cache_size")
+
+
+def cache_stats() -> Dict[str, dict]:
+    return {
+        "query_vectors": _query_vectors.stats(),
+        "results": _results.stats(),
+        "generation": current_generation(),
+    }
+
 
-    client = get_client()
-    vectors = embed_texts([query])
-    vec = vectors[0]
+# ------------------------------------------------------------
+# Query vector (cached)
+# ------------------------------------------------------------
+def _query_vector(query: str):
+    key = (embed_signature(), query)
+    vec = _query_vectors.get(key)
+    if vec is None:
+        vec = embed_array([query], cache=False, priority=QUERY)[0]
+        vec.setflags(write=False)  # shared by every hit on this entry
+        _query_vectors.put(key, vec)
+    return vec
 
-    search = client.search(
-        collection_name=COLLECTION_NAME,
-        query_vector=vec,
-        limit=top_k,
-        with_payload=True
-    )
 
+# ------------------------------------------------------------
+# Store hits → RetrievedChunk list
+# ------------------------------------------------------------
+def _to_chunks(search) -> List[RetrievedChunk]:
     out = []
     for r in search:
         payload = r.payload or {}
@@ -59,14 +122,94 @@ def retrieve_relevant_chunks(query: str, top_k: int = 10) -> List[RetrievedChunk
             "file_path": payload.get("file_path", ""),
             "score": r.score,
             "start": payload.get("start", None),
-            "end": payload.get("end", None)
+            "end": payload.get("end", None),
+            "start_line": payload.get("start_line", None),
+            "end_line": payload.get("end_line", None)
         }
 
         out.append(RetrievedChunk(txt, meta))
-
     return out
 
 
+def _result_key(query: str, top_k: int, filters) -> tuple:
+    return (query, top_k, json.dumps(filters or {}, sort_keys=True), current_generation())
+
+
+# ------------------------------------------------------------
+# Retrieve top-K chunks
+#
+# filters: payload field → exact value, e.g. {"file_path": "a.py"}
+# ------------------------------------------------------------
+def retrieve_relevant_chunks(query: str, top_k: int = 10,
+                             filters: Optional[Dict[str, object]] = None) -> List[RetrievedChunk]:
+    key = _result_key(query, top_k, filters)
+    cached = _results.get(key)
+    if cached is not None:
+        return list(cached)
+
+    store = get_store()
+    store.ensure()
+
+    vec = _query_vector(query)
+    started = time.perf_counter()
+    with span("search", top_k=top_k):
+        search = store.search(vec, top_k, filters)
+    SEARCH_SECONDS.observe(time.perf_counter() - started)
+
+    out = _to_chunks(search)
+    _results.put(key, out)
+    return list(out)
+
+
+# ------------------------------------------------------------
+# Retrieve top-K chunks for many queries at once
+#
+# Same results as calling retrieve_relevant_chunks per query, one
+# list per query in order. Cached results are reused; the rest is
+# embedded in a single model call (misses in the query-vector
+# cache only, duplicates once) and searched with one batch call.
+# ------------------------------------------------------------
+def retrieve_relevant_chunks_batch(queries: List[str], top_k: int = 10,
+                                   filters: Optional[Dict[str, object]] = None
+                                   ) -> List[List[RetrievedChunk]]:
+    results: List[Optional[List[RetrievedChunk]]] = [None] * len(queries)
+    todo: Dict[str, List[int]] = {}  # query → positions still to search
+    for i, q in enumerate(queries):
+        cached = _results.get(_result_key(q, top_k, filters))
+        if cached is not None:
+            results[i] = list(cached)
+        else:
+            todo.setdefault(q, []).append(i)
+
+    if todo:
+        store = get_store()
+        store.ensure()
+
+        sig = embed_signature()
+        texts = list(todo)
+        vecs = [_query_vectors.get((sig, q)) for q in texts]
+        missing = [j for j, v in enumerate(vecs) if v is None]
+        if missing:
+            fresh = embed_array([texts[j] for j in missing], cache=False, priority=QUERY)
+            for j, vec in zip(missing, fresh):
+                vec.setflags(write=False)
+                _query_vectors.put((sig, texts[j]), vec)
+                vecs[j] = vec
+
+        started = time.perf_counter()
+        with span("search", top_k=top_k, queries=len(texts)):
+            found = store.search_batch(np.stack(vecs), top_k, filters)
+        SEARCH_SECONDS.observe(time.perf_counter() - started)
+
+        for q, search in zip(texts, found):
+            out = _to_chunks(search)
+            _results.put(_result_key(q, top_k, filters), out)
+            for i in todo[q]:
+                results[i] = list(out)
+
+    return results
+
+
 if __name__ == "__main__":
     # for quick testing
     results = retrieve_relevant_chunks("test query", top_k=5)
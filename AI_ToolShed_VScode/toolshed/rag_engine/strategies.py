@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+strategies.py — structure-aware chunk boundaries, per file extension.
+
+Each strategy splits text into line-aligned units (Python via `ast`,
+brace languages via brace depth, Markdown via headings). Neighbouring
+small units are packed together up to max_len characters; units that
+are still too large are split at finer boundaries, then at line
+boundaries, then by characters.
+
+Strategies return spans (start, end, start_line, end_line): character
+offsets plus 1-based inclusive line numbers. chunker.py turns them
+into Chunk objects. The "chars" strategy returns None, meaning "use
+the plain fixed-window chunker".
+
+Sizes are characters by default. With chunk_budget = "tokens" every
+line is weighed by its token count (token_budget.py), so max_len is a
+token budget and files without a strategy are line-packed instead of
+cut into fixed character windows.
+
+Register more with register_strategy(); map extensions in the
+chunk_strategies setting, e.g. {".vue": "braces", ".txt": "markdown"}.
+"""
+
+from __future__ import annotations
+
+import ast
+import bisect
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from configs.settings import get_setting
+from rag_engine import token_budget
+
+
+Span = Tuple[int, int, int, int]
+
+# Optional per-line weight function (token counts); None = characters
+Weigh = Optional[Callable[[List[str]], List[int]]]
+
+# A refine callback returns finer line boundaries inside [lo, hi)
+Refine = Callable[[int, int], List[int]]
+
+
+# ------------------------------------------------------------
+# Line table (character offsets + size prefix sums)
+# ------------------------------------------------------------
+class _Lines:
+    def __init__(self, text: str, weigh: Weigh = None):
+        self.text = text
+        self.lines = text.splitlines(keepends=True)
+        self.offsets = [0]
+        for ln in self.lines:
+            self.offsets.append(self.offsets[-1] + len(ln))
+
+        if weigh is None:
+            self.weights = self.offsets
+        else:
+            self.weights = [0]
+            for w in weigh(self.lines):
+                self.weights.append(self.weights[-1] + w)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def size(self, lo: int, hi: int) -> int:
+        return self.weights[hi] - self.weights[lo]
+
+    def blank(self, i: int) -> bool:
+        return not self.lines[i].strip()
+
+
+# ------------------------------------------------------------
+# Packing: boundaries → spans of at most max_len chars
+# ------------------------------------------------------------
+def _units(bounds: List[int], lo: int, hi: int) -> List[Tuple[int, int]]:
+    cuts = sorted({b for b in bounds if lo < b < hi})
+    edges = [lo] + cuts + [hi]
+    return [(a, b) for a, b in zip(edges, edges[1:]) if a < b]
+
+
+def _split_oversize(lines: _Lines, lo: int, hi: int, max_len: int,
+                    refine: Optional[Refine]) -> List[Tuple[int, int]]:
+    if refine is not None:
+        sub = _units(refine(lo, hi), lo, hi)
+        if len(sub) > 1:
+            return _pack(lines, sub, max_len, refine)
+
+    # One line per unit; the packer merges them back up to max_len
+    return [(i, i + 1) for i in range(lo, hi)]
+
+
+def _pack(lines: _Lines, units, max_len: int,
+          refine: Optional[Refine]) -> List[Tuple[int, int]]:
+    out = []
+    cur = None
+
+    for lo, hi in units:
+        if lines.size(lo, hi) > max_len and hi - lo > 1:
+            pieces = _split_oversize(lines, lo, hi, max_len, refine)
+        else:
+            pieces = [(lo, hi)]
+
+        for a, b in pieces:
+            if cur is not None and lines.size(cur[0], b) <= max_len:
+                cur = (cur[0], b)
+            else:
+                if cur is not None:
+                    out.append(cur)
+                cur = (a, b)
+
+    if cur is not None:
+        out.append(cur)
+    return out
+
+
+def _to_spans(lines: _Lines, ranges, max_len: int) -> List[Span]:
+    out = []
+    for lo, hi in ranges:
+        s, e = lines.offsets[lo], lines.offsets[hi]
+        if not lines.text[s:e].strip():
+            continue
+
+        # A single line over budget: character windows sized so each
+        # holds about max_len worth of weight
+        size = lines.size(lo, hi)
+        if size > max_len:
+            width = max(1, (e - s) * max_len // size)
+            for w in range(s, e, width):
+                out.append((w, min(w + width, e), lo + 1, hi))
+            continue
+
+        out.append((s, e, lo + 1, hi))
+    return out
+
+
+# ------------------------------------------------------------
+# Python: top-level statements; big classes/functions are split
+# at the statements of their bodies
+# ------------------------------------------------------------
+_BODY_FIELDS = ("body", "orelse", "finalbody", "handlers")
+
+
+def _py_first_line(node) -> int:
+    first = node.lineno
+    for d in getattr(node, "decorator_list", []):
+        first = min(first, d.lineno)
+    return first - 1
+
+
+def _py_statements(node):
+    for field in _BODY_FIELDS:
+        for child in getattr(node, field, None) or []:
+            if isinstance(child, ast.AST) and hasattr(child, "lineno"):
+                yield child
+
+
+def _py_with_comments(lines: _Lines, b: int) -> int:
+    # Pull a boundary up over the comment block directly above it
+    while b > 0 and lines.lines[b - 1].lstrip().startswith("#"):
+        b -= 1
+    return b
+
+
+def split_python(text: str, max_len: int, weigh: Weigh = None) -> Optional[List[Span]]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return split_lines(text, max_len, weigh)
+
+    lines = _Lines(text, weigh)
+    by_start: Dict[int, ast.AST] = {}
+
+    def bounds_of(nodes) -> List[int]:
+        out = []
+        for n in nodes:
+            b = _py_with_comments(lines, _py_first_line(n))
+            by_start.setdefault(b, n)
+            out.append(b)
+            out.append(n.end_lineno)
+        return out
+
+    def refine(lo: int, hi: int) -> List[int]:
+        node = by_start.get(lo)
+        if node is None:
+            return []
+        return bounds_of(_py_statements(node))
+
+    top = _units(bounds_of(tree.body), 0, len(lines))
+    return _to_spans(lines, _pack(lines, top, max_len, refine), max_len)
+
+
+# ------------------------------------------------------------
+# Brace languages (C, JS/TS, Java, Go, Rust, ...)
+#
+# A boundary is a line at brace depth <= level that follows a
+# blank line or a line that closed a block. Strings and comments
+# are skipped when counting braces.
+# ------------------------------------------------------------
+_BRACE_TOKENS = re.compile(
+    r'//[^\n]*|/\*.*?\*/'                                   # comments
+    r'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`'  # strings
+    r'|[{}]',
+    re.S,
+)
+
+
+def _brace_depths(lines: _Lines) -> List[int]:
+    # depth at the start of each line
+    events = []
+    for m in _BRACE_TOKENS.finditer(lines.text):
+        tok = m.group()
+        if tok == "{":
+            events.append((m.start(), 1))
+        elif tok == "}":
+            events.append((m.start(), -1))
+
+    depths = []
+    depth = 0
+    k = 0
+    for i in range(len(lines)):
+        depths.append(depth)
+        end = lines.offsets[i + 1]
+        while k < len(events) and events[k][0] < end:
+            depth = max(0, depth + events[k][1])
+            k += 1
+    depths.append(depth)
+    return depths
+
+
+def split_braces(text: str, max_len: int, weigh: Weigh = None) -> Optional[List[Span]]:
+    lines = _Lines(text, weigh)
+    depths = _brace_depths(lines)
+
+    def bounds(lo: int, hi: int, level: int) -> List[int]:
+        out = []
+        for i in range(max(lo, 1), hi):
+            if depths[i] > level or lines.blank(i):
+                continue
+            prev = lines.lines[i - 1].rstrip()
+            closed = depths[i] < depths[i - 1] or prev.endswith(("}", "};"))
+            if closed or lines.blank(i - 1):
+                out.append(i)
+        return out
+
+    def refine(lo: int, hi: int) -> List[int]:
+        return bounds(lo, hi, min(depths[lo:hi]) + 1)
+
+    top = _units(bounds(0, len(lines), 0), 0, len(lines))
+    return _to_spans(lines, _pack(lines, top, max_len, refine), max_len)
+
+
+# ------------------------------------------------------------
+# Markdown: sections at headings, then paragraphs
+# ------------------------------------------------------------
+_HEADING = re.compile(r"^(#{1,6})\s")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+def split_markdown(text: str, max_len: int, weigh: Weigh = None) -> Optional[List[Span]]:
+    lines = _Lines(text, weigh)
+
+    headings = []
+    in_fence = False
+    for i, ln in enumerate(lines.lines):
+        if _FENCE.match(ln):
+            in_fence = not in_fence
+        elif not in_fence and _HEADING.match(ln):
+            headings.append(i)
+
+    def refine(lo: int, hi: int) -> List[int]:
+        return [i for i in range(lo + 1, hi) if lines.blank(i - 1) and not lines.blank(i)]
+
+    top = _units(headings, 0, len(lines))
+    return _to_spans(lines, _pack(lines, top, max_len, refine), max_len)
+
+
+# ------------------------------------------------------------
+# Plain line packing (fallback for unparsable source)
+# ------------------------------------------------------------
+def split_lines(text: str, max_len: int, weigh: Weigh = None) -> Optional[List[Span]]:
+    lines = _Lines(text, weigh)
+    units = [(i, i + 1) for i in range(len(lines))]
+    return _to_spans(lines, _pack(lines, units, max_len, None), max_len)
+
+
+def split_chars(text: str, max_len: int, weigh: Weigh = None) -> Optional[List[Span]]:
+    return None
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+Strategy = Callable[[str, int, Weigh], Optional[List[Span]]]
+
+STRATEGIES: Dict[str, Strategy] = {
+    "chars": split_chars,
+    "lines": split_lines,
+    "python": split_python,
+    "braces": split_braces,
+    "markdown": split_markdown,
+}
+
+EXTENSIONS: Dict[str, str] = {
+    ".py": "python", ".pyw": "python", ".pyi": "python",
+    ".md": "markdown", ".markdown": "markdown", ".rst": "markdown",
+    ".c": "braces", ".h": "braces", ".cc": "braces", ".cpp": "braces",
+    ".hpp": "braces", ".cs": "braces", ".java": "braces", ".kt": "braces",
+    ".go": "braces", ".rs": "braces", ".swift": "braces", ".php": "braces",
+    ".js": "braces", ".jsx": "braces", ".mjs": "braces", ".cjs": "braces",
+    ".ts": "braces", ".tsx": "braces", ".css": "braces", ".scss": "braces",
+}
+
+
+def register_strategy(name: str, fn: Strategy):
+    STRATEGIES[name] = fn
+
+
+def strategy_for(path: Path) -> str:
+    ext = path.suffix.lower()
+    overrides = get_setting("chunk_strategies") or {}
+    return overrides.get(ext) or EXTENSIONS.get(ext, "chars")
+
+
+# Changes whenever the extension map or size target does, so the
+# indexer redoes files chunked under the old rules.
+def strategy_signature() -> str:
+    overrides = get_setting("chunk_strategies") or {}
+    return (
+        f"{get_setting('chunk_max_chars')}:{token_budget.signature()}:"
+        f"{json.dumps(overrides, sort_keys=True)}"
+    )
+
+
+# ------------------------------------------------------------
+# Entry point: spans for this file, or None for fixed windows
+#
+# budget: "chars" / "tokens"; defaults to the chunk_budget setting
+# ------------------------------------------------------------
+def split_for_path(text: str, path: Path, budget: str = None) -> Optional[List[Span]]:
+    name = strategy_for(path)
+    budget = budget or get_setting("chunk_budget")
+
+    if budget == "tokens":
+        if name == "chars":
+            name = "lines"  # fixed char windows cannot honour a token budget
+        fn = STRATEGIES.get(name, split_lines)
+        return fn(text, token_budget.token_budget(), token_budget.line_token_counts)
+
+    fn = STRATEGIES.get(name, split_chars)
+    return fn(text, int(get_setting("chunk_max_chars")))
+
+
+# ------------------------------------------------------------
+# Line number of a character offset (1-based)
+# ------------------------------------------------------------
+def line_index(text: str) -> List[int]:
+    return [m.end() for m in re.finditer("\n", text)]
+
+
+def line_at(newlines: List[int], offset: int) -> int:
+    return bisect.bisect_right(newlines, offset) + 1
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+token_budget.py — measure chunks in the embedding model's own tokens.
+
+all-MiniLM-L6-v2 truncates input at 256 word-pieces, so character
+budgets either cut code-heavy chunks or waste capacity on prose.
+With chunk_budget = "tokens" the structure-aware packer
+(strategies.py) weighs each line by its token count and packs chunks
+up to token_budget_fraction × embed_max_seq_length tokens.
+
+Lines are tokenized in batches, and the counts are cached by line text,
+because most lines (blank lines, braces, imports) repeat across files.
+Only the tokenizer is loaded, never the model.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List
+
+from configs.paths import get_index_root
+from configs.settings import get_setting
+from rag_engine.embedder import MODEL_NAME
+
+
+# [CLS] + [SEP] added by the model around every input
+SPECIAL_TOKENS = 2
+
+# Cached line → token count entries before the cache is reset
+LINE_CACHE_MAX = 200_000
+
+_tok_lock = threading.Lock()
+_tokenizer = None
+_line_lock = threading.Lock()
+_line_tokens: Dict[str, int] = {}
+
+
+def _load_tokenizer():
+    global _tokenizer
+    with _tok_lock:
+        if _tokenizer is None:
+            from transformers import AutoTokenizer
+            _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, use_fast=True)
+    return _tokenizer
+
+
+def enabled() -> bool:
+    return get_setting("chunk_budget") == "tokens"
+
+
+# ------------------------------------------------------------
+# Token budget per chunk (special tokens excluded)
+# ------------------------------------------------------------
+def token_budget() -> int:
+    max_seq = int(get_setting("embed_max_seq_length"))
+    frac = float(get_setting("token_budget_fraction"))
+    return max(16, int(max_seq * frac) - SPECIAL_TOKENS)
+
+
+def signature() -> str:
+    if not enabled():
+        return "chars"
+    return f"tokens:{token_budget()}"
+
+
+# ------------------------------------------------------------
+# Token counts for many texts, one batched tokenizer call
+# ------------------------------------------------------------
+def count_tokens(texts: List[str]) -> List[int]:
+    if not texts:
+        return []
+
+    tok = _load_tokenizer()
+    enc = tok(
+        texts,
+        add_special_tokens=False,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+    )
+    return [len(ids) for ids in enc["input_ids"]]
+
+
+# ------------------------------------------------------------
+# Per-line weights for strategies._Lines (cached by line text)
+#
+# The cache is shared by indexing threads; the tokenizer runs
+# outside the lock, and the answer is built from a local copy so a
+# concurrent reset cannot drop lines mid-call.
+# ------------------------------------------------------------
+def line_token_counts(lines: List[str]) -> List[int]:
+    unique = set(lines)
+    with _line_lock:
+        known = {ln: _line_tokens[ln] for ln in unique if ln in _line_tokens}
+    todo = [ln for ln in unique if ln not in known]
+
+    if todo:
+        counted = dict(zip(todo, count_tokens(todo)))
+        known.update(counted)
+        with _line_lock:
+            if len(_line_tokens) + len(counted) > LINE_CACHE_MAX:
+                _line_tokens.clear()
+            _line_tokens.update(counted)
+
+    return [known[ln] for ln in lines]
+
+
+# ------------------------------------------------------------
+# How many chunks exceed the model's window under each mode
+# ------------------------------------------------------------
+def truncation_report(paths) -> dict:
+    from rag_engine.chunker import chunk_text, read_file_safely
+    from rag_engine.strategies import split_for_path
+
+    max_seq = int(get_setting("embed_max_seq_length")) - SPECIAL_TOKENS
+    report = {"files": 0, "chars_chunks": 0, "chars_truncated": 0,
+              "tokens_chunks": 0, "tokens_truncated": 0}
+
+    for p in paths:
+        text = read_file_safely(p)
+        if not text:
+            continue
+        report["files"] += 1
+
+        before = [c.text for c in chunk_text(text)]
+        after = [text[s:e] for s, e, _, _ in split_for_path(text, p, budget="tokens")]
+
+        report["chars_chunks"] += len(before)
+        report["chars_truncated"] += sum(n > max_seq for n in count_tokens(before))
+        report["tokens_chunks"] += len(after)
+        report["tokens_truncated"] += sum(n > max_seq for n in count_tokens(after))
+
+    return report
+
+
+if __name__ == "__main__":
+    root = get_index_root()
+    files = [p for p in root.rglob("*") if p.is_file()]
+    r = truncation_report(files)
+    print(
+        f"{r['files']} files | chars mode: {r['chars_chunks']} chunks, "
+        f"{r['chars_truncated']} truncated | tokens mode: {r['tokens_chunks']} chunks, "
+        f"{r['tokens_truncated']} truncated"
+    )
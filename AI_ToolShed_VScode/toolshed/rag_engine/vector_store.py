@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+vector_store.py — storage behind the indexer and the retriever.
+
+  qdrant — Qdrant, embedded or remote (qdrant_init.py); the default
+  numpy  — in-process memory-mapped float32 matrix + SQLite payload
+           table (numpy_store.py); nothing to run or lock, suited to
+           single-user workspaces
+
+Select one with the vector_store setting. Both take and return
+float32 NumPy rows; ids are strings.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from configs.settings import get_setting
+
+
+# ------------------------------------------------------------
+# One search result (same attribute names as Qdrant's ScoredPoint)
+# ------------------------------------------------------------
+class SearchHit:
+    __slots__ = ("id", "score", "payload")
+
+    def __init__(self, id: str, score: float, payload: dict):
+        self.id = id
+        self.score = score
+        self.payload = payload
+
+
+# ------------------------------------------------------------
+# Interface
+# ------------------------------------------------------------
+class VectorStore:
+    name = "base"
+
+    def ensure(self):
+        """Create the collection / files if missing."""
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, payloads: List[dict]):
+        raise NotImplementedError
+
+    def retrieve(self, ids: List[str]) -> Tuple[List[str], np.ndarray, List[dict]]:
+        """Stored (ids, vectors, payloads) for those ids that exist."""
+        raise NotImplementedError
+
+    def set_payload(self, ids: List[str], payloads: List[dict]):
+        """Merge each dict into its point's payload; vectors untouched."""
+        raise NotImplementedError
+
+    def delete_ids(self, ids: List[str]):
+        raise NotImplementedError
+
+    def delete_where(self, field: str, value):
+        """Delete every point whose payload[field] == value."""
+        raise NotImplementedError
+
+    def search(self, vector: np.ndarray, top_k: int,
+               filters: Optional[Dict[str, object]] = None) -> List[SearchHit]:
+        raise NotImplementedError
+
+    def search_batch(self, vectors: np.ndarray, top_k: int,
+                     filters: Optional[Dict[str, object]] = None) -> List[List[SearchHit]]:
+        """One hit list per row of vectors (stores override with a real batch)."""
+        return [self.search(v, top_k, filters) for v in vectors]
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+
+# ------------------------------------------------------------
+# Qdrant
+# ------------------------------------------------------------
+def _qdrant_filter(filters: Optional[Dict[str, object]]):
+    from qdrant_client.http import models as qmodels
+
+    if not filters:
+        return None
+    return qmodels.Filter(must=[
+        qmodels.FieldCondition(key=k, match=qmodels.MatchValue(value=v))
+        for k, v in sorted(filters.items())
+    ])
+
+
+class QdrantStore(VectorStore):
+    name = "qdrant"
+
+    def __init__(self):
+        from rag_engine import qdrant_init
+        self._q = qdrant_init
+        self._params = None if qdrant_init.is_local() else qdrant_init.search_params()
+
+    @property
+    def client(self):
+        return self._q.get_client()
+
+    def ensure(self):
+        self._q.ensure_collection()
+
+    def upsert(self, ids, vectors, payloads):
+        from qdrant_client.http import models as qmodels
+
+        # Client boundary: the Qdrant models want plain lists
+        points = [
+            qmodels.PointStruct(id=pid, vector=vec.tolist(), payload=payload)
+            for pid, vec, payload in zip(ids, vectors, payloads)
+        ]
+        self.client.upsert(collection_name=self._q.COLLECTION_NAME, points=points)
+
+    def retrieve(self, ids):
+        found = self.client.retrieve(
+            collection_name=self._q.COLLECTION_NAME,
+            ids=list(ids),
+            with_payload=True,
+            with_vectors=True,
+        )
+        vectors = np.array([r.vector for r in found], dtype=np.float32).reshape(len(found), -1)
+        return [r.id for r in found], vectors, [r.payload or {} for r in found]
+
+    def set_payload(self, ids, payloads):
+        from qdrant_client.http import models as qmodels
+
+        if not ids:
+            return
+        self.client.batch_update_points(
+            collection_name=self._q.COLLECTION_NAME,
+            update_operations=[
+                qmodels.SetPayloadOperation(set_payload=qmodels.SetPayload(payload=p, points=[pid]))
+                for pid, p in zip(ids, payloads)
+            ],
+        )
+
+    def delete_ids(self, ids):
+        from qdrant_client.http import models as qmodels
+
+        if not ids:
+            return
+        self.client.delete(
+            collection_name=self._q.COLLECTION_NAME,
+            points_selector=qmodels.PointIdsList(points=list(ids)),
+        )
+
+    def delete_where(self, field, value):
+        from qdrant_client.http import models as qmodels
+
+        self.client.delete(
+            collection_name=self._q.COLLECTION_NAME,
+            points_selector=qmodels.FilterSelector(filter=_qdrant_filter({field: value})),
+        )
+
+    def search(self, vector, top_k, filters=None):
+        found = self.client.query_points(
+            collection_name=self._q.COLLECTION_NAME,
+            query=np.asarray(vector, dtype=np.float32).tolist(),
+            query_filter=_qdrant_filter(filters),
+            search_params=self._params,
+            limit=top_k,
+            with_payload=True,
+        )
+        return [SearchHit(r.id, r.score, r.payload or {}) for r in found.points]
+
+    def search_batch(self, vectors, top_k, filters=None):
+        from qdrant_client.http import models as qmodels
+
+        if not len(vectors):
+            return []
+        flt = _qdrant_filter(filters)
+        found = self.client.query_batch_points(
+            collection_name=self._q.COLLECTION_NAME,
+            requests=[
+                qmodels.QueryRequest(query=v, filter=flt, params=self._params,
+                                     limit=top_k, with_payload=True)
+                for v in np.asarray(vectors, dtype=np.float32).tolist()
+            ],
+        )
+        return [[SearchHit(r.id, r.score, r.payload or {}) for r in res.points] for res in found]
+
+    def count(self):
+        return self.client.count(collection_name=self._q.COLLECTION_NAME, exact=True).count
+
+
+# ------------------------------------------------------------
+# Registry + shared instance
+# ------------------------------------------------------------
+def _numpy_store():
+    from rag_engine.numpy_store import NumpyStore
+    return NumpyStore()
+
+
+STORES = {
+    "qdrant": QdrantStore,
+    "numpy": _numpy_store,
+}
+
+_store_lock = threading.Lock()
+_store = None
+
+
+def register_store(name: str, factory):
+    STORES[name] = factory
+
+
+def get_store() -> VectorStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            name = get_setting("vector_store") or "qdrant"
+            factory = STORES.get(name)
+            if factory is None:
+                raise ValueError(f"unknown vector_store {name!r} (have: {', '.join(STORES)})")
+            _store = factory()
+    return _store
@@ -6,10 +6,25 @@ watcher.py — watches ONLY:
     <INSTALL_ROOT>/workspace_files
 
 Triggers incremental reindexing ONLY for that folder.
+
+Watchdog callbacks only enqueue into a CoalescingQueue (see
+event_queue.py); a background IndexWorker drains it in batches
+through the indexer pipeline.
+
+On start, reconcile() diffs the tree against the manifest and queues
+whatever changed while the watcher was not running, so a restart
+costs one parallel stat walk instead of a full rebuild. Ignored paths
+(ignore.py) produce no events; editing a .gitignore/.toolshedignore
+reloads the rules and reconciles again.
+
+With watch_metrics_port set, /metrics and /healthz (metrics.py) are
+served on 127.0.0.1 at that port: indexing counters, embed timings
+and the queue depth of this process.
 """
 
 from __future__ import annotations
 
+import threading
 import time
 from pathlib import Path
 
@@ -23,54 +38,232 @@ from watchdog.events import (
 )
 
 from configs.paths import get_install_root
-from rag_engine.indexer import reindex_single_file, delete_file, get_index_root
+from configs.settings import get_setting
+from rag_engine.chunker import load_and_chunk
+from rag_engine.embedder import warm_up
+from rag_engine.event_queue import CoalescingQueue, MOVE
+from rag_engine.ignore import IGNORE_FILES, get_ignore
+from rag_engine.indexer import (
+    INDEX_VERSION, IndexPipeline, IndexStats, MOVED, get_index_root, move_path,
+)
+from rag_engine.manifest import get_manifest
+from rag_engine.metrics import QUEUE_DEPTH, add_health_check, bind_engine, start_server
+from rag_engine.scanner import scan_tree
+from rag_engine.vector_store import get_store
+
+
+# ------------------------------------------------------------
+# Background worker: drains the queue in batches
+# ------------------------------------------------------------
+class IndexWorker(threading.Thread):
+    def __init__(self, queue: CoalescingQueue, batch_size: int):
+        super().__init__(name="rag-index-worker", daemon=True)
+        self.queue = queue
+        self.batch_size = batch_size
+
+    def run(self):
+        while True:
+            ops = self.queue.take(self.batch_size)
+            if not ops:
+                return  # queue closed and drained
+            self._process(ops)
+
+    # A directory (created or moved in) stands for every file under it;
+    # files whose manifest entry matches are skipped on stat alone
+    @staticmethod
+    def _add(pipeline: IndexPipeline, path: Path):
+        if not path.is_dir():
+            pipeline.add(path)
+            return
+        for p in get_ignore().walk(path):
+            pipeline.add(p)
+
+    def _process(self, ops):
+        stats = IndexStats()
+        pipeline = IndexPipeline(stats)
+
+        try:
+            get_store().ensure()
+            for op, path, origin in ops:
+                try:
+                    if op == MOVE:
+                        # Known files keep their vectors; only the
+                        # path (payload + point IDs) is rewritten
+                        for _ in range(move_path(origin, path, save=False)):
+                            stats.record(MOVED)
+                    self._add(pipeline, path)
+                except Exception:
+                    stats.failed += 1
+            pipeline.close()
+        except Exception as e:
+            print(f"[watcher] batch failed: {e}")
+        finally:
+            get_manifest().save()
+
+        q = self.queue.stats()
+        print(
+            f"[watcher] {len(ops)} paths: {stats.summary()} | "
+            f"queue depth={q['depth']} coalesced={q['coalesced']}/{q['received']} events"
+        )
 
 
 # ------------------------------------------------------------
 # Event handler
 # ------------------------------------------------------------
 class RAGEventHandler(FileSystemEventHandler):
-    def __init__(self):
+    def __init__(self, queue: CoalescingQueue):
         super().__init__()
         self.root = get_index_root()
+        self.queue = queue
+        self._rescan = None
 
-    def _valid(self, path: Path) -> bool:
+    def _inside(self, path: Path) -> bool:
         try:
             path.resolve().relative_to(self.root)
         except ValueError:
             return False  # outside workspace_files
 
-        if path.is_dir():
-            return False
+        self._rules_changed(path)
+        return not get_ignore().ignored_path(path)
 
-        if any(x in path.parts for x in [".git", "__pycache__", "node_modules"]):
-            return False
+    # An ignore file changed: once edits settle, reload the rules and
+    # reconcile (newly ignored files are dropped, re-included indexed)
+    def _rules_changed(self, path: Path):
+        if path.name not in IGNORE_FILES:
+            return
+        if self._rescan is not None:
+            self._rescan.cancel()
+        self._rescan = threading.Timer(self.queue.quiet, _rescan, args=(self.queue,))
+        self._rescan.daemon = True
+        self._rescan.start()
 
-        return True
+    def _valid(self, path: Path) -> bool:
+        return self._inside(path) and not path.is_dir()
 
     def on_created(self, event: FileCreatedEvent):
         p = Path(event.src_path)
         if self._valid(p):
-            reindex_single_file(p)
+            self.queue.created(p)
 
     def on_modified(self, event: FileModifiedEvent):
         p = Path(event.src_path)
         if self._valid(p):
-            reindex_single_file(p)
+            self.queue.modified(p)
 
     def on_deleted(self, event: FileDeletedEvent):
         p = Path(event.src_path)
-        if self._valid(p):
-            delete_file(p)
+        if self._inside(p):  # a deleted directory drops every file under it
+            self.queue.deleted(p)
 
+    # Directory moves arrive as one event (plus, on some platforms, one
+    # per file inside); either way the worker re-keys the moved vectors
+    # instead of embedding the tree again
     def on_moved(self, event: FileMovedEvent):
         old = Path(event.src_path)
         new = Path(event.dest_path)
 
-        if self._valid(old):
-            delete_file(old)
-        if self._valid(new):
-            reindex_single_file(new)
+        check = self._inside if event.is_directory else self._valid
+        old_ok = self._inside(old)
+        new_ok = check(new)
+
+        if old_ok and new_ok:
+            self.queue.moved(old, new)
+        elif old_ok:
+            self.queue.deleted(old)
+        elif new_ok:
+            self.queue.created(new)
+
+
+# ------------------------------------------------------------
+# Startup reconciliation
+#
+# Stat-only diff of workspace_files against the manifest:
+#   added    on disk, not indexed          → created
+#   changed  size / mtime / index version  → modified (the pipeline
+#            then compares content hashes, so a touched file costs
+#            one read and no embedding)
+#   deleted  indexed, gone from disk (or   → deleted
+#            now ignored)
+#   moved    a deleted + an added file with the same unique
+#            (size, mtime) and the same content hash → moved
+#            (renames keep both), so the vectors are re-keyed
+#            instead of re-embedded; copies made with cp -p,
+#            rsync -a or unzip can share a stat with different
+#            content, so the added file is hashed before trusting it
+# Returns the counts per category.
+# ------------------------------------------------------------
+def reconcile(queue: CoalescingQueue) -> dict:
+    root = get_index_root()
+    manifest = get_manifest()
+
+    t0 = time.perf_counter()
+    found = scan_tree(root, skip=get_ignore().ignored)
+    scanned = time.perf_counter() - t0
+
+    known = {rel: manifest.get(rel) for rel in manifest.paths()}
+    added = [rel for rel in found if rel not in known]
+    deleted = [rel for rel in known if rel not in found]
+    changed, unchanged = [], 0
+    for rel, entry in known.items():
+        st = found.get(rel)
+        if st is None:
+            continue
+        if entry.version == INDEX_VERSION and (entry.size, entry.mtime_ns) == st:
+            unchanged += 1
+        else:
+            changed.append(rel)
+
+    def by_stat(pairs):
+        out = {}
+        for rel, key in pairs:
+            out[key] = None if key in out else rel  # None: ambiguous
+        return out
+
+    gone = by_stat((rel, (known[rel].size, known[rel].mtime_ns)) for rel in deleted)
+    new = by_stat((rel, found[rel]) for rel in added)
+    moved = [(gone[k], new[k]) for k in gone.keys() & new.keys()
+             if gone[k] and new[k] and _same_content(root / new[k], known[gone[k]])]
+    if moved:
+        src, dst = map(set, zip(*moved))
+        deleted = [rel for rel in deleted if rel not in src]
+        added = [rel for rel in added if rel not in dst]
+
+    for rel in deleted:
+        queue.deleted(root / rel)
+    for old, rel in moved:
+        queue.moved(root / old, root / rel)
+    for rel in changed:
+        queue.modified(root / rel)
+    for rel in added:
+        queue.created(root / rel)
+
+    counts = {
+        "files": len(found), "added": len(added), "changed": len(changed),
+        "deleted": len(deleted), "moved": len(moved), "unchanged": unchanged,
+    }
+    print(
+        f"[watcher] Reconciled {counts['files']} files in {scanned:.2f}s: "
+        f"added={counts['added']} changed={counts['changed']} deleted={counts['deleted']} "
+        f"moved={counts['moved']} unchanged={counts['unchanged']}"
+    )
+    return counts
+
+
+# Hash only: a matching file comes back without chunks
+def _same_content(path: Path, entry) -> bool:
+    try:
+        _, chunks, _ = load_and_chunk(path, entry.digest, stream=True)
+    except OSError:
+        return False
+    return chunks is None
+
+
+def _rescan(queue: CoalescingQueue):
+    get_ignore().invalidate()
+    try:
+        reconcile(queue)
+    except Exception as e:
+        print(f"[watcher] reconcile failed: {e}")
 
 
 # ------------------------------------------------------------
@@ -83,11 +276,30 @@ def start_watcher():
         print(f"[watcher] workspace_files missing: {root}")
         return
 
-    handler = RAGEventHandler()
+    queue = CoalescingQueue(quiet=float(get_setting("watch_quiet_ms")) / 1000.0)
+    worker = IndexWorker(queue, batch_size=int(get_setting("watch_batch_size")))
+
+    port = int(get_setting("watch_metrics_port") or 0)
+    if port:
+        bind_engine()
+        QUEUE_DEPTH.bind(lambda: len(queue))
+        add_health_check("queue_depth", lambda: len(queue))
+        start_server("127.0.0.1", port)
+        print(f"[watcher] Metrics on http://127.0.0.1:{port}/metrics")
+
+    handler = RAGEventHandler(queue)
     observer = Observer()
     observer.schedule(handler, str(root), recursive=True)
     observer.start()
 
+    # Live events from here on coalesce with what the scan queues
+    if get_setting("watch_reconcile"):
+        _rescan(queue)
+
+    # Events queue up meanwhile; the first batch does not pay for the model
+    print(f"[watcher] Model warm in {warm_up():.1f}s")
+    worker.start()
+
     try:
         while True:
             time.sleep(0.5)
@@ -96,6 +308,10 @@ def start_watcher():
 
     observer.join()
 
+    # flush whatever is still pending
+    queue.close()
+    worker.join()
+
 
 if __name__ == "__main__":
     start_watcher()